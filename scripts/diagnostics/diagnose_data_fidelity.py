@@ -192,9 +192,7 @@ async def main() -> None:
     for table in tables:
         table_ddl = TABLES.get(table, {})
         fk_fields = {
-            name: fdef
-            for name, fdef in table_ddl.items()
-            if fdef.get("fk") or name.startswith("_kf_")
+            name: fdef for name, fdef in table_ddl.items() if fdef.fk or name.startswith("_kf_")
         }
         if not fk_fields:
             continue
@@ -220,7 +218,7 @@ async def main() -> None:
             for candidate in tables:
                 candidate_ddl = TABLES.get(candidate, {})
                 for fname, fdef in candidate_ddl.items():
-                    if fdef.get("pk") and suffix.lower() in fname.lower():
+                    if fdef.pk and suffix.lower() in fname.lower():
                         target_table = candidate
                         target_pk = fname
                         break
@@ -327,7 +325,7 @@ async def main() -> None:
             # Check first record against DDL types
             rec = records[0]
             for field_name, field_def in table_ddl.items():
-                expected_type = field_def.get("type", "")
+                expected_type = field_def.type
                 val = rec.get(field_name)
                 if val is None or val == "":
                     continue  # Can't check type of null/empty
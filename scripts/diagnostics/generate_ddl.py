@@ -102,15 +102,15 @@ async def fetch_table_schema(table: str) -> dict[str, dict[str, Any]]:
 
 
 def format_field_def(field_def: dict[str, Any]) -> str:
-    """Format a FieldDef dict as Python source code."""
-    parts = [f'"type": "{field_def["type"]}"', f'"tier": "{field_def["tier"]}"']
+    """Format a field definition dict as FieldDef(...) Python source code."""
+    parts = [f'type="{field_def["type"]}"', f'tier="{field_def["tier"]}"']
     if field_def.get("pk"):
-        parts.append('"pk": True')
+        parts.append("pk=True")
     if field_def.get("fk"):
-        parts.append('"fk": True')
+        parts.append("fk=True")
     if field_def.get("description"):
-        parts.append(f'"description": "{field_def["description"]}"')
-    return "{" + ", ".join(parts) + "}"
+        parts.append(f'description="{field_def["description"]}"')
+    return "FieldDef(" + ", ".join(parts) + ")"
 
 
 async def main() -> None:
@@ -4,10 +4,10 @@ Loads settings from environment variables or .env file.
 All sensitive values come from env vars — never hardcoded.
 """
 
+import functools
 import os
-from dataclasses import dataclass
-
-from pydantic_settings import BaseSettings
+from dataclasses import dataclass, field, fields
+from typing import Any
 
 
 @dataclass
@@ -86,28 +86,97 @@ def get_default_tenant_name(tenants: dict[str, TenantConfig]) -> str:
     return sorted(tenants.keys())[0] if tenants else ""
 
 
-class Settings(BaseSettings):
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on", "t", "y"})
+_FALSE_VALUES = frozenset({"0", "false", "no", "off", "f", "n"})
+
+
+def _env_bool(name: str, raw: str) -> bool:
+    """Coerce an env var string to bool, rejecting unrecognized values."""
+    value = raw.strip().lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    raise ValueError(f"{name.upper()}={raw!r} is not a valid boolean")
+
+
+def _env_int(name: str, raw: str) -> int:
+    """Coerce an env var string to int with a readable error."""
+    try:
+        return int(raw.strip())
+    except ValueError:
+        raise ValueError(f"{name.upper()}={raw!r} is not a valid integer") from None
+
+
+@dataclass(slots=True)
+class Settings:
     """FileMaker MCP Server settings.
 
-    Values are loaded from environment variables.
+    Values are loaded from environment variables by ``Settings.from_env()``.
     When running via Claude Desktop/Code, env vars are set in the MCP config JSON.
-    For local development, use a .env file.
+    For local development, use a .env file (real env vars take precedence).
+
+    Constructing ``Settings(...)`` directly uses the defaults below plus any
+    keyword overrides and does not read the environment.
     """
 
     # FileMaker Server connection
     fm_host: str = "your-server.example.com"
     fm_database: str = ""
     fm_username: str = "mcp_agent"
-    fm_password: str = ""
+    fm_password: str = field(default="", repr=False)
 
     # API configuration
     fm_verify_ssl: bool = True
     fm_timeout: int = 60
+    fm_pool_limit: int = 16  # Max concurrent (and kept-alive) connections to FM
+
+    # Seconds to reuse an fm_count_records result (0 disables the cache)
+    count_cache_ttl: int = 60
+
+    # Startup: fetch DDL for any exposed tables bootstrap left uncached
+    prewarm_schema: bool = True
+
+    # Directory for Parquet snapshots of the table cache and named
+    # datasets, reloaded at startup ("" disables; needs pyarrow or fastparquet)
+    table_cache_dir: str = ""
+    # Hours after which a table-cache snapshot is not reloaded: its date
+    # coverage can no longer be trusted to match FM
+    table_cache_max_age_hours: int = 24
+
+    # Run analytics pandas work on the GPU via cudf.pandas (needs cudf)
+    analytics_gpu: bool = False
 
     # Logging
     log_level: str = "INFO"
 
-    model_config = {"env_file": ".env", "env_file_encoding": "utf-8", "extra": "ignore"}
+    @classmethod
+    @functools.cache
+    def from_env(cls, env_file: str = ".env") -> "Settings":
+        """Read settings once from os.environ (and .env), with type coercion.
+
+        Cached: repeated calls in the same process return the same instance.
+
+        Raises:
+            ValueError: If a bool or int variable cannot be coerced.
+        """
+        from dotenv import dotenv_values
+
+        env = {k.upper(): v for k, v in dotenv_values(env_file).items() if v is not None}
+        env.update({k.upper(): v for k, v in os.environ.items()})
+
+        values: dict[str, Any] = {}
+        for f in fields(cls):
+            raw = env.get(f.name.upper())
+            if raw is None:
+                continue
+            if f.type is bool:
+                values[f.name] = _env_bool(f.name, raw)
+            elif f.type is int:
+                values[f.name] = _env_int(f.name, raw)
+            else:
+                values[f.name] = raw
+        return cls(**values)
 
     @property
     def odata_base_url(self) -> str:
@@ -126,4 +195,4 @@ class Settings(BaseSettings):
 
 
 # Singleton settings instance
-settings = Settings()
+settings = Settings.from_env()
@@ -24,17 +24,24 @@ Annotations come from FM OData $metadata (com.filemaker.odata.* terms).
 When unavailable, name heuristics alone are used (graceful degradation).
 """
 
+import sys
+from dataclasses import dataclass
 from typing import TypedDict
 
 
-class FieldDef(TypedDict, total=False):
-    """Schema definition for a single FileMaker field."""
+@dataclass(slots=True, frozen=True)
+class FieldDef:
+    """Schema definition for a single FileMaker field.
+
+    Slotted and frozen: TABLES holds one of these per field across every
+    table, so a per-instance dict would dominate the schema cache's memory.
+    """
 
     type: str  # text, number, datetime, binary
-    tier: str  # "key" | "standard" | "internal"
-    pk: bool  # True if primary key
-    fk: bool  # True if foreign key
-    description: str  # Optional human-readable note
+    tier: str = "standard"  # "key" | "standard" | "internal"
+    pk: bool = False  # True if primary key
+    fk: bool = False  # True if foreign key
+    description: str = ""  # Optional human-readable note
 
 
 class FieldAnnotations(TypedDict, total=False):
@@ -64,6 +71,9 @@ CONTEXT_TABLE = "TBL_DDL_Context"
 # Value: {"context": str}
 DDL_CONTEXT: dict[tuple[str, str, str], dict[str, str]] = {}
 
+# FieldDef.type values treated as dates by get_date_fields/get_all_date_fields
+_DATE_TYPES: frozenset[str] = frozenset({"datetime", "date"})
+
 # --- Runtime cache management ---
 
 # None = not checked yet, True = available, False = unavailable (404)
@@ -120,18 +130,30 @@ def clear_annotations() -> None:
 def update_context(records: list[dict[str, str]]) -> None:
     """Update DDL_CONTEXT from raw OData records.
 
+    Key components are interned: the same TableName/ContextType strings
+    repeat across many records, so interning shares one object per value.
+
+    A record's PrimaryKey, when present, is kept as "pk" so later writes to
+    the same context can address the FM record without looking it up.
+
     Args:
-        records: List of dicts with keys: TableName, FieldName, ContextType, Context.
+        records: List of dicts with keys: TableName, FieldName, ContextType, Context
+            (and optionally PrimaryKey).
     """
     for rec in records:
-        key = (
-            rec.get("TableName", ""),
-            rec.get("FieldName", ""),
-            rec.get("ContextType", ""),
+        set_context(
+            rec.get("TableName") or "",
+            rec.get("FieldName") or "",
+            rec.get("ContextType") or "",
+            rec.get("Context", ""),
+            str(rec.get("PrimaryKey") or ""),
         )
-        DDL_CONTEXT[key] = {
-            "context": rec.get("Context", ""),
-        }
+
+
+def set_context(table: str, field: str, context_type: str, context: str, pk: str = "") -> None:
+    """Set one DDL_CONTEXT entry — the single-record form of update_context."""
+    key = (sys.intern(table), sys.intern(field), sys.intern(context_type))
+    DDL_CONTEXT[key] = {"context": context, "pk": pk} if pk else {"context": context}
 
 
 def clear_context() -> None:
@@ -166,6 +188,21 @@ def get_field_context(table: str, field: str) -> str | None:
     return "; ".join(hints) if hints else None
 
 
+def get_field_contexts(table: str) -> dict[str, str]:
+    """Get context hints for every field of a table, in one DDL_CONTEXT pass.
+
+    Same values as get_field_context per field, for callers that look up
+    many fields of one table (each get_field_context call scans all of
+    DDL_CONTEXT). Table-level entries (empty field name) are included
+    under "".
+    """
+    hints: dict[str, list[str]] = {}
+    for k, v in DDL_CONTEXT.items():
+        if k[0] == table:
+            hints.setdefault(k[1], []).append(v["context"])
+    return {field: "; ".join(values) for field, values in hints.items()}
+
+
 def get_table_context(table: str) -> list[dict[str, str]]:
     """Get all context entries for a table (field-level and table-level)."""
     return [
@@ -198,9 +235,7 @@ def get_date_fields(table: str) -> list[str]:
     if table not found or has no date fields.
     """
     schema = TABLES.get(table, {})
-    return [
-        name for name, field_def in schema.items() if field_def.get("type") in ("datetime", "date")
-    ]
+    return [name for name, field_def in schema.items() if field_def.type in _DATE_TYPES]
 
 
 def get_all_date_fields() -> dict[str, list[str]]:
@@ -209,16 +244,11 @@ def get_all_date_fields() -> dict[str, list[str]]:
     Returns {table_name: [field_name, ...]} for tables with at least
     one date field. Only includes tables in TABLES (populated at bootstrap).
     """
-    result = {}
-    for table_name, schema in TABLES.items():
-        date_fields = [
-            name
-            for name, field_def in schema.items()
-            if field_def.get("type") in ("datetime", "date")
-        ]
-        if date_fields:
-            result[table_name] = date_fields
-    return result
+    return {
+        table_name: date_fields
+        for table_name, schema in TABLES.items()
+        if (date_fields := [name for name, fd in schema.items() if fd.type in _DATE_TYPES])
+    }
 
 
 def get_cache_config(table: str) -> dict[str, str] | None:
@@ -255,6 +285,6 @@ def get_pk_field(table: str) -> str:
     """
     table_ddl = TABLES.get(table, {})
     for field_name, field_def in table_ddl.items():
-        if field_def.get("pk"):
+        if field_def.pk:
             return field_name
     return "PrimaryKey"
@@ -1,4 +1,4 @@
-"""Parse FileMaker GetTableDDL() output into FieldDef dicts.
+"""Parse FileMaker GetTableDDL() output into FieldDef records.
 
 Converts raw SQL DDL (CREATE TABLE statements) into the structured
 FieldDef format used by the schema tools. Handles FM-specific type
@@ -22,24 +22,58 @@ Tier assignment priority (first match wins):
 When annotations are unavailable, only name heuristics are used.
 """
 
+import hashlib
+import os
 import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from filemaker_mcp.ddl import FieldDef, TableSchema
 
-# Regex patterns for DDL parsing
-_CREATE_TABLE_RE = re.compile(
-    r'CREATE\s+TABLE\s+"([^"]+)"\s*\((.*?)\);',
-    re.DOTALL | re.IGNORECASE,
+# Optional: google-re2 gives linear-time matching and releases the GIL while
+# scanning. Patterns below stick to the syntax both engines accept, so stdlib
+# re is a drop-in fallback.
+try:
+    import re2 as _regex  # type: ignore[import-not-found]
+except ImportError:
+    _regex = re
+
+# Regex patterns for DDL parsing. They are case-sensitive and lowercase:
+# parse_ddl scans a lowercased copy of the DDL and slices names (which keep
+# their case) out of the original text by match span.
+# Statement header only; the body extent is found by _iter_create_tables'
+# paren-depth scan rather than a lazy DOTALL match across the whole body.
+_CREATE_HEADER_RE = _regex.compile(r'create\s+table\s+"([^"]+)"\s*\(')
+
+# Tokens that matter for paren depth: quoted identifiers (skipped whole, since
+# FM field names may contain parens) and bare parens.
+_PAREN_TOKEN_RE = _regex.compile(r'"[^"]*"|[()]')
+
+# Field definition: quoted name + SQL base type (length suffix not captured)
+_FIELD_PATTERN = r'"(?P<field>[^"]+)"\s+(?P<type>varchar|varbinary|int|datetime)(?:\(\d+\))?'
+_FIELD_RE = _regex.compile(_FIELD_PATTERN)
+
+# One pass over each table body: field definitions and PK/FK constraints are
+# alternatives of a single pattern, dispatched on match.lastgroup.
+_BODY_RE = _regex.compile(
+    _FIELD_PATTERN + r"|primary\s+key\s*\((?P<pk>[^)]+)\)"
+    r"|foreign\s+key\s*\((?P<fk>[^)]+)\)"
 )
-_FIELD_RE = re.compile(
-    r'"([^"]+)"\s+(varchar\(\d+\)|int|datetime|varbinary\(\d+\))',
-    re.IGNORECASE,
-)
-_PK_RE = re.compile(r"PRIMARY\s+KEY\s*\(([^)]+)\)", re.IGNORECASE)
-_FK_RE = re.compile(r"FOREIGN\s+KEY\s*\(([^)]+)\)", re.IGNORECASE)
 
-# FM SQL type -> our type system
+# Shared stand-in for pk/fk name sets of tables without constraint clauses
+_NO_CONSTRAINTS: frozenset[str] = frozenset()
+
+# Column names inside a PK/FK constraint list: "quoted name" or bare token
+_IDENT_RE = _regex.compile(r'"([^"]+)"|([^\s",]+)')
+
+# Shared empty annotation mapping for tables without annotations (read-only)
+_EMPTY_ANN: dict[str, Any] = {}
+
+# Length-preserving ASCII lowercasing, for DDL whose str.lower() changes length
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# FM SQL base type (as captured from the lowercased scan text) -> our type system
 _TYPE_MAP: dict[str, str] = {
     "varchar": "text",
     "int": "number",
@@ -48,10 +82,12 @@ _TYPE_MAP: dict[str, str] = {
 }
 
 
-def _map_type(sql_type: str) -> str:
-    """Map FM SQL type to our simplified type system."""
-    base = sql_type.split("(")[0].lower()
-    return _TYPE_MAP.get(base, "text")
+# Name-prefix tier lookups, probed with field_name[:4] / field_name[:2]
+_TIER_PREFIX4: dict[str, str] = {"_kp_": "key", "_kf_": "key", "_sp_": "internal"}
+_TIER_PREFIX2: dict[str, str] = {"G_": "internal"}
+
+# FieldAnnotations flags that mark a field as internal
+_INTERNAL_ANN_KEYS: frozenset[str] = frozenset({"calculation", "summary", "global_"})
 
 
 def _assign_tier(field_name: str, annotations: dict[str, Any] | None = None) -> str:
@@ -65,27 +101,142 @@ def _assign_tier(field_name: str, annotations: dict[str, Any] | None = None) ->
     Returns:
         Tier string: "key", "internal", or "standard".
     """
-    # Name-based key detection always wins (PK/FK fields are always key)
-    if field_name.startswith("_kp_") or field_name.startswith("_kf_"):
+    # Name-based key detection always wins (PK/FK fields are always key).
+    # _sp_ shares the 4-char lookup but must still yield to annotations.
+    prefix_tier = _TIER_PREFIX4.get(field_name[:4])
+    if prefix_tier == "key":
         return "key"
 
-    # Annotation-based classification (highest priority after key)
-    if annotations and (
-        annotations.get("calculation") or annotations.get("summary") or annotations.get("global_")
-    ):
+    # Annotation-based classification (highest priority after key).
+    # _extract_field_annotations only records flags that are true.
+    if annotations and not _INTERNAL_ANN_KEYS.isdisjoint(annotations):
         return "internal"
 
     # Name-based heuristics (fallback)
-    if field_name.startswith("_sp_"):
-        return "internal"
+    if prefix_tier is not None:
+        return prefix_tier
+    if field_name[:2] in _TIER_PREFIX2:
+        return _TIER_PREFIX2[field_name[:2]]
     # g + uppercase letter = global (e.g., gGlobal, gDate)
-    if len(field_name) > 1 and field_name[0] == "g" and field_name[1].isupper():
-        return "internal"
-    if field_name.startswith("G_"):
+    if field_name[:1] == "g" and "A" <= field_name[1:2] <= "Z":
         return "internal"
     return "standard"
 
 
+# With re2 (which releases the GIL), DDL with at least this many tables has
+# its table bodies scanned on a thread pool. Stdlib re holds the GIL, so
+# threads would only add overhead and scanning stays sequential.
+_PARALLEL_MIN_TABLES = 64
+
+# (table_name, field_matches, pk_fields, fk_fields) for one CREATE TABLE body
+_ScannedTable = tuple[
+    str, list[tuple[str, str]], set[str] | frozenset[str], set[str] | frozenset[str]
+]
+
+# Memo of recent parse_ddl results. Refreshes usually re-fetch byte-identical
+# DDL, so the key is a digest of the text plus the annotations' contents.
+_PARSE_CACHE_MAX = 8
+_PARSE_CACHE: dict[tuple[bytes, frozenset[Any]], dict[str, TableSchema]] = {}
+
+
+def _parse_cache_key(
+    ddl_text: str, annotations: dict[str, dict[str, Any]] | None
+) -> tuple[bytes, frozenset[Any]]:
+    """Build the _PARSE_CACHE key for a parse_ddl call."""
+    digest = hashlib.blake2b(ddl_text.encode("utf-8"), digest_size=16).digest()
+    ann_items = frozenset(
+        (table, field, frozenset(field_ann.items()))
+        for table, table_ann in (annotations or _EMPTY_ANN).items()
+        for field, field_ann in table_ann.items()
+    )
+    return digest, ann_items
+
+
+def _iter_create_tables(ddl_text: str, scan_text: str) -> Iterator[tuple[str, str, str]]:
+    """Yield (table_name, body, scan_body) for each CREATE TABLE statement.
+
+    scan_text is the lowercased ddl_text (same length). The body is everything
+    between the opening paren after the table name and its matching close
+    paren; scan_body is the same span of scan_text. An unterminated final
+    statement is dropped.
+    """
+    pos = 0
+    while header := _CREATE_HEADER_RE.search(scan_text, pos):
+        body_start = header.end()
+        depth = 1
+        for token in _PAREN_TOKEN_RE.finditer(scan_text, body_start):
+            char = token.group()
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    body_end = token.start()
+                    yield (
+                        ddl_text[header.start(1) : header.end(1)],
+                        ddl_text[body_start:body_end],
+                        scan_text[body_start:body_end],
+                    )
+                    pos = token.end()
+                    break
+        else:
+            return
+
+
+def _scan_fields(body: str, scan_body: str) -> list[tuple[str, str]]:
+    """Field-only scan of a table body: (field_name, sql_base_type) in DDL order."""
+    return [
+        (body[m.start("field") : m.end("field")], m.group("type"))
+        for m in _FIELD_RE.finditer(scan_body)
+    ]
+
+
+def _scan_body(body: str, scan_body: str) -> tuple[list[tuple[str, str]], set[str], set[str]]:
+    """Single scan of a table body: field definitions and PK/FK constraint names.
+
+    Returns:
+        (field_matches, pk_fields, fk_fields) where field_matches is a list of
+        (field_name, sql_base_type) in DDL order.
+    """
+    field_matches: list[tuple[str, str]] = []
+    pk_fields: set[str] = set()
+    fk_fields: set[str] = set()
+    for body_match in _BODY_RE.finditer(scan_body):
+        kind = body_match.lastgroup
+        if kind == "pk":
+            names = body[body_match.start("pk") : body_match.end("pk")]
+            pk_fields.update(q or b for q, b in _IDENT_RE.findall(names))
+        elif kind == "fk":
+            names = body[body_match.start("fk") : body_match.end("fk")]
+            fk_fields.update(q or b for q, b in _IDENT_RE.findall(names))
+        else:
+            field_name = body[body_match.start("field") : body_match.end("field")]
+            field_matches.append((field_name, body_match.group("type")))
+    return field_matches, pk_fields, fk_fields
+
+
+def _scan_table(statement: tuple[str, str, str]) -> _ScannedTable:
+    """Scan one (table_name, body, scan_body) statement from _iter_create_tables."""
+    table_name, body, scan_body = statement
+    if "key" not in scan_body:
+        # Fast path: no PRIMARY/FOREIGN KEY clause, only fields to scan
+        # (keys then come solely from _kp_/_kf_ naming)
+        return table_name, _scan_fields(body, scan_body), _NO_CONSTRAINTS, _NO_CONSTRAINTS
+    return table_name, *_scan_body(body, scan_body)
+
+
+def _scan_tables(ddl_text: str, scan_text: str) -> Iterable[_ScannedTable]:
+    """Scan every CREATE TABLE body, on a thread pool when re2 makes that pay."""
+    statements = _iter_create_tables(ddl_text, scan_text)
+    if _regex is re:
+        return map(_scan_table, statements)
+    batch = list(statements)
+    if len(batch) < _PARALLEL_MIN_TABLES:
+        return map(_scan_table, batch)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        return list(pool.map(_scan_table, batch))
+
+
 def parse_ddl(
     ddl_text: str,
     annotations: dict[str, dict[str, Any]] | None = None,
@@ -104,57 +255,56 @@ def parse_ddl(
     if not ddl_text.strip():
         return {}
 
-    tables: dict[str, TableSchema] = {}
-
-    for match in _CREATE_TABLE_RE.finditer(ddl_text):
-        table_name = match.group(1)
-        body = match.group(2)
-
-        # Extract PRIMARY KEY fields
-        pk_fields: set[str] = set()
-        for pk_match in _PK_RE.finditer(body):
-            for pk_name in pk_match.group(1).split(","):
-                pk_fields.add(pk_name.strip().strip('"'))
+    cache_key = _parse_cache_key(ddl_text, annotations)
+    cached = _PARSE_CACHE.get(cache_key)
+    if cached is not None:
+        # Fresh outer dict; the per-table schemas are shared (FieldDef is frozen)
+        return dict(cached)
 
-        # Extract FOREIGN KEY fields
-        fk_fields: set[str] = set()
-        for fk_match in _FK_RE.finditer(body):
-            for fk_name in fk_match.group(1).split(","):
-                fk_fields.add(fk_name.strip().strip('"'))
-
-        # Parse field definitions
-        table_ann = (annotations or {}).get(table_name, {})
+    tables: dict[str, TableSchema] = {}
+    # FieldDef is frozen, so fields with identical attributes can share one
+    # instance. Most fields are plain text/standard with no description.
+    shared_defs: dict[tuple[str, str, bool, bool, str], FieldDef] = {}
+    # Field names (_kp_ID, CreationTimestamp, ...) recur across tables.
+    # _assign_tier is pure, and the annotation dicts stay alive and unchanged
+    # for this call, so (name, id(annotations)) is a safe memo key.
+    tier_cache: dict[tuple[str, int], str] = {}
+
+    # One lowercasing pass instead of case-folding inside every regex step.
+    # Spans must line up with ddl_text, so fall back to ASCII-only lowering
+    # if full Unicode lowering changed the length.
+    scan_text = ddl_text.lower()
+    if len(scan_text) != len(ddl_text):
+        scan_text = ddl_text.translate(_ASCII_LOWER)
+
+    for table_name, field_matches, pk_fields, fk_fields in _scan_tables(ddl_text, scan_text):
+        # Build field definitions (constraints may follow the fields they name)
+        table_ann = (annotations or _EMPTY_ANN).get(table_name, _EMPTY_ANN)
         fields: TableSchema = {}
-        for field_match in _FIELD_RE.finditer(body):
-            field_name = field_match.group(1)
-            sql_type = field_match.group(2)
-
+        for field_name, sql_type in field_matches:
             field_ann = table_ann.get(field_name)
-
-            field_def: FieldDef = {
-                "type": _map_type(sql_type),
-                "tier": _assign_tier(field_name, field_ann),
-            }
-
-            # Populate description from FMComment annotation
-            if field_ann and field_ann.get("comment"):
-                field_def["description"] = field_ann["comment"]
-
-            # Apply PK/FK from constraints
-            if field_name in pk_fields:
-                field_def["pk"] = True
-            if field_name in fk_fields:
-                field_def["fk"] = True
-
-            # _kp_ fields always get pk=True even without PK constraint
-            if field_name.startswith("_kp_") and "pk" not in field_def:
-                field_def["pk"] = True
-            # _kf_ fields always get fk=True even without FK constraint
-            if field_name.startswith("_kf_") and "fk" not in field_def:
-                field_def["fk"] = True
-
+            tier_key = (field_name, id(field_ann) if field_ann else 0)
+            tier = tier_cache.get(tier_key)
+            if tier is None:
+                tier = tier_cache[tier_key] = _assign_tier(field_name, field_ann)
+            attrs = (
+                _TYPE_MAP[sql_type],
+                tier,
+                # _kp_/_kf_ fields are always PK/FK even without a constraint
+                field_name in pk_fields or field_name.startswith("_kp_"),
+                field_name in fk_fields or field_name.startswith("_kf_"),
+                # Populate description from FMComment annotation
+                (field_ann.get("comment") or "") if field_ann else "",
+            )
+            field_def = shared_defs.get(attrs)
+            if field_def is None:
+                field_def = shared_defs[attrs] = FieldDef(*attrs)
             fields[field_name] = field_def
 
         tables[table_name] = fields
 
-    return tables
+    if len(_PARSE_CACHE) >= _PARSE_CACHE_MAX:
+        # FIFO eviction: dicts preserve insertion order
+        del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+    _PARSE_CACHE[cache_key] = tables
+    return dict(tables)
@@ -0,0 +1,35 @@
+"""Single-flight coalescing for concurrent identical FileMaker reads.
+
+When the AI client bursts parallel tool calls (or fm_batch fans out), two
+callers asking for the same count or schema would otherwise each hit FM.
+The first caller starts the work; later callers with the same key await
+the same task until it finishes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+# key -> task running the first caller's request
+_inflight: dict[Hashable, asyncio.Future[Any]] = {}
+
+
+async def single_flight[T](key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+    """Run factory() once per key among concurrent callers and share its result.
+
+    The shared task is shielded, so a cancelled caller doesn't cancel the
+    request other callers are waiting on. Exceptions reach every caller.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight[key] = task
+
+        def _done(finished: asyncio.Future[Any]) -> None:
+            if _inflight.get(key) is finished:
+                del _inflight[key]
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
@@ -4,23 +4,33 @@ Registers all tools with FastMCP and handles lifecycle.
 Run via: uv run filemaker-mcp
 """
 
+import asyncio
 import datetime
+import inspect
+import json
 import logging
-from collections.abc import AsyncIterator
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from typing import Any, Final
 
 from fastmcp import FastMCP
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
 
 from filemaker_mcp.auth import odata_client
 from filemaker_mcp.config import settings
 from filemaker_mcp.tools.analytics import analyze as analytics_analyze
+from filemaker_mcp.tools.analytics import analyze_remote as analytics_analyze_remote
 from filemaker_mcp.tools.analytics import flush_datasets as analytics_flush_datasets
 from filemaker_mcp.tools.analytics import list_datasets as analytics_list_datasets
 from filemaker_mcp.tools.analytics import load_dataset as analytics_load_dataset
+from filemaker_mcp.tools.analytics import load_dataset_snapshots, load_table_snapshots
 from filemaker_mcp.tools.context import delete_context as context_delete_context
 from filemaker_mcp.tools.context import save_context as context_save_context
 from filemaker_mcp.tools.query import count_records, get_record, list_tables, query_records
-from filemaker_mcp.tools.schema import bootstrap_ddl, get_schema
+from filemaker_mcp.tools.schema import bootstrap_ddl, get_schema, prewarm_schema
 from filemaker_mcp.tools.tenant import (
     get_active_tenant,
     init_tenants,
@@ -40,16 +50,57 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Server instructions shown to the AI client. Static text: today's date
+# comes from the fm_today tool, so nothing here needs formatting at startup.
+_INSTRUCTIONS: Final[str] = (
+    "You are connected to a FileMaker database via the FileMaker MCP server. "
+    "\n\n"
+    "CRITICAL WORKFLOW — follow this order:\n"
+    "1. ALWAYS call fm_get_schema(table='TableName') BEFORE querying any table\n"
+    "2. Use the EXACT field names returned by get_schema in your filters and selects\n"
+    "3. Field names vary by table — some use spaces ('Customer Name'), "
+    "some use underscores ('Date_of_Service'). "
+    "The ONLY source of truth for field names is get_schema.\n"
+    "\n"
+    "QUERY TIPS:\n"
+    "- Today's date: call fm_today() (do not assume a date)\n"
+    "- Date filters: bare ISO dates, NO quotes (e.g., Date_of_Service ge 2026-02-14)\n"
+    "- Use count_records before large queries to gauge result size\n"
+    "- Use fm_batch to run several independent queries/counts in one call\n"
+    "\n"
+    "ANALYTICS (for reports, summaries, aggregation):\n"
+    "- Use fm_load_dataset to pull records into memory (fast, one-time FM call)\n"
+    "- Use fm_analyze to run groupby/sum/count/mean/min/max (instant, no FM call)\n"
+    "- Use fm_analyze_remote for a one-off summary of a large table: FM aggregates "
+    "server-side and returns only the summary rows\n"
+    "- Use fm_list_datasets to see what's loaded\n"
+    "- Preferred over raw queries for any question involving totals, trends, or comparisons\n"
+)
+
+
+# Worker threads for the shared default executor
+_EXECUTOR_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+
 @asynccontextmanager
 async def lifespan(app: FastMCP) -> AsyncIterator[None]:
     """Server lifecycle: load tenants, bootstrap default, close client on shutdown."""
     from filemaker_mcp.auth import reset_client
 
+    # One bounded pool for asyncio.to_thread work (analyze's pandas
+    # aggregation) instead of the loop's lazily grown default executor.
+    executor = ThreadPoolExecutor(max_workers=_EXECUTOR_WORKERS, thread_name_prefix="fm-mcp")
+    asyncio.get_running_loop().set_default_executor(executor)
+
     default_name = init_tenants()
     tenant = get_active_tenant()
     if tenant:
         await reset_client(tenant)
         await bootstrap_ddl()
+        if settings.prewarm_schema:
+            await prewarm_schema()
+        load_table_snapshots()
+        load_dataset_snapshots()
         logger.info("Connected to default tenant '%s' (%s)", default_name, tenant.host)
     else:
         logger.warning("No tenants configured — server starting without FM connection")
@@ -57,42 +108,58 @@ async def lifespan(app: FastMCP) -> AsyncIterator[None]:
         yield
     finally:
         await odata_client.close()
+        executor.shutdown(wait=True, cancel_futures=True)
 
 
 # --- Initialize FastMCP Server ---
 mcp = FastMCP(
     "FileMaker",
     lifespan=lifespan,
-    instructions=(
-        "You are connected to a FileMaker database via the FileMaker MCP server. "
-        "\n\n"
-        "CRITICAL WORKFLOW — follow this order:\n"
-        "1. ALWAYS call fm_get_schema(table='TableName') BEFORE querying any table\n"
-        "2. Use the EXACT field names returned by get_schema in your filters and selects\n"
-        "3. Field names vary by table — some use spaces ('Customer Name'), "
-        "some use underscores ('Date_of_Service'). "
-        "The ONLY source of truth for field names is get_schema.\n"
-        "\n"
-        "QUERY TIPS:\n"
-        f"- Today's date: {datetime.date.today().isoformat()}\n"
-        "- Date filters: bare ISO dates, NO quotes (e.g., Date_of_Service ge 2026-02-14)\n"
-        "- Use count_records before large queries to gauge result size\n"
-        "\n"
-        "ANALYTICS (for reports, summaries, aggregation):\n"
-        "- Use fm_load_dataset to pull records into memory (fast, one-time FM call)\n"
-        "- Use fm_analyze to run groupby/sum/count/mean/min/max (instant, no FM call)\n"
-        "- Use fm_list_datasets to see what's loaded\n"
-        "- Preferred over raw queries for any question involving totals, trends, or comparisons\n"
-    ),
+    instructions=_INSTRUCTIONS,
 )
 
 
-# --- Register Tools ---
-# Each function's docstring becomes the tool description that Claude sees.
-# Type hints become the parameter schema.
+class _ToolTimingMiddleware(Middleware):
+    """Log each tool call's duration at DEBUG level.
 
+    The level check comes first, so with DEBUG off a call costs one
+    isEnabledFor() check and no clock reads or message formatting.
+    """
 
-@mcp.tool()
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[Any],
+        call_next: CallNext[Any, Any],
+    ) -> Any:
+        if not logger.isEnabledFor(logging.DEBUG):
+            return await call_next(context)
+        start = time.perf_counter()
+        try:
+            return await call_next(context)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.debug("tool=%s ms=%.1f", context.message.name, elapsed_ms)
+
+
+mcp.add_middleware(_ToolTimingMiddleware())
+
+
+# --- Register Tools ---
+# Each function's docstring becomes the tool description that Claude sees.
+# Type hints become the parameter schema; FastMCP builds each tool's
+# argument validator from them once and reuses it, so there is no
+# per-call schema work to hoist out of the tools here.
+#
+# Every tool returns display text, so output_schema=None: otherwise FastMCP
+# sends each response twice, as text content and again JSON-encoded as
+# structured content {"result": ...}.
+#
+# Where a tool would only forward its arguments unchanged, the underlying
+# function is registered directly (no extra frame per call) and just the
+# tool-facing description is supplied here.
+
+
+@mcp.tool(output_schema=None)
 async def fm_query_records(
     table: str,
     filter: str = "",
@@ -138,7 +205,7 @@ async def fm_query_records(
     )
 
 
-@mcp.tool()
+@mcp.tool(output_schema=None)
 async def fm_get_record(table: str, record_id: str, id_field: str = "") -> str:
     """Get a single FileMaker record by its primary key.
 
@@ -155,37 +222,58 @@ async def fm_get_record(table: str, record_id: str, id_field: str = "") -> str:
     return await get_record(table=table, record_id=record_id, id_field=id_field)
 
 
-@mcp.tool()
-async def fm_count_records(table: str, filter: str = "") -> str:
-    """Get the total record count for an FileMaker table, optionally filtered.
-
-    Quick way to check data volume or validate filter expressions
-    before running a full query.
+@mcp.tool(output_schema=None)
+def fm_today() -> str:
+    """Get today's date on the server (ISO format, YYYY-MM-DD).
 
-    Args:
-        table: Table name (see fm_query_records for available tables).
-        filter: Optional OData $filter expression to count matching records.
+    Call this before building date filters such as "this month" or
+    "last 30 days" — never assume the current date.
 
     Returns:
-        The record count as a text message.
+        Today's date, e.g. "2026-02-14".
     """
-    return await count_records(table=table, filter=filter)
+    return datetime.date.today().isoformat()
 
 
-@mcp.tool()
-async def fm_list_tables() -> str:
-    """List all available FileMaker tables and their descriptions.
+mcp.tool(
+    count_records,
+    name="fm_count_records",
+    output_schema=None,
+    description=inspect.cleandoc(
+        """Get the total record count for an FileMaker table, optionally filtered.
 
-    Use this to understand what data is available before querying.
-    Always start here if unsure which table to query.
+        Quick way to check data volume or validate filter expressions
+        before running a full query.
 
-    Returns:
-        List of table names with descriptions of what each contains.
-    """
-    return await list_tables()
+        Args:
+            table: Table name (see fm_query_records for available tables).
+            filter: Optional OData $filter expression to count matching records.
+
+        Returns:
+            The record count as a text message.
+        """
+    ),
+)
+
+
+mcp.tool(
+    list_tables,
+    name="fm_list_tables",
+    output_schema=None,
+    description=inspect.cleandoc(
+        """List all available FileMaker tables and their descriptions.
+
+        Use this to understand what data is available before querying.
+        Always start here if unsure which table to query.
+
+        Returns:
+            List of table names with descriptions of what each contains.
+        """
+    ),
+)
 
 
-@mcp.tool()
+@mcp.tool(output_schema=None)
 async def fm_get_schema(table: str = "", refresh: bool = False, show_all: bool = False) -> str:
     """Get the database schema (field names and types) from FileMaker.
 
@@ -218,7 +306,63 @@ async def fm_get_schema(table: str = "", refresh: bool = False, show_all: bool =
     return await get_schema(table=table, refresh=refresh, show_all=show_all)
 
 
-@mcp.tool()
+# fm_batch op name -> read tool implementation
+_BATCH_OPS: dict[str, Callable[..., Awaitable[str]]] = {
+    "query": query_records,
+    "count": count_records,
+    "get": get_record,
+    "schema": get_schema,
+}
+
+
+@mcp.tool(output_schema=None)
+async def fm_batch(requests: list[dict[str, Any]], max_concurrency: int = 8) -> str:
+    """Run several read requests concurrently in one tool call.
+
+    Use this instead of separate calls when a question needs data from
+    several tables (or several counts/lookups) at once — the FM calls run
+    in parallel, so the total wait is roughly that of the slowest request.
+
+    Args:
+        requests: List of request objects. Each has an "op" plus the same
+            arguments as the matching tool:
+            - {"op": "query", "table": ..., "filter": ..., "select": ..., "top": ...}
+              (fm_query_records)
+            - {"op": "count", "table": ..., "filter": ...} (fm_count_records)
+            - {"op": "get", "table": ..., "record_id": ..., "id_field": ...}
+              (fm_get_record)
+            - {"op": "schema", "table": ...} (fm_get_schema)
+        max_concurrency: Maximum requests in flight against FM at once (default 8).
+
+    Returns:
+        JSON list aligned with requests: {"result": text} for each success,
+        {"error": message} for each failure.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(request: dict[str, Any]) -> str:
+        params = dict(request)
+        op = params.pop("op", "")
+        handler = _BATCH_OPS.get(op)
+        if handler is None:
+            raise ValueError(f"Unknown op '{op}'. Use one of: {', '.join(_BATCH_OPS)}")
+        async with semaphore:
+            return await handler(**params)
+
+    results = await asyncio.gather(*(run_one(r) for r in requests), return_exceptions=True)
+    entries: list[dict[str, str]] = []
+    for result in results:
+        if isinstance(result, (KeyboardInterrupt, SystemExit)):
+            raise result
+        if isinstance(result, BaseException):
+            # Includes CancelledError, whose str() is empty
+            entries.append({"error": str(result) or type(result).__name__})
+        else:
+            entries.append({"result": result})
+    return json.dumps(entries)
+
+
+@mcp.tool(output_schema=None)
 async def fm_load_dataset(
     name: str,
     table: str,
@@ -251,7 +395,7 @@ async def fm_load_dataset(
     return await analytics_load_dataset(name=name, table=table, filter=filter, select=select)
 
 
-@mcp.tool()
+@mcp.tool(output_schema=None)
 async def fm_analyze(
     dataset: str,
     groupby: str = "",
@@ -312,38 +456,91 @@ async def fm_analyze(
     )
 
 
-@mcp.tool()
-async def fm_list_datasets() -> str:
-    """List all datasets currently loaded in session memory.
+@mcp.tool(output_schema=None)
+async def fm_analyze_remote(
+    table: str,
+    groupby: str = "",
+    aggregate: str = "",
+    filter: str = "",
+    sort: str = "",
+    limit: int = 50,
+) -> str:
+    """Aggregate a FileMaker table on the server, without loading its rows.
+
+    Sends filter/groupby/aggregate to FM as one OData $apply request, so only
+    the summary rows come back. Best for a one-off total or breakdown of a
+    large table; for repeated analysis of the same data, fm_load_dataset +
+    fm_analyze avoids further FM calls.
 
-    Shows what's available for analysis with fm_analyze.
-    Includes dataset name, source table, row count, columns, and load time.
+    Supported aggregate functions: sum, count, mean, min, max, nunique.
+    "count" counts records. For median/std, use fm_load_dataset + fm_analyze.
+
+    Args:
+        table: FM table to aggregate (see fm_list_tables).
+        groupby: Comma-separated field names to group by. Empty = one total row.
+            Example: "Technician,Region"
+        aggregate: Comma-separated function:field pairs.
+            Example: "sum:Amount,count:Amount"
+        filter: OData $filter expression applied before grouping (same syntax
+            as fm_query_records, NOT pandas syntax).
+            Example: "ServiceDate ge 2025-01-01"
+        sort: Sort result by column name with optional direction.
+            Example: "Amount_sum desc"
+        limit: Maximum rows in output (default 50).
 
     Returns:
-        Formatted list of loaded datasets, or message if none loaded.
+        Formatted summary table, or an error suggesting the pandas fallback.
     """
-    return await analytics_list_datasets()
+    return await analytics_analyze_remote(
+        table=table,
+        groupby=groupby,
+        aggregate=aggregate,
+        filter=filter,
+        sort=sort,
+        limit=limit,
+    )
 
 
-@mcp.tool()
-async def fm_flush_datasets(table: str = "") -> str:
-    """Flush cached table data from session memory.
+mcp.tool(
+    analytics_list_datasets,
+    name="fm_list_datasets",
+    output_schema=None,
+    description=inspect.cleandoc(
+        """List all datasets currently loaded in session memory.
 
-    The MCP server auto-caches query results per table for fast repeat access.
-    Use this to force a fresh fetch from FileMaker — for example, after data
-    has been modified, or to free memory.
+        Shows what's available for analysis with fm_analyze.
+        Includes dataset name, source table, row count, columns, and load time.
 
-    Args:
-        table: Specific table to flush (e.g., "Invoices").
-            Leave empty to flush ALL cached tables.
+        Returns:
+            Formatted list of loaded datasets, or message if none loaded.
+        """
+    ),
+)
 
-    Returns:
-        Confirmation with number of rows/tables flushed.
-    """
-    return await analytics_flush_datasets(table=table)
 
+mcp.tool(
+    analytics_flush_datasets,
+    name="fm_flush_datasets",
+    output_schema=None,
+    description=inspect.cleandoc(
+        """Flush cached table data from session memory.
+
+        The MCP server auto-caches query results per table for fast repeat access.
+        Use this to force a fresh fetch from FileMaker — for example, after data
+        has been modified, or to free memory.
 
-@mcp.tool()
+        Args:
+            table: Specific table to flush (e.g., "Invoices").
+                Leave empty to flush ALL cached tables.
+
+        Returns:
+            Confirmation with number of rows/tables flushed.
+        """
+    ),
+)
+
+
+@mcp.tool(output_schema=None)
 async def fm_use_tenant(name: str) -> str:
     """Switch to a different FileMaker tenant.
 
@@ -361,20 +558,24 @@ async def fm_use_tenant(name: str) -> str:
     return await tenant_use_tenant(name=name)
 
 
-@mcp.tool()
-async def fm_list_tenants() -> str:
-    """List all configured FileMaker tenants and show which is active.
+mcp.tool(
+    tenant_list_tenants,
+    name="fm_list_tenants",
+    output_schema=None,
+    description=inspect.cleandoc(
+        """List all configured FileMaker tenants and show which is active.
 
-    Shows tenant names, hosts, and databases. Use fm_use_tenant()
-    to switch to a different tenant.
+        Shows tenant names, hosts, and databases. Use fm_use_tenant()
+        to switch to a different tenant.
 
-    Returns:
-        Formatted list of tenants with the active one marked.
-    """
-    return tenant_list_tenants()
+        Returns:
+            Formatted list of tenants with the active one marked.
+        """
+    ),
+)
 
 
-@mcp.tool()
+@mcp.tool(output_schema=None)
 async def fm_save_context(
     table_name: str,
     context: str,
@@ -420,7 +621,7 @@ async def fm_save_context(
     )
 
 
-@mcp.tool()
+@mcp.tool(output_schema=None)
 async def fm_delete_context(
     table_name: str,
     field_name: str = "",
@@ -1 +1,28 @@
 """FileMaker MCP tools — functions exposed to AI clients."""
+
+import logging
+
+from filemaker_mcp.config import settings
+
+# Optional: cudf.pandas proxies pandas onto the GPU via cuDF, falling back to
+# CPU per operation. It must be installed before pandas is first imported,
+# which happens in this package's query/analytics modules.
+if settings.analytics_gpu:
+    try:
+        import cudf.pandas  # type: ignore[import-not-found]
+    except ImportError:
+        logging.getLogger(__name__).warning(
+            "ANALYTICS_GPU is set but cudf is not installed — using pandas on CPU"
+        )
+    else:
+        cudf.pandas.install()
+
+# Imported after the cudf.pandas hook above
+import pandas as pd  # type: ignore[import-untyped]
+
+# Cached frames are read by query_records and analyze without defensive
+# copies; every step there returns a new frame. Copy-on-write (always on
+# from pandas 3) also makes those intermediate frames share the cached
+# buffers instead of copying them. Opt in on pandas 2.x.
+if int(pd.__version__.split(".", 1)[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
@@ -9,22 +9,38 @@ DataFrame per table, keyed by date range. Subsequent queries for the same
 table serve from cache if the date range is covered.
 """
 
+import asyncio
+import dataclasses
+import functools
 import json
 import logging
+import os
+import re
+import sys
+import threading
+import urllib.parse
+import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import pandas as pd  # type: ignore[import-untyped]
 
-from filemaker_mcp.auth import odata_client
-from filemaker_mcp.ddl import TABLES, get_context_value
+from filemaker_mcp.auth import FMODataClient, odata_client
+from filemaker_mcp.config import settings
+from filemaker_mcp.ddl import TABLES, FieldDef, get_context_value
 from filemaker_mcp.tools.query import (
     EXPOSED_TABLES,
-    normalize_dates_in_filter,
-    quote_fields_in_filter,
+    invalidate_count_cache,
+    prepare_filter,
     quote_fields_in_select,
 )
 
+if TYPE_CHECKING:
+    from pandas.core.groupby import DataFrameGroupBy  # type: ignore[import-untyped]
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +58,82 @@ class DatasetEntry:
     date_min: date | None = None  # earliest date in DataFrame
     date_max: date | None = None  # latest date in DataFrame
     pk_field: str = "PrimaryKey"  # from DDL, for dedup on merge
+    # ", "-joined column names, rendered once instead of per list_datasets call
+    columns_str: str = dataclasses.field(init=False, repr=False)
+    # Categorical copies of string group-key columns, built on first groupby
+    # and reused by later analyze calls. Each is stored with the df.index it
+    # was built from, so a replaced df is detected and the column rebuilt.
+    key_categories: dict[str, tuple[pd.Index, pd.Series]] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+    # Unfiltered groupby objects by key tuple, validated the same way, so a
+    # repeated grouping reuses its factorized group codes
+    groupers: "dict[tuple[str, ...], tuple[pd.Index, DataFrameGroupBy]]" = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+    # String forms of columns compared by cached fm_query_records filters
+    # (see query._string_column), validated the same way
+    str_columns: dict[str, tuple[pd.Index, pd.Series]] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    # Estimated size in bytes with the df.index it was measured on, so the
+    # estimate is taken once per frame rather than per summary
+    _mem_bytes: tuple[pd.Index, int] | None = dataclasses.field(
+        default=None, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self.columns_str = ", ".join(self.df.columns)
+
+    @property
+    def mem_bytes(self) -> int:
+        """Approximate in-memory size of df, computed once per frame."""
+        df = self.df
+        if self._mem_bytes is None or self._mem_bytes[0] is not df.index:
+            self._mem_bytes = (df.index, _estimate_mem_bytes(df))
+        return self._mem_bytes[1]
+
+
+# Rows sampled per object column when estimating string storage
+_MEM_SAMPLE_ROWS = 100
+
+
+def _boxed_columns(df: pd.DataFrame) -> list[str]:
+    """Columns whose values are Python objects behind pointers.
+
+    object columns, and str/string columns stored as Python strings; a
+    pyarrow-backed string column's shallow size already counts its bytes.
+    """
+    return [
+        col
+        for col, dtype in df.dtypes.items()
+        if pd.api.types.is_object_dtype(dtype)
+        or (isinstance(dtype, pd.StringDtype) and dtype.storage == "python")
+    ]
+
+
+def _estimate_mem_bytes(df: pd.DataFrame) -> int:
+    """Estimate df's memory use without memory_usage(deep=True).
+
+    The shallow size counts boxed (object or Python-string) columns as
+    pointers only; string storage is added from the mean sys.getsizeof of
+    up to _MEM_SAMPLE_ROWS sampled cells per such column, scaled to the
+    row count. Deep sizing visits every cell, which is only worth it when
+    debugging.
+    """
+    mem = int(df.memory_usage(deep=False).sum())
+    n = len(df)
+    columns = _boxed_columns(df)
+    if not n or not columns:
+        return mem
+    sample = df[columns]
+    if n > _MEM_SAMPLE_ROWS:
+        sample = sample.sample(n=_MEM_SAMPLE_ROWS, random_state=0)
+    for col in columns:
+        values = sample[col].tolist()
+        mem += sum(map(sys.getsizeof, values)) * n // len(values)
+    return mem
 
 
 # Session-persistent cache — keys are Claude-chosen dataset names.
@@ -55,10 +147,46 @@ _table_cache: dict[str, DatasetEntry] = {}
 
 MAX_ROWS_PER_TABLE = 50_000
 
+# Widest table rendered in describe/pivot output; to_string formats every
+# cell in Python, so wide results are elided in the middle past this.
+_MAX_OUTPUT_COLS = 20
+
+# Characters allowed as-is in snapshot file and directory names
+_SAFE_NAME_RE = re.compile(r"[^\w.-]")
+
+# analyze() results, least-recently-used first. Keys hold the call arguments
+# plus the resolved entry's identity and loaded_at (a reload or table-cache
+# merge yields a new key) and the raw value_map context of the grouped
+# fields (a context edit yields a new key).
+_ANALYZE_CACHE_MAX = 64
+_analyze_cache: OrderedDict[tuple[object, ...], str] = OrderedDict()
+
+# Boolean row masks from evaluated analyze() filters, keyed by entry identity
+# and filter, so asking a different question of the same filtered slice
+# skips re-parsing and re-evaluating the expression. Each mask is stored
+# with the df.index it was evaluated on and only reused on that frame: a
+# table-cache merge can replace entry.df while a worker thread runs.
+# Filled from worker threads, hence the lock.
+_FILTER_MASK_CACHE_MAX = 16
+_filter_masks: OrderedDict[tuple[object, ...], tuple[pd.Index, pd.Series]] = OrderedDict()
+_filter_masks_lock = threading.Lock()
+
+# FM OData returns at most this many records per request
+_PAGE_SIZE = 10000
+# Pages fetched at once when a load spans several pages (bounds FM server load)
+_PAGE_FETCH_CONCURRENCY = 4
+
 
 # --- Table cache management ---
 
 
+def clear_analyze_cache() -> None:
+    """Drop all cached analyze() results and filter masks."""
+    _analyze_cache.clear()
+    with _filter_masks_lock:
+        _filter_masks.clear()
+
+
 async def flush_datasets(table: str = "") -> str:
     """Flush cached table DataFrames.
 
@@ -68,6 +196,9 @@ async def flush_datasets(table: str = "") -> str:
     Returns:
         Confirmation message.
     """
+    invalidate_count_cache(table)
+    clear_analyze_cache()
+    _remove_snapshots(table)
     if table:
         if table in _table_cache:
             rows = _table_cache[table].row_count
@@ -138,9 +269,12 @@ def _enforce_row_limit(df: pd.DataFrame, date_field: str, table: str) -> pd.Data
         return df
     before = len(df)
     if date_field and date_field in df.columns:
-        df = df.sort_values(date_field, ascending=False).head(MAX_ROWS_PER_TABLE)
+        # ignore_index renumbers during the sort — no separate reset pass
+        df = df.sort_values(date_field, ascending=False, kind="stable", ignore_index=True).head(
+            MAX_ROWS_PER_TABLE
+        )
     else:
-        df = df.tail(MAX_ROWS_PER_TABLE)
+        df = df.tail(MAX_ROWS_PER_TABLE).reset_index(drop=True)
     logger.warning(
         "Table cache for '%s' exceeded %d rows (%d) — truncated to %d most recent",
         table,
@@ -148,7 +282,46 @@ def _enforce_row_limit(df: pd.DataFrame, date_field: str, table: str) -> pd.Data
         before,
         len(df),
     )
-    return df.reset_index(drop=True)
+    return df
+
+
+def _align_dtypes(new_df: pd.DataFrame, cached: pd.DataFrame) -> pd.DataFrame:
+    """Cast new_df's shared columns to the cached frame's dtypes, losslessly.
+
+    Without this, a page whose column came back with a different dtype
+    (e.g. object where the cache holds datetime64) makes concat fall back
+    to object for the whole column, and every later merge re-boxes it.
+    Only casts that keep every value are made: date strings to a cached
+    datetime64 column, numbers that convert exactly to a cached numeric
+    dtype, and an all-null page column to the cached dtype. Anything else
+    (e.g. fractional values against an int64 cache) is left for concat to
+    promote, since astype would truncate without raising.
+    """
+    types = pd.api.types
+    aligned: dict[str, pd.Series] = {}
+    for col, dtype in cached.dtypes.items():
+        if col not in new_df.columns or new_df[col].dtype == dtype:
+            continue
+        values = new_df[col]
+        nulls = int(values.isna().sum())
+        try:
+            if nulls == len(values):
+                aligned[col] = values.astype(dtype)
+            elif types.is_datetime64_any_dtype(dtype) and not types.is_numeric_dtype(values):
+                parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+                if int(parsed.isna().sum()) == nulls:  # every date string parsed
+                    aligned[col] = parsed.astype(dtype)
+            elif types.is_numeric_dtype(dtype) and not types.is_bool_dtype(dtype):
+                numbers = pd.to_numeric(values, errors="coerce")
+                if int(numbers.isna().sum()) == nulls:
+                    cast = numbers.astype(dtype)
+                    if (cast.eq(numbers) | numbers.isna()).all():  # no truncation
+                        aligned[col] = cast
+        except (ValueError, TypeError):
+            continue  # not castable — concat decides the dtype
+    if not aligned:
+        return new_df
+    return new_df.assign(**aligned)
 
 
 def merge_into_table_cache(
@@ -190,14 +363,20 @@ def merge_into_table_cache(
             date_max=d_max,
             pk_field=pk_field,
         )
+        _schedule_snapshot(_table_cache[table])
         return
 
     existing = _table_cache[table]
-    combined = pd.concat([existing.df, new_df], ignore_index=True)
+    new_df = _align_dtypes(new_df, existing.df)
+    kept = existing.df
 
-    # Deduplicate on PK — keep last (new data wins)
-    if pk_field in combined.columns:
-        combined = combined.drop_duplicates(subset=[pk_field], keep="last")
+    # Deduplicate on PK — new data wins. Hash anti-join: drop cached rows
+    # whose PK arrives again, instead of deduplicating the whole concat.
+    if pk_field in new_df.columns and pk_field in kept.columns:
+        if not new_df[pk_field].is_unique:
+            new_df = new_df.drop_duplicates(subset=[pk_field], keep="last")
+        kept = kept[~kept[pk_field].isin(new_df[pk_field])]
+    combined = pd.concat([kept, new_df], ignore_index=True)
 
     combined = _enforce_row_limit(combined, date_field, table)
 
@@ -214,10 +393,299 @@ def merge_into_table_cache(
         new_max = existing.date_max
 
     existing.df = combined
+    existing.columns_str = ", ".join(combined.columns)
+    existing.key_categories.clear()
+    existing.groupers.clear()
+    existing.str_columns.clear()
     existing.row_count = len(combined)
     existing.date_min = new_min
     existing.date_max = new_max
     existing.loaded_at = datetime.now()
+    _schedule_snapshot(existing)
+
+
+# --- Table cache snapshots ---
+# With TABLE_CACHE_DIR set, each table-cache entry is written to
+# <dir>/<host>_<database>/ after every merge, and reloaded at startup, so a
+# restart doesn't re-fetch whole tables from FM. Named datasets are written
+# the same way to the datasets/ subdirectory after each fm_load_dataset.
+#
+# A snapshot is <name>.<id>.parquet plus <name>.json, which holds the date
+# bounds and names the parquet file it describes. The json is renamed into
+# place only after its parquet is complete, so rows and bounds always come
+# from the same write. Writes run on the default executor, one at a time
+# per snapshot; a merge landing while one is in flight replaces any write
+# still waiting rather than queueing behind it.
+
+# Subdirectory of a tenant's snapshot directory holding named datasets
+_DATASET_SNAPSHOT_SUBDIR = "datasets"
+
+# Snapshot writes by (directory, file stem): the newest pending write, and
+# the keys whose writer is running. Removals are counted per key and per
+# directory (remove all); a write scheduled before a removal is dropped
+# instead of recreating the files.
+_SnapshotKey = tuple[Path, str]
+_snapshot_lock = threading.Lock()
+_snapshot_pending: dict[_SnapshotKey, "functools.partial[bool]"] = {}
+_snapshot_running: set[_SnapshotKey] = set()
+_snapshot_removals: dict[_SnapshotKey, int] = {}
+_snapshot_dir_removals: dict[Path, int] = {}
+
+
+def _snapshot_dir() -> Path | None:
+    """Snapshot directory for the active tenant, or None when disabled."""
+    if not settings.table_cache_dir:
+        return None
+    from filemaker_mcp.tools.tenant import get_active_tenant
+
+    tenant = get_active_tenant()
+    if tenant is None:
+        return None
+    return Path(settings.table_cache_dir) / _SAFE_NAME_RE.sub(
+        "_", f"{tenant.host}_{tenant.database}"
+    )
+
+
+def _snapshot_generation(key: _SnapshotKey) -> tuple[int, int]:
+    """Removal counts for key; a write is current while they are unchanged."""
+    return _snapshot_dir_removals.get(key[0], 0), _snapshot_removals.get(key, 0)
+
+
+def _snapshot_data_files(directory: Path, stem: str) -> list[Path]:
+    """The parquet files of stem's snapshots in directory, any write."""
+    pattern = re.compile(re.escape(stem) + r"(?:\.[0-9a-f]{32})?\.parquet")
+    return [p for p in directory.glob(f"{stem}*.parquet") if pattern.fullmatch(p.name)]
+
+
+def _write_snapshot(
+    df: pd.DataFrame,
+    meta: dict[str, Any],
+    directory: Path,
+    name: str,
+    generation: tuple[int, int] | None = None,
+) -> None:
+    """Write df and its .json sidecar as directory/<name>.*; raises on failure.
+
+    With generation (from _snapshot_generation when the write was
+    scheduled), nothing is written if the snapshot was removed since.
+    """
+    stem = _SAFE_NAME_RE.sub("_", name)
+    data_file = f"{stem}.{uuid.uuid4().hex}.parquet"
+    tmp = directory / f".{stem}.{threading.get_ident()}.tmp"
+    committed = False
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        # A fresh file name: no reader looks at it until the json names it
+        df.to_parquet(directory / data_file, index=False)
+        tmp.write_text(json.dumps({**meta, "file": data_file}))
+        with _snapshot_lock:
+            if generation is not None and generation != _snapshot_generation((directory, stem)):
+                return
+            os.replace(tmp, directory / f"{stem}.json")
+            committed = True
+    finally:
+        tmp.unlink(missing_ok=True)
+        if not committed:
+            (directory / data_file).unlink(missing_ok=True)
+    # Earlier writes' (and interrupted writes') parquet files
+    for path in _snapshot_data_files(directory, stem):
+        if path.name != data_file:
+            path.unlink(missing_ok=True)
+
+
+def save_table_snapshot(
+    entry: DatasetEntry, directory: Path, generation: tuple[int, int] | None = None
+) -> bool:
+    """Write one table-cache entry to directory. Returns True on success."""
+    meta = {
+        "table": entry.table,
+        "date_field": entry.date_field,
+        "date_min": entry.date_min.isoformat() if entry.date_min else None,
+        "date_max": entry.date_max.isoformat() if entry.date_max else None,
+        "pk_field": entry.pk_field,
+        "loaded_at": entry.loaded_at.isoformat(),
+    }
+    try:
+        _write_snapshot(entry.df, meta, directory, entry.table, generation)
+    except (ImportError, OSError, ValueError) as e:
+        logger.warning("Table cache snapshot for '%s' not written: %s", entry.table, e)
+        return False
+    return True
+
+
+def save_dataset_snapshot(
+    name: str, entry: DatasetEntry, directory: Path, generation: tuple[int, int] | None = None
+) -> bool:
+    """Write one named dataset under directory. Returns True on success."""
+    meta = {
+        "name": name,
+        "table": entry.table,
+        "filter": entry.filter,
+        "select": entry.select,
+        "loaded_at": entry.loaded_at.isoformat(),
+    }
+    try:
+        _write_snapshot(entry.df, meta, directory / _DATASET_SNAPSHOT_SUBDIR, name, generation)
+    except (ImportError, OSError, ValueError) as e:
+        logger.warning("Dataset snapshot for '%s' not written: %s", name, e)
+        return False
+    return True
+
+
+def _schedule_snapshot(entry: DatasetEntry, name: str = "") -> None:
+    """Write entry's snapshot in the background, if snapshots are enabled.
+
+    With name, entry is the named dataset of that name; otherwise it is
+    a table-cache entry.
+    """
+    directory = _snapshot_dir()
+    if directory is None:
+        return
+    # Bind the current frame/bounds now; later merges replace them wholesale
+    frozen = dataclasses.replace(entry)
+    if name:
+        key = (directory / _DATASET_SNAPSHOT_SUBDIR, _SAFE_NAME_RE.sub("_", name))
+        save = functools.partial(save_dataset_snapshot, name, frozen, directory)
+    else:
+        key = (directory, _SAFE_NAME_RE.sub("_", entry.table))
+        save = functools.partial(save_table_snapshot, frozen, directory)
+    with _snapshot_lock:
+        _snapshot_pending[key] = functools.partial(save, generation=_snapshot_generation(key))
+        if key in _snapshot_running:
+            return  # the running writer picks this one up next
+        _snapshot_running.add(key)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _drain_snapshots(key)
+        return
+    loop.run_in_executor(None, _drain_snapshots, key)
+
+
+def _drain_snapshots(key: _SnapshotKey) -> None:
+    """Run key's pending snapshot writes, one at a time, until none is left."""
+    while True:
+        with _snapshot_lock:
+            save = _snapshot_pending.pop(key, None)
+            if save is None:
+                _snapshot_running.discard(key)
+                return
+        try:
+            save()
+        except Exception:
+            logger.exception("Snapshot write for '%s' failed", key[1])
+
+
+def _remove_snapshots(table: str = "") -> None:
+    """Delete one table's snapshot (or all, when table is empty).
+
+    Pending writes for it are dropped, and a write already in progress
+    won't put the files back.
+    """
+    directory = _snapshot_dir()
+    if directory is None:
+        return
+    stem = _SAFE_NAME_RE.sub("_", table) if table else "*"
+    with _snapshot_lock:
+        if table:
+            key = (directory, stem)
+            _snapshot_removals[key] = _snapshot_removals.get(key, 0) + 1
+            _snapshot_pending.pop(key, None)
+        else:
+            _snapshot_dir_removals[directory] = _snapshot_dir_removals.get(directory, 0) + 1
+            for key in [k for k in _snapshot_pending if k[0] == directory]:
+                del _snapshot_pending[key]
+        if not directory.is_dir():
+            return
+        data_files = _snapshot_data_files(directory, stem) if table else directory.glob("*.parquet")
+        for path in [*data_files, *directory.glob(f"{stem}.json")]:
+            path.unlink(missing_ok=True)
+
+
+def load_table_snapshots() -> int:
+    """Populate the table cache from the active tenant's snapshots.
+
+    Snapshots older than TABLE_CACHE_MAX_AGE_HOURS are skipped: their date
+    bounds would be served as covered ranges without asking FM, and rows
+    changed since are not in them.
+
+    Returns:
+        Number of tables loaded. Unreadable snapshots are skipped.
+    """
+    directory = _snapshot_dir()
+    if directory is None or not directory.is_dir():
+        return 0
+    max_age = timedelta(hours=settings.table_cache_max_age_hours)
+    loaded = 0
+    for meta_path in sorted(directory.glob("*.json")):
+        try:
+            meta = json.loads(meta_path.read_text())
+            loaded_at = datetime.fromisoformat(meta["loaded_at"])
+            if datetime.now() - loaded_at > max_age:
+                logger.info("Table cache snapshot %s is too old; not loaded", meta_path.stem)
+                continue
+            df = pd.read_parquet(directory / meta.get("file", f"{meta_path.stem}.parquet"))
+            entry = DatasetEntry(
+                df=df,
+                table=meta["table"],
+                filter="",
+                select="",
+                loaded_at=loaded_at,
+                row_count=len(df),
+                date_field=meta["date_field"],
+                date_min=date.fromisoformat(meta["date_min"]) if meta["date_min"] else None,
+                date_max=date.fromisoformat(meta["date_max"]) if meta["date_max"] else None,
+                pk_field=meta["pk_field"],
+            )
+        except (ImportError, OSError, ValueError, KeyError) as e:
+            logger.warning("Table cache snapshot %s not loaded: %s", meta_path.stem, e)
+            continue
+        _table_cache[entry.table] = entry
+        loaded += 1
+    if loaded:
+        logger.info("Loaded %d table cache snapshot(s) from %s", loaded, directory)
+    return loaded
+
+
+def load_dataset_snapshots() -> int:
+    """Populate named datasets from the active tenant's snapshots.
+
+    Restored datasets keep their original loaded_at, so fm_list_datasets
+    shows how old each one is. A dataset already loaded this session is
+    not replaced.
+
+    Returns:
+        Number of datasets loaded. Unreadable snapshots are skipped.
+    """
+    directory = _snapshot_dir()
+    if directory is None:
+        return 0
+    directory = directory / _DATASET_SNAPSHOT_SUBDIR
+    if not directory.is_dir():
+        return 0
+    loaded = 0
+    for meta_path in sorted(directory.glob("*.json")):
+        try:
+            meta = json.loads(meta_path.read_text())
+            if meta["name"] in _datasets:
+                continue
+            df = pd.read_parquet(directory / meta.get("file", f"{meta_path.stem}.parquet"))
+            entry = DatasetEntry(
+                df=df,
+                table=meta["table"],
+                filter=meta["filter"],
+                select=meta["select"],
+                loaded_at=datetime.fromisoformat(meta["loaded_at"]),
+                row_count=len(df),
+            )
+        except (ImportError, OSError, ValueError, KeyError) as e:
+            logger.warning("Dataset snapshot %s not loaded: %s", meta_path.stem, e)
+            continue
+        _datasets[meta["name"]] = entry
+        loaded += 1
+    if loaded:
+        logger.info("Loaded %d dataset snapshot(s) from %s", loaded, directory)
+    return loaded
 
 
 async def list_datasets() -> str:
@@ -231,15 +699,207 @@ async def list_datasets() -> str:
 
     lines = ["Loaded datasets:", ""]
     for name, entry in _datasets.items():
-        cols = ", ".join(entry.df.columns.tolist())
         lines.append(f"  {name}: {entry.row_count} rows from {entry.table}")
         lines.append(f"    Filter: {entry.filter or '(none)'}")
-        lines.append(f"    Columns: {cols}")
+        lines.append(f"    Columns: {entry.columns_str}")
         lines.append(f"    Loaded: {entry.loaded_at.isoformat()}")
         lines.append("")
     return "\n".join(lines)
 
 
+# Fast-path to_datetime format per DDL field type. FM sends date fields
+# as plain YYYY-MM-DD, which a fixed format parses without ISO 8601's
+# optional-component handling.
+_DATE_FORMATS = {"date": "%Y-%m-%d", "datetime": "ISO8601"}
+
+
+def _parse_date_column(values: pd.Series, fmt: str = "ISO8601") -> pd.Series:
+    """Parse a date/datetime column, trying the fixed-format fast path first.
+
+    FM OData sends ISO dates, which fmt (ISO8601, or %Y-%m-%d for date
+    fields) parses in one vectorized pass. format="mixed" guesses per
+    value and is much slower, so it is only used when some non-empty value
+    doesn't match fmt (or the column mixes naive and zoned timestamps).
+    """
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values
+    try:
+        parsed = pd.to_datetime(values, format=fmt, errors="coerce", cache=True)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, format="mixed", errors="coerce")
+    if (parsed.isna() & values.notna() & (values != "")).any():
+        return pd.to_datetime(values, format="mixed", errors="coerce")
+    return parsed
+
+
+def convert_ddl_date_columns(df: pd.DataFrame, table_ddl: dict[str, FieldDef]) -> None:
+    """Convert, in place, the columns table_ddl types as date/datetime."""
+    for field_name, field_def in table_ddl.items():
+        if field_def.type in _DATE_FORMATS and field_name in df.columns:
+            df[field_name] = _parse_date_column(df[field_name], _DATE_FORMATS[field_def.type])
+
+
+def _type_numeric_columns(frame: pd.DataFrame, numeric: set[str]) -> pd.DataFrame:
+    """Cast DDL number fields that inferred as object (all-null page) to float64.
+
+    Keeps every page's numeric columns typed, so concat stays on float
+    buffers instead of boxing the whole column into objects. Columns that
+    can't be cast are left as they are.
+    """
+    untyped = {
+        col: "float64" for col in numeric.intersection(frame.columns) if frame[col].dtype == object
+    }
+    if not untyped:
+        return frame
+    return frame.astype(untyped, errors="ignore")
+
+
+def _page_frame(data: dict[str, Any], numeric: set[str], dates: dict[str, str]) -> pd.DataFrame:
+    """The records of one OData response as a DataFrame.
+
+    DDL number fields are cast as in _type_numeric_columns and date fields
+    parsed as in convert_ddl_date_columns, page by page as responses
+    arrive, so parsing overlaps the fetches still in flight and concat
+    joins datetime64 buffers rather than string objects.
+    """
+    frame = _type_numeric_columns(pd.DataFrame.from_records(data.get("value", [])), numeric)
+    for col, fmt in dates.items():
+        if col in frame.columns:
+            frame[col] = _parse_date_column(frame[col], fmt)
+    return frame
+
+
+async def _fetch_page(
+    client: FMODataClient,
+    table: str,
+    params: dict[str, str],
+    skip: int,
+    numeric: set[str],
+    dates: dict[str, str],
+) -> pd.DataFrame:
+    """Fetch one $top/$skip page of records as a DataFrame."""
+    page_params = {**params, "$skip": str(skip)} if skip else params
+    data = await client.get(table, params=page_params)
+    return _page_frame(data, numeric, dates)
+
+
+def _next_link_params(data: dict[str, Any]) -> dict[str, str] | None:
+    """Query parameters of the response's @odata.nextLink, if it has one."""
+    link = data.get("@odata.nextLink")
+    if not isinstance(link, str):
+        return None
+    query = urllib.parse.urlsplit(link).query
+    return dict(urllib.parse.parse_qsl(query, keep_blank_values=True))
+
+
+async def _fetch_all_pages(
+    client: FMODataClient,
+    table: str,
+    params: dict[str, str],
+    numeric: set[str],
+    dates: dict[str, str],
+) -> list[pd.DataFrame]:
+    """Fetch every record matching params, paging past FM's per-request cap.
+
+    The first page also requests $count. When more pages are needed, the
+    rest are fetched concurrently (at most _PAGE_FETCH_CONCURRENCY at once)
+    and returned in skip order. Without a count, pages are fetched in
+    concurrent windows of the same size until a short page.
+
+    If the server sends @odata.nextLink, its links are followed instead:
+    a server-side continuation resumes where the last page ended, where
+    each $skip page makes the server scan past every earlier row again.
+
+    Each page becomes a DataFrame as soon as it arrives, so its decoded
+    JSON can be freed while other pages are still in flight; peak memory
+    holds one page of records rather than all of them.
+    """
+    data = await client.get(table, params={**params, "$count": "true"})
+    total = data.get("@odata.count") or data.get("@count")
+    next_params = _next_link_params(data)
+    first = _page_frame(data, numeric, dates)
+    del data
+    if next_params is not None:
+        pages = [first]
+        while next_params is not None:
+            data = await client.get(table, params=next_params)
+            next_params = _next_link_params(data)
+            pages.append(_page_frame(data, numeric, dates))
+            del data
+        return pages
+    if len(first) < _PAGE_SIZE:
+        return [first]
+
+    if isinstance(total, int):
+        semaphore = asyncio.Semaphore(_PAGE_FETCH_CONCURRENCY)
+
+        async def bounded(skip: int) -> pd.DataFrame:
+            async with semaphore:
+                return await _fetch_page(client, table, params, skip, numeric, dates)
+
+        rest = await asyncio.gather(*(bounded(s) for s in range(_PAGE_SIZE, total, _PAGE_SIZE)))
+        return [first, *rest]
+
+    # No count: fetch windows of concurrent pages until one comes back
+    # short. Pages past the end are empty, at most one window's worth.
+    frames = [first]
+    window = _PAGE_SIZE * _PAGE_FETCH_CONCURRENCY
+    skip = _PAGE_SIZE
+    while True:
+        offsets = range(skip, skip + window, _PAGE_SIZE)
+        batch = await asyncio.gather(
+            *(_fetch_page(client, table, params, s, numeric, dates) for s in offsets)
+        )
+        for frame in batch:
+            frames.append(frame)
+            if len(frame) < _PAGE_SIZE:
+                return frames
+        skip += window
+
+
+async def fetch_records_frame(
+    table: str,
+    params: dict[str, str],
+    client: FMODataClient | None = None,
+    parse_dates: bool = False,
+    table_ddl: dict[str, FieldDef] | None = None,
+) -> pd.DataFrame:
+    """Fetch every record matching params as one DataFrame (empty if none).
+
+    Pages are fetched concurrently once the first reports a count (see
+    _fetch_all_pages). OData metadata (@...) columns are dropped. With
+    parse_dates, DDL date/datetime fields arrive parsed (the same result
+    as convert_ddl_date_columns); otherwise they are left as strings.
+    client and table_ddl default to this module's odata_client and the
+    table's TABLES entry.
+    """
+    if table_ddl is None:
+        table_ddl = TABLES.get(table, {})
+    # One walk over the DDL sorts fields into the two typed groups
+    numeric: set[str] = set()
+    dates: dict[str, str] = {}
+    for name, fd in table_ddl.items():
+        if fd.type == "number":
+            numeric.add(name)
+        elif parse_dates and fd.type in _DATE_FORMATS:
+            dates[name] = _DATE_FORMATS[fd.type]
+    # One frame per page (dtype inference over 10k rows at a time), then a
+    # single concat. infer_objects() recovers numeric dtypes for non-DDL
+    # columns that were all null (object) on some page.
+    pages = await _fetch_all_pages(client or odata_client, table, params, numeric, dates)
+    frames = [f for f in pages if len(f)]
+    del pages
+    if not frames:
+        return pd.DataFrame()
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True).infer_objects()
+    del frames
+
+    meta_cols = [c for c in df.columns if c.startswith("@")]
+    if meta_cols:
+        df = df.drop(columns=meta_cols)
+    return df
+
+
 async def load_dataset(
     name: str,
     table: str,
@@ -262,45 +922,22 @@ async def load_dataset(
         available = ", ".join(EXPOSED_TABLES.keys())
         return f"Error: Unknown table '{table}'. Available tables: {available}"
 
+    # A fresh load of the table's data: later counts should be fresh too
+    invalidate_count_cache(table)
+
     # Build OData params — reuse the query pipeline for filter/select processing
-    params: dict[str, str] = {"$top": "10000"}
+    params: dict[str, str] = {"$top": str(_PAGE_SIZE)}
     if filter:
-        params["$filter"] = quote_fields_in_filter(normalize_dates_in_filter(filter))
+        params["$filter"] = prepare_filter(filter)
     if select:
         params["$select"] = quote_fields_in_select(select)
 
     try:
-        # Fetch with auto-pagination
-        all_records: list[dict[str, object]] = []
-        skip = 0
-        while True:
-            page_params = {**params}
-            if skip > 0:
-                page_params["$skip"] = str(skip)
-
-            data = await odata_client.get(table, params=page_params)
-            records = data.get("value", [])
-            all_records.extend(records)
-
-            if len(records) < 10000:
-                break
-            skip += 10000
-
-        if not all_records:
+        # Date columns are parsed per page, using DDL type info
+        df = await fetch_records_frame(table, params, parse_dates=True)
+        if df.empty:
             return f"0 records matched filter for '{table}'. Dataset '{name}' not created."
 
-        # Build DataFrame, dropping OData metadata columns
-        df = pd.DataFrame(all_records)
-        meta_cols = [c for c in df.columns if c.startswith("@")]
-        if meta_cols:
-            df = df.drop(columns=meta_cols)
-
-        # Convert date columns using DDL type info
-        table_ddl = TABLES.get(table, {})
-        for field_name, field_def in table_ddl.items():
-            if field_def.get("type") in ("date", "datetime") and field_name in df.columns:
-                df[field_name] = pd.to_datetime(df[field_name], format="mixed", errors="coerce")
-
         # Store in session cache
         entry = DatasetEntry(
             df=df,
@@ -311,14 +948,17 @@ async def load_dataset(
             row_count=len(df),
         )
         _datasets[name] = entry
+        _schedule_snapshot(entry, name)
 
         # Build summary
-        cols = ", ".join(df.columns.tolist())
-        mem = df.memory_usage(deep=True).sum()
+        # Sampled estimate: deep=True walks every string in object columns
+        mem = entry.mem_bytes
         mem_str = f"{mem / 1024:.0f} KB" if mem < 1024 * 1024 else f"{mem / (1024 * 1024):.1f} MB"
         return (
             f"Dataset '{name}': {len(df)} rows x {len(df.columns)} columns ({mem_str})\n"
-            f"Source: {table}" + (f" | Filter: {filter}" if filter else "") + f"\nColumns: {cols}"
+            f"Source: {table}"
+            + (f" | Filter: {filter}" if filter else "")
+            + f"\nColumns: {entry.columns_str}"
         )
 
     except ConnectionError as e:
@@ -332,7 +972,7 @@ async def load_dataset(
         return f"Error loading dataset: {type(e).__name__}: {e}"
 
 
-_SUPPORTED_AGGS = {"sum", "count", "mean", "min", "max", "median", "nunique", "std"}
+_SUPPORTED_AGGS = frozenset({"sum", "count", "mean", "min", "max", "median", "nunique", "std"})
 
 
 def _parse_value_maps(context_str: str | None) -> dict[str, str]:
@@ -354,33 +994,42 @@ def _parse_value_maps(context_str: str | None) -> dict[str, str]:
 def _apply_normalization(
     df: pd.DataFrame, field_mappings: dict[str, dict[str, str]]
 ) -> tuple[pd.DataFrame, list[str]]:
-    """Apply value mappings to DataFrame columns, returning a copy.
+    """Apply value mappings to DataFrame columns without mutating the input.
 
     Args:
         df: Source DataFrame (not mutated).
         field_mappings: {field_name: {old_value: new_value, ...}, ...}
 
     Returns:
-        Tuple of (normalized DataFrame copy, list of inline note strings).
-        Notes are empty if no values were actually changed.
+        Tuple of (normalized DataFrame, list of inline note strings).
+        If no values were actually changed, notes are empty and the input
+        frame itself is returned.
     """
     if not field_mappings:
         return df, []
 
-    df = df.copy()
+    # Shallow copy, made on the first actual change: only the mapped columns
+    # are replaced (replace() returns new Series), so the caller's frame and
+    # its other columns stay shared.
+    source = df
     notes: list[str] = []
 
     for field, mapping in field_mappings.items():
         if field not in df.columns:
             continue
-        before = df[field].copy()
-        df[field] = df[field].replace(mapping)
+        before = df[field]
+        # One hash pass counts every value; each mapping entry is then a
+        # lookup instead of a full-column comparison.
+        value_counts = before.value_counts()
         changed_counts: list[str] = []
         for old_val, new_val in mapping.items():
-            count = int((before == old_val).sum())
+            count = int(value_counts.get(old_val, 0))
             if count > 0:
                 changed_counts.append(f"{old_val}\u2192{new_val}: {count}")
         if changed_counts:
+            if df is source:
+                df = df.copy(deep=False)
+            df[field] = before.replace(mapping)
             notes.append(f"{field} ({', '.join(changed_counts)})")
 
     return df, notes
@@ -423,6 +1072,7 @@ def _parse_aggregates(
     if not aggregate_str:
         return {}
 
+    column_set = set(available_columns)
     agg_dict: dict[str, list[str]] = {}
     for pair in aggregate_str.split(","):
         pair = pair.strip()
@@ -437,16 +1087,161 @@ def _parse_aggregates(
 
         if func not in _SUPPORTED_AGGS:
             return f"Unknown function '{func}'. Supported: {', '.join(sorted(_SUPPORTED_AGGS))}"
-        if field not in available_columns:
+        if field not in column_set:
             return f"Field '{field}' not in dataset. Available: {', '.join(available_columns)}"
 
-        if field not in agg_dict:
-            agg_dict[field] = []
-        agg_dict[field].append(func)
+        agg_dict.setdefault(field, []).append(func)
 
     return agg_dict
 
 
+def _referenced_columns(
+    df: pd.DataFrame, groupby: str, aggregate: str, pivot_column: str
+) -> list[str] | None:
+    """Columns of df an analyze call reads after filtering, in frame order.
+
+    None when every column is needed (describe). Unknown names are left
+    out; the validation after the filter reports them as before.
+    """
+    if not groupby and not aggregate:
+        return None
+    names = {f.strip() for f in groupby.split(",")}
+    names.update(pair.split(":", 1)[-1].strip() for pair in aggregate.split(","))
+    names.add(pivot_column)
+    return [col for col in df.columns if col in names]
+
+
+def _filter_rows(
+    entry: DatasetEntry, df: pd.DataFrame, filter: str, columns: list[str] | None = None
+) -> pd.DataFrame:
+    """Rows of df (entry's frame, as snapshotted by the caller) matching a query.
+
+    Same result as df.query(filter); the boolean mask is cached per entry
+    and reused only while entry still holds this frame. pandas evaluates
+    with numexpr on its own when it is installed. With columns, only those
+    are taken: the row selection then copies just the columns the caller
+    reads rather than the whole frame.
+    """
+    key = (id(entry), filter)
+    index = df.index
+    mask = None
+    with _filter_masks_lock:
+        cached = _filter_masks.get(key)
+        if cached is not None and cached[0] is index:
+            mask = cached[1]
+            _filter_masks.move_to_end(key)
+    if mask is None:
+        mask = df.eval(filter)
+        if not (isinstance(mask, pd.Series) and pd.api.types.is_bool_dtype(mask.dtype)):
+            # Not a row predicate — let query() apply (or reject) it as before
+            result = df.query(filter)
+            return result if columns is None else result[columns]
+        with _filter_masks_lock:
+            _filter_masks[key] = (index, mask)
+            _filter_masks.move_to_end(key)
+            if len(_filter_masks) > _FILTER_MASK_CACHE_MAX:
+                _filter_masks.popitem(last=False)
+    if columns is None:
+        return df.loc[mask]
+    return df.loc[mask, columns]
+
+
+def _entry_categorical(entry: DatasetEntry, frame: pd.DataFrame, field: str) -> pd.Series:
+    """frame[field] as a categorical, built once per loaded frame of entry."""
+    index = frame.index
+    cached = entry.key_categories.get(field)
+    if cached is not None and cached[0] is index:
+        return cached[1]
+    column = frame[field].astype("category")
+    entry.key_categories[field] = (index, column)
+    return column
+
+
+def _entry_groupby(
+    entry: DatasetEntry, frame: pd.DataFrame, df: pd.DataFrame, fields: list[str]
+) -> "DataFrameGroupBy":
+    """df.groupby(fields, observed=True), kept on the entry for reuse.
+
+    Only for df derived from the whole of frame, entry's snapshotted df
+    (no filter, no value_map normalization), so one cached grouping stands
+    for every such call on that frame.
+    """
+    key = tuple(fields)
+    index = frame.index
+    cached = entry.groupers.get(key)
+    if cached is not None and cached[0] is index:
+        return cached[1]
+    grouped = df.groupby(fields, observed=True)
+    entry.groupers[key] = (index, grouped)
+    return grouped
+
+
+def _categorize_keys(
+    df: pd.DataFrame,
+    fields: list[str],
+    agg_dict: dict[str, list[str]],
+    source: tuple[DatasetEntry, pd.DataFrame] | None = None,
+    normalized: frozenset[str] | set[str] = frozenset(),
+) -> pd.DataFrame:
+    """Return df with string group-key columns as categoricals.
+
+    Grouping then hashes small integer codes instead of Python strings.
+    Columns that are also aggregated keep their dtype (categoricals can't be
+    summed); callers group with observed=True so unused categories don't
+    add empty groups. The input frame is not modified.
+
+    With source, an (entry, frame) pair where frame is the entry's df as
+    snapshotted by the caller and df is frame or a row subset of it,
+    unnormalized columns come from the entry's cached categoricals, so the
+    string hashing happens once per dataset rather than on every call. A
+    subset takes its rows by label, which is arithmetic on the RangeIndex.
+    """
+    if source is not None and not isinstance(source[1].index, pd.RangeIndex):
+        source = None
+    converted: dict[str, pd.Series] = {}
+    for field in fields:
+        dtype = df[field].dtype
+        if (
+            field in agg_dict
+            or not pd.api.types.is_string_dtype(dtype)
+            or isinstance(dtype, pd.CategoricalDtype)
+        ):
+            continue
+        if source is not None and field not in normalized:
+            entry, frame = source
+            column = _entry_categorical(entry, frame, field)
+            converted[field] = column if df.index is frame.index else column.loc[df.index]
+        else:
+            converted[field] = df[field].astype("category")
+    return df.assign(**converted) if converted else df
+
+
+def _project(df: pd.DataFrame, fields: list[str], agg_dict: dict[str, list[str]]) -> pd.DataFrame:
+    """Keep only the group-key and aggregated columns, in first-seen order.
+
+    Done after filtering (the filter may reference any column) and after
+    _categorize_keys (the projection builds a new index object, which
+    would defeat its identity check against the entry's cached codes).
+    """
+    needed = list(dict.fromkeys([*fields, *agg_dict]))
+    return df if len(needed) == len(df.columns) else df[needed]
+
+
+def _sort_result(result_df: pd.DataFrame, sort: str) -> pd.DataFrame:
+    """Sort by a "Column [asc|desc]" spec; unknown columns leave the order as is.
+
+    Uses a stable single-key mergesort: groupby output is already ordered by
+    group key, so rows with equal values keep that order instead of the
+    arbitrary tie order of the default quicksort.
+    """
+    parts = sort.strip().split()
+    sort_col = parts[0]
+    ascending = not (len(parts) > 1 and parts[1].lower() == "desc")
+    if sort_col not in result_df.columns:
+        return result_df
+    return result_df.sort_values(sort_col, ascending=ascending, kind="mergesort")
+
+
 _PERIOD_FREQS = {"week": "W", "month": "ME", "quarter": "QE"}
 
 
@@ -479,6 +1274,62 @@ async def analyze(
     Returns:
         Formatted text table with results.
     """
+    entry = _datasets.get(dataset) or _table_cache.get(dataset)
+    key: tuple[object, ...] | None = None
+    if entry is not None:
+        norm_fields = [f.strip() for f in groupby.split(",") if f.strip()]
+        if norm_fields and pivot_column:
+            norm_fields.append(pivot_column)
+        value_maps = tuple(get_context_value(entry.table, "value_map", f) for f in norm_fields)
+        key = (
+            dataset,
+            id(entry),
+            entry.loaded_at,
+            groupby,
+            aggregate,
+            filter,
+            sort,
+            limit,
+            period,
+            pivot_column,
+            value_maps,
+        )
+        cached = _analyze_cache.get(key)
+        if cached is not None:
+            _analyze_cache.move_to_end(key)
+            return cached
+
+    # pandas filtering/grouping is synchronous and CPU-bound; run it on a
+    # worker thread so concurrent tool calls keep being served.
+    result = await asyncio.to_thread(
+        _analyze_sync,
+        dataset,
+        groupby,
+        aggregate,
+        filter,
+        sort,
+        limit,
+        period,
+        pivot_column,
+    )
+    if key is not None:
+        _analyze_cache[key] = result
+        if len(_analyze_cache) > _ANALYZE_CACHE_MAX:
+            _analyze_cache.popitem(last=False)
+    return result
+
+
+def _analyze_sync(
+    dataset: str,
+    groupby: str = "",
+    aggregate: str = "",
+    filter: str = "",
+    sort: str = "",
+    limit: int = 50,
+    period: str = "",
+    pivot_column: str = "",
+) -> str:
+    """Synchronous body of analyze(); runs in a worker thread."""
     # Resolve dataset — named datasets take precedence, then table cache
     if dataset in _datasets:
         entry = _datasets[dataset]
@@ -491,30 +1342,47 @@ async def analyze(
             "Use fm_load_dataset to load data, or query a cached table first."
         )
 
-    df = entry.df.copy()
+    # Read entry.df once: a table-cache merge on the event loop can replace
+    # it while this thread runs, and every step below must see one frame.
+    # No copy: each step (query, normalization, groupby) returns a new
+    # frame, so the stored dataset is never mutated.
+    frame = entry.df
+    source = (entry, frame)
+    df = frame
 
-    # Apply pandas filter
+    # Apply pandas filter, taking only the columns used below (the filter
+    # itself may reference any column)
     if filter:
         try:
-            df = df.query(filter)
+            df = _filter_rows(
+                entry, frame, filter, _referenced_columns(frame, groupby, aggregate, pivot_column)
+            )
         except Exception as e:
             return f"Filter error: {e}"
+    # Validation messages list the dataset's columns, not the projection's
+    available = frame.columns.tolist()
 
     # --- Collect and apply value_map normalization ---
     norm_notes: list[str] = []
+    normalized: set[str] = set()
     if groupby:
-        groupby_fields_for_norm = [f.strip() for f in groupby.split(",") if f.strip()]
-        norm_fields = list(groupby_fields_for_norm)
+        norm_fields = [f.strip() for f in groupby.split(",") if f.strip()]
         if pivot_column:
             norm_fields.append(pivot_column)
+        # Only fields present in the data can be normalized
+        norm_fields = [f for f in norm_fields if f in df.columns]
         field_mappings = _collect_value_maps(entry.table, norm_fields)
         if field_mappings:
             df, norm_notes = _apply_normalization(df, field_mappings)
+            normalized = set(field_mappings)
 
     if not groupby and not aggregate:
-        # describe() -- summary statistics
-        result_df = df.describe(include="all")
-        return f"Summary statistics for '{dataset}' ({len(df)} records):\n\n{result_df.to_string()}"
+        # describe() -- summary statistics. String columns go through the
+        # entry's cached categoricals: count/unique/top/freq then come from
+        # a bincount over codes instead of hashing every string per call.
+        result_df = _categorize_keys(df, available, {}, source).describe(include="all")
+        result_str = result_df.to_string(max_cols=_MAX_OUTPUT_COLS)
+        return f"Summary statistics for '{dataset}' ({len(df)} records):\n\n{result_str}"
 
     # Parse groupby fields
     groupby_fields = [f.strip() for f in groupby.split(",") if f.strip()] if groupby else []
@@ -522,7 +1390,7 @@ async def analyze(
     # Validate groupby fields
     for field in groupby_fields:
         if field not in df.columns:
-            return f"Field '{field}' not in dataset. Available: {', '.join(df.columns.tolist())}"
+            return f"Field '{field}' not in dataset. Available: {', '.join(available)}"
 
     # --- Time-series mode ---
     if period:
@@ -535,16 +1403,23 @@ async def analyze(
         if date_col not in df.columns or not pd.api.types.is_datetime64_any_dtype(df[date_col]):
             return f"Field '{date_col}' must be a datetime column for period grouping."
 
-        agg_dict = _parse_aggregates(aggregate, df.columns.tolist())
+        agg_dict = _parse_aggregates(aggregate, available)
         if isinstance(agg_dict, str):
             return agg_dict
 
         grouper: list[pd.Grouper | str] = [pd.Grouper(key=date_col, freq=freq)]
         if len(groupby_fields) > 1:
             grouper.extend(groupby_fields[1:])
+            df = _categorize_keys(df, groupby_fields[1:], agg_dict, source, normalized)
+        df = _project(df, groupby_fields, agg_dict)
 
         try:
-            result_df = df.groupby(grouper).agg(agg_dict)
+            if len(grouper) == 1 and df[date_col].is_monotonic_increasing:
+                # Date-sorted data (FM's usual order): resample bins a sorted
+                # DatetimeIndex by its edges directly — same output, no sort.
+                result_df = df.set_index(date_col).resample(freq).agg(agg_dict)
+            else:
+                result_df = df.groupby(grouper, observed=True).agg(agg_dict)
         except Exception as e:
             return f"Time-series aggregation error: {e}"
 
@@ -556,11 +1431,7 @@ async def analyze(
             result_df[date_col] = result_df[date_col].dt.strftime("%Y-%m")
 
         if sort:
-            parts = sort.strip().split()
-            sort_col = parts[0]
-            ascending = not (len(parts) > 1 and parts[1].lower() == "desc")
-            if sort_col in result_df.columns:
-                result_df = result_df.sort_values(sort_col, ascending=ascending)
+            result_df = _sort_result(result_df, sort)
 
         total_groups = len(result_df)
         result_df = result_df.head(limit)
@@ -574,11 +1445,11 @@ async def analyze(
     # --- Pivot mode ---
     if pivot_column:
         if pivot_column not in df.columns:
-            cols = ", ".join(df.columns.tolist())
+            cols = ", ".join(available)
             return f"Pivot column '{pivot_column}' not in dataset. Available: {cols}"
         if not groupby_fields:
             return "Pivot requires a groupby field for row index."
-        agg_dict = _parse_aggregates(aggregate, df.columns.tolist())
+        agg_dict = _parse_aggregates(aggregate, available)
         if isinstance(agg_dict, str):
             return agg_dict
         if not agg_dict:
@@ -588,14 +1459,17 @@ async def analyze(
         agg_field = next(iter(agg_dict.keys()))
         agg_func = agg_dict[agg_field][0]
 
+        # Row keys only: a categorical pivot column would make the result's
+        # columns a CategoricalIndex, which reset_index can't insert into.
+        df = _categorize_keys(df, groupby_fields, agg_dict, source, normalized)
+        # groupby + unstack rather than pivot_table: aggregate the observed
+        # (row, column) pairs once, then pivot the small result. pivot_table
+        # takes the same route but adds its own margins/dropna passes.
         try:
-            result_df = pd.pivot_table(
-                df,
-                index=groupby_fields,
-                columns=pivot_column,
-                values=agg_field,
-                aggfunc=agg_func,
-                fill_value=0,
+            result_df = (
+                df.groupby([*groupby_fields, pivot_column], observed=True)[agg_field]
+                .agg(agg_func)
+                .unstack(pivot_column, fill_value=0)
             )
         except Exception as e:
             return f"Pivot error: {e}"
@@ -603,7 +1477,7 @@ async def analyze(
         result_df = result_df.reset_index()
         total_groups = len(result_df)
         result_df = result_df.head(limit)
-        result_str = result_df.to_string(index=False)
+        result_str = result_df.to_string(index=False, max_cols=_MAX_OUTPUT_COLS)
         return (
             f"Pivot analysis of '{dataset}' ({len(df)} records):\n"
             f"Rows: {', '.join(groupby_fields)} | Columns: {pivot_column} "
@@ -616,11 +1490,21 @@ async def analyze(
     if groupby and not aggregate:
         # Value counts per group
         if len(groupby_fields) == 1:
-            counts = df[groupby_fields[0]].value_counts()
+            field = groupby_fields[0]
+            key = df[field]
+            if field not in normalized:
+                # The entry's cached categorical, if the column is a string
+                # one: counting is then a bincount over its codes
+                key = _categorize_keys(df, groupby_fields, {}, source)[field]
+            counts = key.value_counts()
+            if isinstance(key.dtype, pd.CategoricalDtype):
+                # Categorical counts list every category: drop the ones with
+                # no rows here (e.g. after a filter)
+                counts = counts[counts > 0]
             result_str = counts.head(limit).to_string()
         else:
-            counts = df.groupby(groupby_fields).size().reset_index(name="count")
-            counts = counts.sort_values("count", ascending=False).head(limit)
+            # Hash-based count, already sorted descending — no groupby/sort pass
+            counts = df.value_counts(subset=groupby_fields).head(limit).reset_index(name="count")
             result_str = counts.to_string(index=False)
         return (
             f"Group counts for '{dataset}' ({len(df)} records):\n\n"
@@ -629,36 +1513,53 @@ async def analyze(
         )
 
     # Parse aggregate spec
-    agg_dict = _parse_aggregates(aggregate, df.columns.tolist())
+    agg_dict = _parse_aggregates(aggregate, available)
     if isinstance(agg_dict, str):
         return agg_dict  # Error message
 
     if groupby_fields:
         # Grouped aggregation
+        df = _categorize_keys(df, groupby_fields, agg_dict, source, normalized)
+        # One grouper, one cython reduction per (field, func) pair, each
+        # landing directly under its flat Amount_sum name. Skips agg(dict)'s
+        # per-column dispatch and the MultiIndex columns it builds, and the
+        # group codes are computed once and shared by every pair.
+        # Reusable only when every row is present and the key columns are
+        # the same ones each time (aggregated keys skip categorization)
+        reusable = not filter and not normalized and not set(groupby_fields) & set(agg_dict)
         try:
-            result_df = df.groupby(groupby_fields).agg(agg_dict)
+            if reusable:
+                # Unprojected: the cached grouping serves any later agg field
+                grouped = _entry_groupby(entry, frame, df, groupby_fields)
+            else:
+                grouped = _project(df, groupby_fields, agg_dict).groupby(
+                    groupby_fields, observed=True
+                )
+            result_df = pd.DataFrame(
+                {
+                    f"{field}_{func}": getattr(grouped[field], func)()
+                    for field, funcs in agg_dict.items()
+                    for func in funcs
+                }
+            )
         except Exception as e:
             return f"Aggregation error: {e}"
-
-        # Flatten multi-level column names: (Amount, sum) -> Amount_sum
-        result_df.columns = [f"{col}_{func}" for col, func in result_df.columns]
         result_df = result_df.reset_index()
     else:
-        # Scalar aggregation -- apply agg across all rows
+        # Scalar aggregation -- apply agg across all rows. One reduction per
+        # (field, func) rather than df.agg(agg_dict): that aligns the results
+        # into one frame, NaN-filling missing pairs, which turns integer sums
+        # and counts into floats ("900" would print as "900.0").
         results = {}
         for field, funcs in agg_dict.items():
+            column = df[field]
             for func in funcs:
-                col_name = f"{field}_{func}"
-                results[col_name] = [getattr(df[field], func)()]
+                results[f"{field}_{func}"] = [getattr(column, func)()]
         result_df = pd.DataFrame(results)
 
     # Sort
     if sort:
-        parts = sort.strip().split()
-        sort_col = parts[0]
-        ascending = not (len(parts) > 1 and parts[1].lower() == "desc")
-        if sort_col in result_df.columns:
-            result_df = result_df.sort_values(sort_col, ascending=ascending)
+        result_df = _sort_result(result_df, sort)
 
     # Limit
     total_groups = len(result_df)
@@ -669,6 +1570,123 @@ async def analyze(
     return (
         f"Analysis of '{dataset}' ({len(df)} records aggregated):\n\n"
         f"{result_str}\n\n"
-        f"({total_groups} groups shown, {len(entry.df)} total records in dataset)"
+        f"({total_groups} groups shown, {len(frame)} total records in dataset)"
         + _format_norm_note(norm_notes)
     )
+
+
+# --- Server-side aggregation ($apply) ---
+# fm_analyze_remote pushes filter/groupby/aggregate to FM as an OData
+# $apply transformation, so only the summary rows cross the wire. Only
+# aggregates with an OData equivalent are accepted; median/std need a
+# loaded dataset. "count" is a row count ($count), not a non-null count.
+_ODATA_AGGS = {
+    "sum": "sum",
+    "mean": "average",
+    "min": "min",
+    "max": "max",
+    "nunique": "countdistinct",
+}
+
+# OData aliases must be identifiers
+_ALIAS_RE = re.compile(r"\W")
+
+
+def _build_apply(groupby_fields: list[str], aggregate: str, filter: str) -> str:
+    """Build an OData $apply value; raises ValueError on an unsupported spec."""
+    agg_exprs: list[str] = []
+    for spec in aggregate.split(","):
+        spec = spec.strip()
+        if not spec:
+            continue
+        func, sep, field = spec.partition(":")
+        func, field = func.strip().lower(), field.strip().strip('"')
+        if not sep or not field:
+            raise ValueError(f"Invalid aggregate '{spec}'. Use 'function:Field'.")
+        if func == "count":
+            expr = "$count as count"
+        elif func in _ODATA_AGGS:
+            expr = f'"{field}" with {_ODATA_AGGS[func]} as {_ALIAS_RE.sub("_", field)}_{func}'
+        else:
+            supported = ", ".join(sorted([*_ODATA_AGGS, "count"]))
+            raise ValueError(
+                f"'{func}' can't be computed server-side. Supported: {supported}. "
+                "Use fm_load_dataset + fm_analyze for other functions."
+            )
+        if expr not in agg_exprs:
+            agg_exprs.append(expr)
+    if not agg_exprs:
+        raise ValueError("aggregate is required (e.g., 'sum:Amount').")
+
+    steps: list[str] = []
+    if filter:
+        steps.append(f"filter({prepare_filter(filter)})")
+    aggregate_step = f"aggregate({','.join(agg_exprs)})"
+    if groupby_fields:
+        keys = quote_fields_in_select(",".join(groupby_fields))
+        steps.append(f"groupby(({keys}),{aggregate_step})")
+    else:
+        steps.append(aggregate_step)
+    return "/".join(steps)
+
+
+async def analyze_remote(
+    table: str,
+    groupby: str = "",
+    aggregate: str = "",
+    filter: str = "",
+    sort: str = "",
+    limit: int = 50,
+) -> str:
+    """Aggregate a table on the FM server via OData $apply.
+
+    Args:
+        table: FM table to aggregate.
+        groupby: Comma-separated fields to group by. Empty = one total row.
+        aggregate: Comma-separated function:field pairs
+            (sum, count, mean, min, max, nunique).
+        filter: OData $filter expression applied before grouping.
+        sort: Result column with optional direction, e.g. "Amount_sum desc".
+        limit: Maximum rows in output.
+
+    Returns:
+        Formatted summary table, or an error message.
+    """
+    if table not in EXPOSED_TABLES:
+        available = ", ".join(EXPOSED_TABLES.keys())
+        return f"Error: Unknown table '{table}'. Available tables: {available}"
+
+    groupby_fields = [f.strip() for f in groupby.split(",") if f.strip()]
+    try:
+        apply = _build_apply(groupby_fields, aggregate, filter)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    try:
+        data = await odata_client.get(table, params={"$apply": apply})
+    except ConnectionError as e:
+        return f"Connection error: {e}"
+    except PermissionError as e:
+        return f"Authentication error: {e}"
+    except ValueError as e:
+        return (
+            f"Server-side aggregation failed: {e}\n"
+            "Fall back to fm_load_dataset + fm_analyze for this query."
+        )
+
+    result_df = pd.DataFrame.from_records(data.get("value", []))
+    meta_cols = [c for c in result_df.columns if c.startswith("@")]
+    if meta_cols:
+        result_df = result_df.drop(columns=meta_cols)
+    if result_df.empty:
+        return f"No records in '{table}' matched." if filter else f"No records in '{table}'."
+
+    if sort:
+        result_df = _sort_result(result_df, sort)
+    total_groups = len(result_df)
+    result_df = result_df.head(limit)
+    return (
+        f"Server-side analysis of '{table}':\n\n"
+        f"{result_df.to_string(index=False)}\n\n"
+        f"({total_groups} groups)"
+    )
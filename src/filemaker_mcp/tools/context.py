@@ -5,10 +5,12 @@ and query patterns to TBL_DDL_Context in FileMaker. Records are loaded
 at next bootstrap to improve future query efficiency.
 """
 
+import functools
 import logging
+from typing import Any
 
 from filemaker_mcp.auth import odata_client
-from filemaker_mcp.ddl import CONTEXT_TABLE, remove_context, update_context
+from filemaker_mcp.ddl import CONTEXT_TABLE, DDL_CONTEXT, remove_context, set_context
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,11 @@ def _odata_escape(value: str) -> str:
     return value.replace("'", "''")
 
 
+# Distinct (table, field, type) filters kept — one per context entry touched
+_CONTEXT_FILTER_CACHE_SIZE = 512
+
+
+@functools.lru_cache(maxsize=_CONTEXT_FILTER_CACHE_SIZE)
 def _build_context_filter(table_name: str, field_name: str, context_type: str) -> str:
     """Build an OData $filter for context dedup lookup.
 
@@ -37,6 +44,44 @@ def _build_context_filter(table_name: str, field_name: str, context_type: str) -
     return " and ".join(parts)
 
 
+def _cached_record_key(table_name: str, field_name: str, context_type: str) -> str:
+    """PrimaryKey of the FM context record, if bootstrap or an earlier write saw it."""
+    entry = DDL_CONTEXT.get((table_name, field_name, context_type))
+    return entry.get("pk", "") if entry else ""
+
+
+async def _find_record_key(table_name: str, field_name: str, context_type: str) -> str:
+    """Look up the PrimaryKey of the matching context record ("" if none)."""
+    existing = await odata_client.get(
+        CONTEXT_TABLE,
+        params={
+            "$filter": _build_context_filter(table_name, field_name, context_type),
+            "$top": "1",
+        },
+    )
+    records = existing.get("value", [])
+    return str(records[0].get("PrimaryKey", "")) if records else ""
+
+
+def _created_record_key(response: dict[str, Any]) -> str:
+    """PrimaryKey from a POST response (the created record), or ""."""
+    record = response.get("value", [response])
+    if isinstance(record, list):
+        record = record[0] if record else {}
+    return str(record.get("PrimaryKey") or "")
+
+
+async def _patch_record(record_id: str, body: dict[str, str]) -> bool:
+    """PATCH a context record; False if FM no longer has it."""
+    try:
+        await odata_client.patch(f"{CONTEXT_TABLE}('{_odata_escape(record_id)}')", json_body=body)
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            return False
+        raise
+    return True
+
+
 async def save_context(
     table_name: str,
     context: str,
@@ -47,7 +92,9 @@ async def save_context(
     """Save an operational learning to TBL_DDL_Context in FileMaker.
 
     Deduplicates: if a record with the same TableName + FieldName + ContextType
-    already exists, it PATCHes instead of creating a duplicate.
+    already exists, it PATCHes instead of creating a duplicate. The record's
+    key is remembered from bootstrap or earlier writes, so an update is
+    usually a single PATCH; otherwise it is looked up first.
 
     Also updates the local DDL_CONTEXT cache so the hint takes effect
     immediately in the current session.
@@ -63,39 +110,24 @@ async def save_context(
         Success or error message string.
     """
     try:
-        # Check for existing record (deduplication)
-        existing = await odata_client.get(
-            CONTEXT_TABLE,
-            params={
-                "$filter": _build_context_filter(table_name, field_name, context_type),
-                "$top": "1",
-            },
-        )
-        records = existing.get("value", [])
-
-        if records:
-            # PATCH existing record
-            record_id = records[0].get("PrimaryKey", "")
-            await odata_client.patch(
-                f"{CONTEXT_TABLE}('{_odata_escape(str(record_id))}')",
-                json_body={"Context": context, "Source": source},
-            )
+        body = {"Context": context, "Source": source}
+        # Known record: PATCH directly. A stale key (deleted in FM) falls
+        # back to the lookup below.
+        record_id = _cached_record_key(table_name, field_name, context_type)
+        updated = bool(record_id) and await _patch_record(record_id, body)
+        if not updated:
+            # Check for existing record (deduplication)
+            record_id = await _find_record_key(table_name, field_name, context_type)
+            updated = bool(record_id) and await _patch_record(record_id, body)
+
+        if updated:
             # Update local cache
-            update_context(
-                [
-                    {
-                        "TableName": table_name,
-                        "FieldName": field_name,
-                        "ContextType": context_type,
-                        "Context": context,
-                    }
-                ]
-            )
+            set_context(table_name, field_name, context_type, context, record_id)
             logger.info("Updated context: %s.%s (%s)", table_name, field_name or "*", context_type)
             return f"Updated context for {table_name}.{field_name or '(table)'}: {context}"
         else:
             # POST new record
-            await odata_client.post(
+            created = await odata_client.post(
                 CONTEXT_TABLE,
                 json_body={
                     "TableName": table_name,
@@ -107,16 +139,7 @@ async def save_context(
                 },
             )
             # Update local cache
-            update_context(
-                [
-                    {
-                        "TableName": table_name,
-                        "FieldName": field_name,
-                        "ContextType": context_type,
-                        "Context": context,
-                    }
-                ]
-            )
+            set_context(table_name, field_name, context_type, context, _created_record_key(created))
             logger.info("Created context: %s.%s (%s)", table_name, field_name or "*", context_type)
             return f"Created context for {table_name}.{field_name or '(table)'}: {context}"
 
@@ -145,8 +168,9 @@ async def delete_context(
 ) -> str:
     """Delete an operational learning from TBL_DDL_Context in FileMaker.
 
-    Finds the matching record by TableName + FieldName + ContextType,
-    deletes it from FM, and removes it from the local cache.
+    Finds the matching record by TableName + FieldName + ContextType
+    (by its remembered key when known, else with a lookup), deletes it from
+    FM, and removes it from the local cache.
 
     Args:
         table_name: FM table this context applies to.
@@ -157,24 +181,25 @@ async def delete_context(
         Success or error message string.
     """
     try:
-        # Find the record to delete
-        existing = await odata_client.get(
-            CONTEXT_TABLE,
-            params={
-                "$filter": _build_context_filter(table_name, field_name, context_type),
-                "$top": "1",
-            },
-        )
-        records = existing.get("value", [])
-
-        if not records:
-            return (
-                f"No context found for {table_name}.{field_name or '(table)'} "
-                f"({context_type}) — nothing to delete."
-            )
-
-        record_id = records[0].get("PrimaryKey", "")
-        await odata_client.delete(f"{CONTEXT_TABLE}('{_odata_escape(str(record_id))}')")
+        record_id = _cached_record_key(table_name, field_name, context_type)
+        deleted = False
+        if record_id:
+            try:
+                await odata_client.delete(f"{CONTEXT_TABLE}('{_odata_escape(record_id)}')")
+                deleted = True
+            except ValueError as e:
+                if "not found" not in str(e).lower():
+                    raise
+
+        if not deleted:
+            # Find the record to delete
+            record_id = await _find_record_key(table_name, field_name, context_type)
+            if not record_id:
+                return (
+                    f"No context found for {table_name}.{field_name or '(table)'} "
+                    f"({context_type}) — nothing to delete."
+                )
+            await odata_client.delete(f"{CONTEXT_TABLE}('{_odata_escape(record_id)}')")
 
         # Remove from local cache
         remove_context(table_name, field_name, context_type)
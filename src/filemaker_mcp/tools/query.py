@@ -17,34 +17,65 @@ FM OData field name notes:
   - Use exact field names from the schema (case-sensitive)
 """
 
+import functools
 import logging
+import operator
 import re
+import time
 from datetime import date, datetime
 from typing import Any
 
 import pandas as pd  # type: ignore[import-untyped]
 
 from filemaker_mcp.auth import odata_client
-from filemaker_mcp.ddl import TABLES, get_cache_config, get_field_context, get_pk_field
+from filemaker_mcp.config import settings
+from filemaker_mcp.ddl import TABLES, get_cache_config, get_field_contexts, get_pk_field
+from filemaker_mcp.inflight import single_flight
 
 logger = logging.getLogger(__name__)
 
+# Distinct filter/select/orderby strings whose rewritten form is memoized.
+# The rewrites below are pure string -> string functions, and clients
+# repeat the same expressions while paging or re-asking a question.
+_EXPR_CACHE_SIZE = 1024
+
 # --- Date normalization for FM OData filters ---
 # FM OData requires bare ISO dates: 2026-02-14 (no quotes, no timestamp).
 # LLM clients may generate quoted dates, US format, or timestamps.
 
-# ISO timestamp suffix: T00:00:00, T14:30:00Z, T14:30:00-05:00, etc.
-_ISO_TIMESTAMP_RE = re.compile(r"(\d{4}-\d{2}-\d{2})T\d{2}:\d{2}:\d{2}[Z\d:.+\-]*")
+# Every date form normalized below, as one alternation so a filter is
+# scanned once:
+#   qiso - quoted ISO date, optionally with a timestamp inside the quotes
+#   ts   - ISO timestamp suffix: T00:00:00, T14:30:00Z, T14:30:00-05:00, etc.
+#   US   - M/D/YYYY or MM/DD/YYYY with optional HH:MM:SS AM/PM, its quotes
+#          (if any) dropped along with it
+_DATE_LITERAL_RE = re.compile(
+    r"""['"](?P<qiso>\d{4}-\d{2}-\d{2})(?:T[^'"]*)?['"]"""
+    r"|(?P<ts>\d{4}-\d{2}-\d{2})T\d{2}:\d{2}:\d{2}[Z\d:.+\-]*"
+    r"""|(?P<q>['"])?(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})"""
+    r"""(?:\s+\d{1,2}:\d{2}:\d{2}\s*(?:AM|PM)?)?(?(q)['"])"""
+)
+
+
+def _date_literal_to_iso(m: re.Match[str]) -> str:
+    """Replacement for a _DATE_LITERAL_RE match: the bare ISO date."""
+    iso = m.group("qiso") or m.group("ts")
+    if iso is not None:
+        return iso
+    return f"{m.group('year')}-{int(m.group('month')):02d}-{int(m.group('day')):02d}"
 
-# US date with optional time: M/D/YYYY or MM/DD/YYYY, optional HH:MM:SS AM/PM
-_US_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})(?:\s+\d{1,2}:\d{2}:\d{2}\s*(?:AM|PM)?)?")
 
+# A filter with none of these characters has no date to normalize
+_DATE_REWRITE_CHARS = ("'", '"', "T", "/")
 
+
+@functools.lru_cache(maxsize=_EXPR_CACHE_SIZE)
 def normalize_dates_in_filter(filter_str: str) -> str:
     """Normalize date formats in an OData $filter string for FM compatibility.
 
     FM OData requires bare ISO dates (2026-02-14). This catches common
-    wrong formats from LLM clients and FM JSON output.
+    wrong formats from LLM clients and FM JSON output. Results are
+    memoized, so a rewrite is logged once per distinct filter.
 
     Args:
         filter_str: Raw OData $filter expression.
@@ -52,34 +83,14 @@ def normalize_dates_in_filter(filter_str: str) -> str:
     Returns:
         Filter with dates normalized to bare ISO format.
     """
-    if not filter_str:
+    # Every rewrite below needs a quote, a "T" timestamp or a "/" date
+    if not filter_str or not any(c in filter_str for c in _DATE_REWRITE_CHARS):
         return filter_str
 
     original = filter_str
 
-    # 1. Strip quotes around ISO dates: '2026-02-14' or "2026-02-14" -> 2026-02-14
-    filter_str = re.sub(
-        r"""['"](\d{4}-\d{2}-\d{2})(?:T[^'"]*)?['"]""",
-        r"\1",
-        filter_str,
-    )
-
-    # 2. Strip ISO timestamp suffixes: 2026-02-14T00:00:00Z -> 2026-02-14
-    filter_str = _ISO_TIMESTAMP_RE.sub(r"\1", filter_str)
-
-    # 3. Convert US dates: MM/DD/YYYY or M/D/YYYY (with optional time) -> YYYY-MM-DD
-    def _us_to_iso(m: re.Match[str]) -> str:
-        month, day, year = m.group(1), m.group(2), m.group(3)
-        return f"{year}-{int(month):02d}-{int(day):02d}"
-
-    filter_str = _US_DATE_RE.sub(_us_to_iso, filter_str)
-
-    # 4. Strip quotes that may still surround converted ISO dates
-    filter_str = re.sub(
-        r"""['"](\d{4}-\d{2}-\d{2})['"]""",
-        r"\1",
-        filter_str,
-    )
+    # Quoted ISO dates, ISO timestamps and (quoted) US dates -> 2026-02-14
+    filter_str = _DATE_LITERAL_RE.sub(_date_literal_to_iso, filter_str)
 
     if filter_str != original:
         logger.warning("Normalized dates in filter: %r → %r", original, filter_str)
@@ -92,7 +103,22 @@ def normalize_dates_in_filter(filter_str: str) -> str:
 # We quote ALL field names unconditionally — FM accepts quoted names regardless of spaces.
 # Table names in URL paths must NOT be quoted (FM rejects them).
 
+# OData string function with a field argument: contains(Field,'value')
+_ODATA_FUNC_RE = re.compile(r"(contains|startswith|endswith)\(([^,]+),(.*?)\)")
+
+# Logical operators between clauses, captured so re-joining keeps them
+# (case-sensitive per the OData spec)
+_LOGICAL_SPLIT_RE = re.compile(r"(\s+(?:and|or)\s+)")
 
+# One comparison clause: <field> <op> <value>
+_COMP_OP_RE = re.compile(r"^(.*?)\s+(eq|ne|gt|ge|lt|le)\s+(.*)$")
+
+# Any comparison operator at all; a filter without one (and without a
+# function call) has no field names to quote
+_HAS_COMP_OP_RE = re.compile(r"\s(?:eq|ne|gt|ge|lt|le)\s")
+
+
+@functools.lru_cache(maxsize=_EXPR_CACHE_SIZE)
 def quote_fields_in_select(select: str) -> str:
     """Wrap each field name in a $select list with double quotes.
 
@@ -112,6 +138,15 @@ def quote_fields_in_select(select: str) -> str:
     return ",".join(fields)
 
 
+def _split_direction(clause: str) -> tuple[str, str]:
+    """Split "Field [asc|desc]" into (field, direction); direction may be ""."""
+    parts = clause.rsplit(None, 1)
+    if len(parts) == 2 and parts[1].lower() in ("asc", "desc"):
+        return parts[0].rstrip(), parts[1]
+    return clause, ""
+
+
+@functools.lru_cache(maxsize=_EXPR_CACHE_SIZE)
 def quote_fields_in_orderby(orderby: str) -> str:
     """Wrap field names in an $orderby expression with double quotes.
 
@@ -127,20 +162,15 @@ def quote_fields_in_orderby(orderby: str) -> str:
         clause = clause.strip()
         if not clause:
             continue
-        # Check for trailing asc/desc direction
-        direction = ""
-        for suffix in (" asc", " desc"):
-            if clause.lower().endswith(suffix):
-                direction = clause[-(len(suffix) - 1) :]  # preserve original case
-                clause = clause[: -(len(suffix) - 1)].strip()
-                direction = " " + direction.strip()
-                break
+        # Trailing asc/desc direction, original case preserved
+        clause, direction = _split_direction(clause)
         if not clause.startswith('"'):
             clause = f'"{clause}"'
-        parts.append(f"{clause}{direction}")
+        parts.append(f"{clause} {direction}" if direction else clause)
     return ",".join(parts)
 
 
+@functools.lru_cache(maxsize=_EXPR_CACHE_SIZE)
 def quote_fields_in_filter(filter_str: str) -> str:
     """Wrap field names in an OData $filter expression with double quotes.
 
@@ -151,7 +181,7 @@ def quote_fields_in_filter(filter_str: str) -> str:
     Input:  "Customer Name eq 'Smith' and ServiceDate ge 2026-02-14"
     Output: '"Customer Name" eq \'Smith\' and "ServiceDate" ge 2026-02-14'
     """
-    if not filter_str:
+    if not filter_str or ("(" not in filter_str and not _HAS_COMP_OP_RE.search(filter_str)):
         return filter_str
 
     # Handle OData functions: contains(Field Name,'value') → contains("Field Name",'value')
@@ -163,16 +193,11 @@ def quote_fields_in_filter(filter_str: str) -> str:
             field = f'"{field}"'
         return f"{func}({field},{rest})"
 
-    filter_str = re.sub(
-        r"(contains|startswith|endswith)\(([^,]+),(.*?)\)",
-        _quote_func_field,
-        filter_str,
-    )
+    filter_str = _ODATA_FUNC_RE.sub(_quote_func_field, filter_str)
 
     # Split on logical operators (and/or) while preserving them,
     # then process each comparison clause independently
-    # Pattern: split on ' and ' or ' or ' (case-sensitive per OData spec)
-    clauses = re.split(r"(\s+(?:and|or)\s+)", filter_str)
+    clauses = _LOGICAL_SPLIT_RE.split(filter_str)
 
     result_parts = []
     for part in clauses:
@@ -182,10 +207,7 @@ def quote_fields_in_filter(filter_str: str) -> str:
             continue
 
         # Check if this clause has an OData comparison operator
-        op_match = re.match(
-            r"^(.*?)\s+(eq|ne|gt|ge|lt|le)\s+(.*)$",
-            part.strip(),
-        )
+        op_match = _COMP_OP_RE.match(stripped)
         if op_match:
             field_name = op_match.group(1).strip()
             op = op_match.group(2)
@@ -203,9 +225,48 @@ def quote_fields_in_filter(filter_str: str) -> str:
     return "".join(result_parts)
 
 
+@functools.lru_cache(maxsize=_EXPR_CACHE_SIZE)
+def prepare_filter(filter_str: str) -> str:
+    """normalize_dates_in_filter then quote_fields_in_filter, as one cached step."""
+    return quote_fields_in_filter(normalize_dates_in_filter(filter_str))
+
+
 # --- Date range extraction for cache logic ---
 
-_DATE_RANGE_RE = re.compile(r'"?(\w+)"?\s+(ge|gt|le|lt|eq)\s+(\d{4}-\d{2}-\d{2})')
+# Operator and ISO date following a date field name. Matched anchored at
+# the end of each occurrence of the field (found with str.find), so the
+# regex engine never walks the rest of the filter. The date must end the
+# comparison, so a longer literal is not read as its date prefix.
+_DATE_BOUND_RE = re.compile(r"\s+(ge|gt|le|lt|eq)\s+(\d{4}-\d{2}-\d{2})(?=\s|\)|$)")
+
+
+def _date_bounds(filter_str: str, date_field: str) -> list[tuple[str, str, int, int]]:
+    """(operator, ISO date, start, end) of each date comparison on date_field.
+
+    start and end span the whole comparison, field name and quotes included.
+    """
+    bounds: list[tuple[str, str, int, int]] = []
+    if not filter_str or not date_field:
+        return bounds
+    # Unquoted occurrences count only for a plain word name
+    bare_ok = date_field.replace("_", "").isalnum()
+
+    pos = filter_str.find(date_field)
+    while pos != -1:
+        end = pos + len(date_field)
+        before = filter_str[pos - 1] if pos else ""
+        match = None
+        if before == '"':
+            # "Field": the closing quote must follow the name
+            if filter_str.startswith('"', end):
+                match = _DATE_BOUND_RE.match(filter_str, end + 1)
+        elif bare_ok and not (before.isalnum() or before == "_"):
+            match = _DATE_BOUND_RE.match(filter_str, end)
+        if match is not None:
+            start = pos - 1 if before == '"' else pos
+            bounds.append((match.group(1), match.group(2), start, match.end()))
+        pos = filter_str.find(date_field, end)
+    return bounds
 
 
 def extract_date_range(filter_str: str, date_field: str) -> tuple[str | None, str | None]:
@@ -222,20 +283,9 @@ def extract_date_range(filter_str: str, date_field: str) -> tuple[str | None, st
     Returns:
         Tuple of (min_date, max_date) as ISO date strings or None.
     """
-    if not filter_str or not date_field:
-        return (None, None)
-
     lower: str | None = None
     upper: str | None = None
-
-    for match in _DATE_RANGE_RE.finditer(filter_str):
-        field = match.group(1)
-        op = match.group(2)
-        val = match.group(3)
-
-        if field != date_field:
-            continue
-
+    for op, val, _, _ in _date_bounds(filter_str, date_field):
         if op == "eq":
             lower = val
             upper = val
@@ -281,6 +331,48 @@ def clear_exposed_tables() -> None:
     Called during tenant switching to remove stale table list.
     """
     EXPOSED_TABLES.clear()
+    invalidate_count_cache()
+
+
+# --- count_records result cache ---
+# {table: {filter: (expires_at, result_text)}}, expiry on time.monotonic().
+# Dropped per table whenever that table is queried, loaded, or flushed.
+_count_cache: dict[str, dict[str, tuple[float, str]]] = {}
+
+# Counts filtered only on the table's date field (its cache_config date_key),
+# with an upper bound before today, cover a closed window and change rarely,
+# so they are kept much longer than settings.count_cache_ttl. Any other
+# predicate (a status, a region) can change within that window.
+_CLOSED_WINDOW_COUNT_TTL = 24 * 3600.0
+_OR_RE = re.compile(r"\bor\b", re.IGNORECASE)
+_AND_SPLIT_RE = re.compile(r"\s+and\s+")
+# One date comparison: optional parentheses, field (quoted or not), op, ISO date
+_DATE_CLAUSE_RE = re.compile(r'\(*\s*"?(.+?)"?\s+(eq|ge|gt|lt|le)\s+(\d{4}-\d{2}-\d{2})\s*\)*')
+
+
+def _count_ttl(table: str, normalized_filter: str) -> float:
+    """Cache lifetime in seconds for a count of table with this (date-normalized) filter."""
+    config = get_cache_config(table)
+    date_field = config["date_field"] if config else ""
+    if date_field and normalized_filter:
+        upper: list[str] = []
+        for clause in _AND_SPLIT_RE.split(normalized_filter.strip()):
+            m = _DATE_CLAUSE_RE.fullmatch(clause)
+            if m is None or m.group(1) != date_field:
+                return float(settings.count_cache_ttl)
+            if m.group(2) in ("lt", "le"):
+                upper.append(m.group(3))
+        if upper and min(upper) < date.today().isoformat():
+            return _CLOSED_WINDOW_COUNT_TTL
+    return float(settings.count_cache_ttl)
+
+
+def invalidate_count_cache(table: str = "") -> None:
+    """Drop cached counts for one table, or for all tables if table is empty."""
+    if table:
+        _count_cache.pop(table, None)
+    else:
+        _count_cache.clear()
 
 
 def _enrich_results(
@@ -300,9 +392,10 @@ def _enrich_results(
     Returns:
         Enriched text with context hints appended.
     """
+    contexts = get_field_contexts(table)
     hints: list[str] = []
     for field in result_fields:
-        ctx = get_field_context(table, field)
+        ctx = contexts.get(field)
         if ctx:
             hints.append(f"  {field}: {ctx}")
 
@@ -318,15 +411,68 @@ def _enrich_results(
     return formatted.rstrip() + "\n\n" + "\n\n".join(sections) + "\n"
 
 
+# Display length past which string values are cut and marked truncated
+_MAX_VALUE_CHARS = 500
+_TRUNCATED_SUFFIX = "... [truncated]"
+
+
 def _format_value(value: Any) -> str:
     """Format a field value for display, handling FM quirks."""
     if value is None:
         return ""
-    if isinstance(value, str) and len(value) > 500:
-        return value[:500] + "... [truncated]"
+    if isinstance(value, str) and len(value) > _MAX_VALUE_CHARS:
+        return value[:_MAX_VALUE_CHARS] + _TRUNCATED_SUFFIX
     return str(value)
 
 
+# Records formatted per chunk: each chunk's per-field line strings are joined
+# and released before the next, so large results (top up to 10000) don't hold
+# every intermediate line at once.
+_FORMAT_CHUNK_SIZE = 500
+
+
+# Row layouts keyed by a record's key tuple: the "  Field: " line prefixes
+# with OData metadata keys (@id, @editLink, @odata.*) already dropped. All
+# rows of a response share one key order, so the layout is built once per
+# $select shape instead of once per field per row.
+_ROW_LAYOUTS_MAX = 256
+_row_layouts: dict[tuple[str, ...], tuple[tuple[str, str], ...]] = {}
+
+
+def _row_layout(keys: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    """Return (key, line prefix) pairs for the displayable keys of a record."""
+    layout = _row_layouts.get(keys)
+    if layout is None:
+        layout = tuple((key, f"  {key}: ") for key in keys if not key.startswith("@"))
+        if len(_row_layouts) >= _ROW_LAYOUTS_MAX:
+            _row_layouts.clear()
+        _row_layouts[keys] = layout
+    return layout
+
+
+def _format_record_chunk(records: list[dict[str, Any]], start: int) -> str:
+    """Format consecutive records as "--- Record N ---" blocks, numbered from start.
+
+    Values are formatted as in _format_value, inlined: this loop runs once
+    per cell, and most cells are short strings that need no conversion.
+    """
+    lines: list[str] = []
+    append = lines.append
+    for i, record in enumerate(records, start):
+        append(f"--- Record {i} ---")
+        for key, prefix in _row_layout(tuple(record)):
+            value = record[key]
+            if value is None or value == "":  # Only show non-empty fields
+                continue
+            if type(value) is not str:
+                value = str(value)
+            elif len(value) > _MAX_VALUE_CHARS:
+                value = value[:_MAX_VALUE_CHARS] + _TRUNCATED_SUFFIX
+            append(prefix + value)
+        append("")
+    return "\n".join(lines)
+
+
 def _format_records(data: dict[str, Any], table: str) -> str:
     """Format OData response into readable text for the AI client.
 
@@ -342,38 +488,66 @@ def _format_records(data: dict[str, Any], table: str) -> str:
             return f"Found {count} total records in {table} (none returned — check $top/$skip)."
         return f"No records found in {table} matching your query."
 
-    lines = []
-
     # Header with count info
     if count is not None:
-        lines.append(f"Found {count} total records in {table} (showing {len(records)}):")
+        header = f"Found {count} total records in {table} (showing {len(records)}):"
     else:
-        lines.append(f"Showing {len(records)} records from {table}:")
+        header = f"Showing {len(records)} records from {table}:"
 
-    lines.append("")
-
-    # Format each record
-    for i, record in enumerate(records, 1):
-        lines.append(f"--- Record {i} ---")
-        for key, value in record.items():
-            # Skip OData metadata fields (@id, @editLink, @odata.*)
-            if key.startswith("@"):
-                continue
-            formatted = _format_value(value)
-            if formatted:  # Only show non-empty fields
-                lines.append(f"  {key}: {formatted}")
-        lines.append("")
-
-    return "\n".join(lines)
+    chunks = [header, ""]
+    for start in range(0, len(records), _FORMAT_CHUNK_SIZE):
+        chunks.append(_format_record_chunk(records[start : start + _FORMAT_CHUNK_SIZE], start + 1))
+    return "\n".join(chunks)
 
 
 # --- Non-date filter extraction for in-memory filtering ---
 
+# Operator and value of one comparison: 'string' (group 2) or number (3).
+# The field name is read back from the text before the operator (see
+# _comparisons) rather than matched here: a "words before the operator"
+# pattern is retried at every word of the filter, which is quadratic, and
+# also swallowed the preceding "and" into the name. The lookbehind starts
+# each match only at the beginning of a whitespace run. The value must end
+# the comparison, so a '' escape, a date or a longer number is not read
+# as a shorter literal.
 _NON_DATE_FILTER_RE = re.compile(
-    r'"?(\w[\w\s]*\w|\w+)"?\s+(eq|ne|gt|ge|lt|le)\s+'
-    r"(?:'([^']*)'|(\d+(?:\.\d+)?))"
+    r"(?<=\S)\s+(eq|ne|gt|ge|lt|le)\s+(?:'([^']*)'|(\d+(?:\.\d+)?))(?=\s|\)|$)"
 )
 
+# Unquoted field name: words separated by whitespace
+_BARE_FIELD_RE = re.compile(r"\w+(?:\s+\w+)*")
+
+
+def _comparisons(filter_str: str) -> list[tuple[str, str, str, int, int]]:
+    """(field, operator, value, start, end) of each plain comparison in filter_str.
+
+    A plain comparison sets a field against a 'string' or an unsigned
+    number; start and end span the whole comparison, field name and quotes
+    included.
+    """
+    results = []
+    start = 0
+    for m in _NON_DATE_FILTER_RE.finditer(filter_str):
+        # Field: the text since the previous comparison. A quoted name runs
+        # back to its opening quote and may itself contain " and "/" or ";
+        # a bare name follows the last logical operator and any parentheses.
+        head = filter_str[start : m.start()]
+        start = m.end()
+        if head.endswith('"'):
+            open_quote = head.rfind('"', 0, len(head) - 1)
+            if open_quote == -1:
+                continue
+            field = head[open_quote + 1 : -1]
+            field_start = m.start() - len(head) + open_quote
+        else:
+            field = _LOGICAL_SPLIT_RE.split(head)[-1].strip().lstrip("(").strip()
+            if not _BARE_FIELD_RE.fullmatch(field):
+                continue
+            field_start = m.start() - len(field)
+        value = m.group(2) if m.group(2) is not None else m.group(3)
+        results.append((field, m.group(1), value, field_start, m.end()))
+    return results
+
 
 def _extract_non_date_filters(filter_str: str, date_field: str) -> list[tuple[str, str, str]]:
     """Extract non-date comparison clauses from an OData filter.
@@ -381,15 +555,22 @@ def _extract_non_date_filters(filter_str: str, date_field: str) -> list[tuple[st
     Returns list of (field_name, operator, value) tuples, excluding
     comparisons on the date field (those are handled by date range logic).
     """
-    results = []
-    for m in _NON_DATE_FILTER_RE.finditer(filter_str):
-        field = m.group(1).strip()
-        if field == date_field:
-            continue
-        op = m.group(2)
-        value = m.group(3) if m.group(3) is not None else m.group(4)
-        results.append((field, op, value))
-    return results
+    return [
+        (field, op, value)
+        for field, op, value, _, _ in _comparisons(filter_str)
+        if field != date_field
+    ]
+
+
+# OData comparison operators as Python callables
+_COMPARE_OPS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+}
 
 
 def _apply_filters_to_df(
@@ -398,6 +579,7 @@ def _apply_filters_to_df(
     date_field: str,
     req_min: str | None,
     req_max: str | None,
+    str_columns: dict[str, tuple[pd.Index, pd.Series]] | None = None,
 ) -> pd.DataFrame:
     """Apply date range + non-date OData filters to a DataFrame.
 
@@ -407,61 +589,143 @@ def _apply_filters_to_df(
         date_field: Date field name for date range filtering.
         req_min: Requested minimum date (ISO string or None).
         req_max: Requested maximum date (ISO string or None).
+        str_columns: Optional per-frame cache of string columns for eq/ne
+            clauses (a cached DatasetEntry's str_columns).
 
     Returns:
         Filtered DataFrame.
+
+    Every clause is evaluated against the whole frame and the results are
+    and-ed into one boolean mask, so rows are selected once at the end
+    rather than copied per clause. A column's string or numeric form is
+    computed once however many clauses use it.
     """
     if not filter_str:
         return df
 
-    # Apply date filters
+    conditions: list[pd.Series] = []
+
+    # Date filters
     if req_min and date_field in df.columns:
-        df = df[df[date_field] >= pd.Timestamp(req_min)]
+        conditions.append(df[date_field] >= pd.Timestamp(req_min))
     if req_max and date_field in df.columns:
-        df = df[df[date_field] <= pd.Timestamp(req_max)]
+        conditions.append(df[date_field] <= pd.Timestamp(req_max))
 
-    # Apply non-date OData filters
-    non_date_parts = _extract_non_date_filters(filter_str, date_field)
-    for field_name, op, value in non_date_parts:
+    # Non-date OData filters
+    as_str: dict[str, pd.Series] = {}
+    as_num: dict[str, pd.Series] = {}
+    for field_name, op, value in _extract_non_date_filters(filter_str, date_field):
         if field_name not in df.columns:
             continue
-        if op == "eq":
-            df = df[df[field_name].astype(str) == value]
-        elif op == "ne":
-            df = df[df[field_name].astype(str) != value]
-        elif op in ("gt", "ge", "lt", "le"):
+        if op in ("eq", "ne"):
+            if field_name not in as_str:
+                as_str[field_name] = _string_column(df, field_name, str_columns)
+            conditions.append(_COMPARE_OPS[op](as_str[field_name], value))
+        elif op in _COMPARE_OPS:
             try:
                 num_val = float(value)
-                numeric_col = pd.to_numeric(df[field_name], errors="coerce")
-                if op == "gt":
-                    df = df[numeric_col > num_val]
-                elif op == "ge":
-                    df = df[numeric_col >= num_val]
-                elif op == "lt":
-                    df = df[numeric_col < num_val]
-                elif op == "le":
-                    df = df[numeric_col <= num_val]
             except (ValueError, TypeError):
-                pass  # Skip non-numeric comparisons
-    return df
+                continue  # Skip non-numeric comparisons
+            if field_name not in as_num:
+                as_num[field_name] = pd.to_numeric(df[field_name], errors="coerce")
+            conditions.append(_COMPARE_OPS[op](as_num[field_name], num_val))
+
+    if not conditions:
+        return df
+    mask = conditions[0]
+    for condition in conditions[1:]:
+        mask = mask & condition
+    return df[mask]
+
+
+def _string_column(
+    df: pd.DataFrame, field: str, cache: dict[str, tuple[pd.Index, pd.Series]] | None
+) -> pd.Series:
+    """df[field].astype(str), kept in cache as a categorical for reuse.
+
+    A cached table is filtered on every query, so its string form is built
+    once per loaded frame (keyed on df.index, which a merge replaces). The
+    categorical compares eq/ne values against its categories, then maps
+    the result through integer codes instead of comparing every string.
+    """
+    if cache is None:
+        return df[field].astype(str)
+    index = df.index
+    cached = cache.get(field)
+    if cached is not None and cached[0] is index:
+        return cached[1]
+    column = df[field].astype(str).astype("category")
+    cache[field] = (index, column)
+    return column
+
+
+# "not" anywhere: _apply_filters_to_df has no negation, and a bare name
+# could otherwise swallow it ("not Name eq 'a'")
+_NOT_RE = re.compile(r"\bnot\b", re.IGNORECASE)
+
+# Text allowed around the comparisons of a cacheable filter: "and"
+# between two of them, parentheses and whitespace anywhere
+_EDGE_GAP_RE = re.compile(r"[\s()]*")
+_AND_GAP_RE = re.compile(r"[\s()]*\sand\s[\s()]*")
+
+
+def _filter_is_cacheable(filter_str: str, date_field: str) -> bool:
+    """Whether _apply_filters_to_df can evaluate filter_str in full.
+
+    It applies and-ed plain comparisons (see _comparisons) on fields other
+    than date_field, and ISO-date bounds on date_field. Anything else in
+    the filter (a function call, "or", "not", true/false/null, a signed or
+    non-ISO literal, a '' escape) must go to FM, or the cached answer would
+    ignore part of it.
+    """
+    if not filter_str:
+        return True
+    if _ODATA_FUNC_RE.search(filter_str) or _OR_RE.search(filter_str):
+        return False
+    if _NOT_RE.search(filter_str):
+        return False
+    spans = [(start, end) for _, _, start, end in _date_bounds(filter_str, date_field)]
+    spans += [
+        (start, end) for field, _, _, start, end in _comparisons(filter_str) if field != date_field
+    ]
+    spans.sort()
+    if not spans:
+        return False
+    pos = 0
+    for i, (start, end) in enumerate(spans):
+        gap_re = _AND_GAP_RE if i else _EDGE_GAP_RE
+        if start < pos or not gap_re.fullmatch(filter_str, pos, start):
+            return False
+        pos = end
+    return _EDGE_GAP_RE.fullmatch(filter_str, pos) is not None
+
+
+def _filter_columns_present(filter_str: str, date_field: str, columns: pd.Index) -> bool:
+    """Whether every non-date field filter_str compares is a column of the cache."""
+    return all(
+        field in columns for field, _, _ in _extract_non_date_filters(filter_str, date_field)
+    )
 
 
 def _apply_orderby_to_df(df: pd.DataFrame, orderby: str) -> pd.DataFrame:
-    """Apply OData $orderby to a DataFrame."""
+    """Apply OData $orderby to a DataFrame.
+
+    All clauses go into one stable multi-key sort_values call; unknown
+    columns are skipped.
+    """
     if not orderby:
         return df
-    for clause in reversed(orderby.split(",")):
-        clause = clause.strip()
-        asc = True
-        for suffix in (" asc", " desc"):
-            if clause.lower().endswith(suffix):
-                asc = suffix.strip() == "asc"
-                clause = clause[: -(len(suffix) - 1)].strip()
-                break
-        clause = clause.strip('"')
-        if clause in df.columns:
-            df = df.sort_values(clause, ascending=asc)
-    return df
+    by: list[str] = []
+    ascending: list[bool] = []
+    for clause in orderby.split(","):
+        field, direction = _split_direction(clause.strip())
+        field = field.strip('"')
+        if field in df.columns and field not in by:
+            by.append(field)
+            ascending.append(direction.lower() != "desc")
+    if not by:
+        return df
+    return df.sort_values(by, ascending=ascending, kind="stable")
 
 
 def _apply_select_to_df(df: pd.DataFrame, select: str) -> pd.DataFrame:
@@ -484,7 +748,7 @@ async def _fetch_and_cache_gap(
 
     Returns True on success, False on failure.
     """
-    from filemaker_mcp.tools.analytics import merge_into_table_cache
+    from filemaker_mcp.tools.analytics import fetch_records_frame, merge_into_table_cache
 
     gap_filter_parts: list[str] = []
     if gap_min:
@@ -498,29 +762,11 @@ async def _fetch_and_cache_gap(
         gap_params["$filter"] = gap_filter
 
     try:
-        all_records: list[dict[str, object]] = []
-        skip_offset = 0
-        while True:
-            page_params = {**gap_params}
-            if skip_offset > 0:
-                page_params["$skip"] = str(skip_offset)
-            data = await odata_client.get(table, params=page_params)
-            records = data.get("value", [])
-            all_records.extend(records)
-            if len(records) < 10000:
-                break
-            skip_offset += 10000
-
-        if all_records:
-            gap_df = pd.DataFrame(all_records)
-            meta_cols = [c for c in gap_df.columns if c.startswith("@")]
-            if meta_cols:
-                gap_df = gap_df.drop(columns=meta_cols)
-            # Convert date columns using DDL type info
-            table_ddl = TABLES.get(table, {})
-            for fname, fdef in table_ddl.items():
-                if fdef.get("type") in ("date", "datetime") and fname in gap_df.columns:
-                    gap_df[fname] = pd.to_datetime(gap_df[fname], format="mixed", errors="coerce")
+        # Date columns are parsed per page, using DDL type info
+        gap_df = await fetch_records_frame(
+            table, gap_params, odata_client, parse_dates=True, table_ddl=TABLES.get(table, {})
+        )
+        if not gap_df.empty:
             merge_into_table_cache(
                 table=table,
                 new_df=gap_df,
@@ -578,6 +824,9 @@ async def query_records(
     # Cap results — FM OData supports up to 10,000 per request
     top = min(top, 10000)
 
+    # A fresh look at the table's data: later counts should be fresh too
+    invalidate_count_cache(table)
+
     # --- Cache check ---
     from filemaker_mcp.tools.analytics import _table_cache, compute_date_gaps
 
@@ -594,7 +843,9 @@ async def query_records(
         # Only use cache if filter references the date field OR we already have data cached.
         # Without this guard, a filter on a non-date field triggers an unbounded
         # full-table fetch (no $filter, no $select) which times out on large tables.
-        if req_min is not None or req_max is not None or existing:
+        if not _filter_is_cacheable(normalized_filter, date_field):
+            logger.info("Skipping date_range cache for %s — filter needs FM to evaluate", table)
+        elif req_min is not None or req_max is not None or existing:
             use_date_cache = True
         else:
             logger.info(
@@ -634,21 +885,28 @@ async def query_records(
                 all_ok = False
                 break
 
-        # Serve from cache if we have data
+        # Serve from cache if we have data. A filter on a column the cache
+        # lacks can't be applied in memory; FM answers it instead.
         cached = _table_cache.get(table)
-        if cached is not None and all_ok:
+        if (
+            cached is not None
+            and all_ok
+            and _filter_columns_present(normalized_filter, date_field, cached.df.columns)
+        ):
             result_df = _apply_filters_to_df(
-                cached.df.copy(), normalized_filter, date_field, req_min, req_max
+                cached.df, normalized_filter, date_field, req_min, req_max, cached.str_columns
             )
             result_df = _apply_orderby_to_df(result_df, orderby)
             total_count = len(result_df)
             result_df = result_df.iloc[skip : skip + top]
             result_df = _apply_select_to_df(result_df, select)
-            records_list = result_df.to_dict("records")
-            data = {"value": records_list, "@count": total_count}
+            # Column names come from the frame, not from the first record dict
             field_names = (
-                [k for k in records_list[0] if not str(k).startswith("@")] if records_list else []
+                [c for c in result_df.columns if not str(c).startswith("@")]
+                if len(result_df)
+                else []
             )
+            data = {"value": result_df.to_dict("records"), "@count": total_count}
             formatted = _format_records(data, table)
             c_info = f"{cached.row_count} rows cached for {table}"
             if cached.date_min and cached.date_max:
@@ -656,29 +914,23 @@ async def query_records(
             c_info += ". Use fm_analyze for aggregation — no FM call needed."
             return _enrich_results(formatted, table, field_names, cache_info=c_info)
 
-    if not use_date_cache and cache_config and cache_config["mode"] == "cache_all":
+    if (
+        not use_date_cache
+        and cache_config
+        and cache_config["mode"] == "cache_all"
+        and _filter_is_cacheable(filter, "")
+    ):
         pk_field = get_pk_field(table)
-        if table not in _table_cache:
+        clauses = _extract_non_date_filters(filter, "") if filter else []
+        # An eq filter usually selects a small slice: FM can answer it
+        # directly, cheaper than downloading the whole table to filter here
+        selective = any(op == "eq" for _, op, _ in clauses)
+        if table not in _table_cache and not selective:
             try:
-                all_records: list[dict[str, object]] = []
-                skip_offset = 0
-                while True:
-                    p: dict[str, str] = {"$top": "10000"}
-                    if skip_offset > 0:
-                        p["$skip"] = str(skip_offset)
-                    data = await odata_client.get(table, params=p)
-                    records = data.get("value", [])
-                    all_records.extend(records)
-                    if len(records) < 10000:
-                        break
-                    skip_offset += 10000
-                if all_records:
-                    df = pd.DataFrame(all_records)
-                    meta_cols = [c for c in df.columns if c.startswith("@")]
-                    if meta_cols:
-                        df = df.drop(columns=meta_cols)
-                    from filemaker_mcp.tools.analytics import DatasetEntry
+                from filemaker_mcp.tools.analytics import DatasetEntry, fetch_records_frame
 
+                df = await fetch_records_frame(table, {"$top": "10000"}, odata_client)
+                if not df.empty:
                     _table_cache[table] = DatasetEntry(
                         df=df,
                         table=table,
@@ -695,25 +947,19 @@ async def query_records(
                 pass  # Fall through to normal query
 
         cached = _table_cache.get(table)
-        if cached is not None:
-            result_df = cached.df.copy()
+        if cached is not None and all(field in cached.df.columns for field, _, _ in clauses):
             # Apply non-date filters (cache_all has no date field)
-            non_date_parts = _extract_non_date_filters(filter, "") if filter else []
-            for field_name, op, value in non_date_parts:
-                if field_name in result_df.columns:
-                    if op == "eq":
-                        result_df = result_df[result_df[field_name].astype(str) == value]
-                    elif op == "ne":
-                        result_df = result_df[result_df[field_name].astype(str) != value]
+            result_df = _apply_filters_to_df(cached.df, filter, "", None, None, cached.str_columns)
             result_df = _apply_orderby_to_df(result_df, orderby)
             total_count = len(result_df)
             result_df = result_df.iloc[skip : skip + top]
             result_df = _apply_select_to_df(result_df, select)
-            records_list = result_df.to_dict("records")
-            data = {"value": records_list, "@count": total_count}
             field_names = (
-                [k for k in records_list[0] if not str(k).startswith("@")] if records_list else []
+                [c for c in result_df.columns if not str(c).startswith("@")]
+                if len(result_df)
+                else []
             )
+            data = {"value": result_df.to_dict("records"), "@count": total_count}
             formatted = _format_records(data, table)
             c_info = (
                 f"{cached.row_count} rows cached for {table}. "
@@ -725,7 +971,7 @@ async def query_records(
     params: dict[str, str] = {"$top": str(top)}
 
     if filter:
-        params["$filter"] = quote_fields_in_filter(normalize_dates_in_filter(filter))
+        params["$filter"] = prepare_filter(filter)
     if select:
         params["$select"] = quote_fields_in_select(select)
     if skip > 0:
@@ -832,12 +1078,24 @@ async def count_records(table: str, filter: str = "") -> str:
         available = ", ".join(EXPOSED_TABLES.keys())
         return f"Error: Unknown table '{table}'. Available tables: {available}"
 
+    table_counts = _count_cache.get(table)
+    cached = table_counts.get(filter) if table_counts else None
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    # Identical concurrent counts share one FM request
+    return await single_flight(("count", table, filter), lambda: _fetch_count(table, filter))
+
+
+async def _fetch_count(table: str, filter: str) -> str:
+    """Fetch a record count from FM and cache the result text."""
     # FM OData returns 0 count when $top=0, so use $top=1 with $select
     # on a small field to minimize data transfer.
     pk = get_pk_field(table)
     params: dict[str, str] = {"$count": "true", "$top": "1", "$select": f'"{pk}"'}
+    normalized_filter = normalize_dates_in_filter(filter) if filter else ""
     if filter:
-        params["$filter"] = quote_fields_in_filter(normalize_dates_in_filter(filter))
+        params["$filter"] = quote_fields_in_filter(normalized_filter)
 
     try:
         data = await odata_client.get(table, params=params)
@@ -845,9 +1103,13 @@ async def count_records(table: str, filter: str = "") -> str:
         count = data.get("@odata.count") or data.get("@count", "unknown")
 
         if filter:
-            return f"{table}: {count} records matching filter '{filter}'"
+            result = f"{table}: {count} records matching filter '{filter}'"
         else:
-            return f"{table}: {count} total records"
+            result = f"{table}: {count} total records"
+        ttl = _count_ttl(table, normalized_filter)
+        if ttl > 0:
+            _count_cache.setdefault(table, {})[filter] = (time.monotonic() + ttl, result)
+        return result
 
     except Exception as e:
         logger.exception("Error counting records in %s", table)
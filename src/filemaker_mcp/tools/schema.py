@@ -20,7 +20,7 @@ from filemaker_mcp.ddl import (
     TABLES,
     FieldAnnotations,
     FieldDef,
-    get_field_context,
+    get_field_contexts,
     get_table_context,
     is_script_available,
     set_script_available,
@@ -29,6 +29,7 @@ from filemaker_mcp.ddl import (
     update_tables,
 )
 from filemaker_mcp.ddl_parser import parse_ddl
+from filemaker_mcp.inflight import single_flight
 from filemaker_mcp.tools.query import EXPOSED_TABLES
 
 logger = logging.getLogger(__name__)
@@ -162,7 +163,7 @@ def _format_ddl_schema(table: str, fields: dict[str, FieldDef], show_all: bool =
         Formatted schema text with tier markers.
     """
     total = len(fields)
-    internal_count = sum(1 for f in fields.values() if f.get("tier") == "internal")
+    internal_count = sum(1 for f in fields.values() if f.tier == "internal")
     hidden = 0 if show_all else internal_count
 
     lines: list[str] = []
@@ -181,30 +182,31 @@ def _format_ddl_schema(table: str, fields: dict[str, FieldDef], show_all: bool =
             lines.append(f"  Note: {ctx['context']}")
         lines.append("")
 
+    field_contexts = get_field_contexts(table)
     for field_name, field_def in fields.items():
-        tier = field_def.get("tier", "standard")
+        tier = field_def.tier
 
         if not show_all and tier == "internal":
             continue
 
         markers: list[str] = []
-        if field_def.get("pk"):
+        if field_def.pk:
             markers.append("PK")
-        if field_def.get("fk"):
+        if field_def.fk:
             markers.append("FK")
         if tier == "key":
             markers.append("key")
         if tier == "internal":
             markers.append("internal")
 
-        field_type = field_def.get("type", "unknown")
+        field_type = field_def.type
         marker_str = f" [{', '.join(markers)}]" if markers else ""
         date_hint = (
             "  (filter as: YYYY-MM-DD, no quotes)" if field_type in ("datetime", "date") else ""
         )
 
         # Context hint for this field
-        ctx_hint = get_field_context(table, field_name)
+        ctx_hint = field_contexts.get(field_name)
         ctx_str = f"  -- {ctx_hint}" if ctx_hint else ""
 
         lines.append(f"  {field_name}: {field_type}{marker_str}{date_hint}{ctx_str}")
@@ -627,6 +629,30 @@ async def _refresh_ddl_via_script(table_names: list[str]) -> bool:
         return False
 
 
+async def prewarm_schema() -> int:
+    """Cache DDL for exposed tables that bootstrap left uncached.
+
+    bootstrap_ddl normally caches every exposed table. Any gaps are filled
+    with one DDL script call at startup, so the first get_schema(table) per
+    table is a cache hit instead of a live FM round trip. Failures are
+    logged and leave those tables to the normal on-demand path.
+
+    Returns:
+        Number of previously uncached tables that are now cached.
+    """
+    missing = [t for t in EXPOSED_TABLES if not TABLES.get(t)]
+    if not missing:
+        return 0
+    try:
+        await _refresh_ddl_via_script(missing)
+    except Exception as e:
+        logger.warning("Schema prewarm failed for %d tables: %s", len(missing), e)
+        return 0
+    warmed = sum(1 for t in missing if TABLES.get(t))
+    logger.info("Schema prewarm: cached %d of %d uncached tables", warmed, len(missing))
+    return warmed
+
+
 async def bootstrap_ddl() -> None:
     """Bootstrap DDL for all FM-visible base tables on server startup.
 
@@ -772,6 +798,18 @@ async def _load_context() -> None:
         logger.exception("DDL bootstrap step 6: unexpected error loading context")
 
 
+async def _fetch_table_schema(table: str, show_all: bool) -> str:
+    """Fetch one table's schema live: DDL script first, then $metadata."""
+    script_ok = await _refresh_ddl_via_script([table])
+
+    # If script worked and table is now cached, return it
+    if script_ok and table in TABLES and TABLES[table]:
+        return _format_ddl_schema(table, TABLES[table], show_all=show_all)
+
+    # Fallback: $metadata
+    return await _get_schema_from_metadata(table)
+
+
 async def get_schema(table: str = "", refresh: bool = False, show_all: bool = False) -> str:
     """Get the database schema (tables and fields) from FileMaker.
 
@@ -796,15 +834,10 @@ async def get_schema(table: str = "", refresh: bool = False, show_all: bool = Fa
             if not refresh and table in TABLES and TABLES[table]:
                 return _format_ddl_schema(table, TABLES[table], show_all=show_all)
 
-            # Cache miss or refresh — try live DDL
-            script_ok = await _refresh_ddl_via_script([table])
-
-            # If script worked and table is now cached, return it
-            if script_ok and table in TABLES and TABLES[table]:
-                return _format_ddl_schema(table, TABLES[table], show_all=show_all)
-
-            # Fallback: $metadata
-            return await _get_schema_from_metadata(table)
+            # Cache miss or refresh — identical concurrent lookups share one fetch
+            return await single_flight(
+                ("schema", table, show_all), lambda: _fetch_table_schema(table, show_all)
+            )
 
         # No table specified — list available tables
         lines = [
@@ -11,8 +11,9 @@ import pytest
 @pytest.fixture(autouse=True)
 def _populate_test_tables():
     """Ensure EXPOSED_TABLES and TABLES have sample data for all tests."""
-    from filemaker_mcp.ddl import TABLES
-    from filemaker_mcp.tools.query import EXPOSED_TABLES
+    from filemaker_mcp.ddl import TABLES, FieldDef
+    from filemaker_mcp.tools.analytics import clear_analyze_cache
+    from filemaker_mcp.tools.query import EXPOSED_TABLES, invalidate_count_cache
 
     # Sample tables for testing
     test_tables = {
@@ -26,31 +27,31 @@ def _populate_test_tables():
     # Sample DDL for testing
     test_ddl = {
         "Customers": {
-            "CustomerID": {"type": "number", "tier": "key", "pk": True},
-            "Company Name": {"type": "text", "tier": "key"},
-            "City": {"type": "text", "tier": "key"},
-            "State": {"type": "text", "tier": "standard"},
-            "Phone": {"type": "text", "tier": "key"},
-            "Email": {"type": "text", "tier": "standard"},
+            "CustomerID": FieldDef(type="number", tier="key", pk=True),
+            "Company Name": FieldDef(type="text", tier="key"),
+            "City": FieldDef(type="text", tier="key"),
+            "State": FieldDef(type="text", tier="standard"),
+            "Phone": FieldDef(type="text", tier="key"),
+            "Email": FieldDef(type="text", tier="standard"),
         },
         "Invoices": {
-            "PrimaryKey": {"type": "text", "tier": "key", "pk": True},
-            "Amount": {"type": "number", "tier": "key"},
-            "ServiceDate": {"type": "datetime", "tier": "key"},
-            "Region": {"type": "text", "tier": "key"},
-            "Technician": {"type": "text", "tier": "standard"},
-            "City": {"type": "text", "tier": "key"},
-            "Name": {"type": "text", "tier": "key"},
+            "PrimaryKey": FieldDef(type="text", tier="key", pk=True),
+            "Amount": FieldDef(type="number", tier="key"),
+            "ServiceDate": FieldDef(type="datetime", tier="key"),
+            "Region": FieldDef(type="text", tier="key"),
+            "Technician": FieldDef(type="text", tier="standard"),
+            "City": FieldDef(type="text", tier="key"),
+            "Name": FieldDef(type="text", tier="key"),
         },
         "LineItems": {
-            "PrimaryKey": {"type": "text", "tier": "key", "pk": True},
+            "PrimaryKey": FieldDef(type="text", tier="key", pk=True),
         },
         "Orders": {
-            "PrimaryKey": {"type": "text", "tier": "key", "pk": True},
+            "PrimaryKey": FieldDef(type="text", tier="key", pk=True),
         },
         "Drivers": {
-            "Driver_ID": {"type": "number", "tier": "key", "pk": True},
-            "Driver_Name": {"type": "text", "tier": "key"},
+            "Driver_ID": FieldDef(type="number", tier="key", pk=True),
+            "Driver_Name": FieldDef(type="text", tier="key"),
         },
     }
 
@@ -59,7 +60,11 @@ def _populate_test_tables():
     old_tables = dict(TABLES)
     EXPOSED_TABLES.update(test_tables)
     TABLES.update(test_ddl)
+    invalidate_count_cache()
+    clear_analyze_cache()
     yield
+    invalidate_count_cache()
+    clear_analyze_cache()
     EXPOSED_TABLES.clear()
     EXPOSED_TABLES.update(old_exposed)
     TABLES.clear()
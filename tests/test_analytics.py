@@ -1,12 +1,16 @@
 """Tests for the analytics tools (load, analyze, list datasets)."""
 
+import asyncio
+import json
 from collections.abc import Generator
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pandas as pd
 import pytest
 
+from filemaker_mcp.ddl import FieldDef
 from filemaker_mcp.tools.query import EXPOSED_TABLES
 
 
@@ -42,6 +46,39 @@ class TestDatasetEntry:
         assert entry.row_count == 3
         assert entry.table == "TestTable"
         assert len(entry.df) == 3
+        assert entry.columns_str == "A, B"
+
+    def test_mem_bytes_estimated_once_per_frame(self) -> None:
+        from filemaker_mcp.tools.analytics import DatasetEntry
+
+        df = pd.DataFrame({"A": range(500), "B": ["x" * 40] * 500})
+        entry = DatasetEntry(
+            df=df,
+            table="TestTable",
+            filter="",
+            select="",
+            loaded_at=datetime(2026, 2, 15, 12, 0, 0),
+            row_count=500,
+        )
+        deep = df.memory_usage(deep=True).sum()
+        assert df.memory_usage().sum() < entry.mem_bytes
+        assert abs(entry.mem_bytes - deep) < deep * 0.1
+        cached = entry._mem_bytes
+        assert entry.mem_bytes and entry._mem_bytes is cached
+        entry.df = df.head(10)
+        assert entry.mem_bytes < deep
+
+    def test_mem_estimate_counts_python_string_columns(self) -> None:
+        import warnings
+
+        from filemaker_mcp.tools.analytics import _estimate_mem_bytes
+
+        df = pd.DataFrame({"S": pd.array(["y" * 40] * 500, dtype="string[python]")})
+        deep = df.memory_usage(deep=True).sum()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            estimate = _estimate_mem_bytes(df)
+        assert abs(estimate - deep) < deep * 0.1
 
     def test_datasets_dict_starts_empty(self) -> None:
         from filemaker_mcp.tools.analytics import _datasets
@@ -226,6 +263,167 @@ class TestLoadDataset:
         assert call_count == 2
         assert "10500" in result or "10,500" in result
 
+    @pytest.mark.asyncio
+    async def test_load_fetches_remaining_pages_concurrently(self) -> None:
+        """With a $count from page 1, later pages are fetched in parallel, kept in order."""
+        from filemaker_mcp.tools.analytics import _datasets, load_dataset
+
+        _datasets.clear()
+        in_flight = 0
+        max_in_flight = 0
+        skips: list[int] = []
+
+        async def mock_get(path, params=None):
+            nonlocal in_flight, max_in_flight
+            skip = int(params.get("$skip", 0))
+            skips.append(skip)
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01 if skip else 0)
+            in_flight -= 1
+            size = min(10000, 25000 - skip)
+            return {"value": [{"A": skip + i} for i in range(size)], "@count": 25000}
+
+        with patch("filemaker_mcp.tools.analytics.odata_client") as mock_client:
+            mock_client.get = mock_get
+            await load_dataset(name="big3", table="Invoices")
+
+        df = _datasets["big3"].df
+        assert len(df) == 25000
+        assert df["A"].tolist() == list(range(25000))
+        assert sorted(skips) == [0, 10000, 20000]
+        assert max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_load_without_count_fetches_windows_concurrently(self) -> None:
+        """No $count: pages are fetched in concurrent windows until a short page."""
+        from filemaker_mcp.tools.analytics import _datasets, load_dataset
+
+        _datasets.clear()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def mock_get(path, params=None):
+            nonlocal in_flight, max_in_flight
+            skip = int(params.get("$skip", 0))
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01 if skip else 0)
+            in_flight -= 1
+            size = max(0, min(10000, 25000 - skip))
+            return {"value": [{"A": skip + i} for i in range(size)]}
+
+        with patch("filemaker_mcp.tools.analytics.odata_client") as mock_client:
+            mock_client.get = mock_get
+            await load_dataset(name="nocount", table="Invoices")
+
+        df = _datasets["nocount"].df
+        assert df["A"].tolist() == list(range(25000))
+        assert max_in_flight == 4
+
+    @pytest.mark.asyncio
+    async def test_load_parses_ddl_dates_per_page(self) -> None:
+        """DDL date fields arrive as datetime64 across pages, blanks as NaT."""
+        from filemaker_mcp.tools.analytics import _datasets, load_dataset
+
+        _datasets.clear()
+
+        async def mock_get(path, params=None):
+            if int(params.get("$skip", 0)):
+                return {"value": [{"D": None}] * 5}
+            return {"value": [{"D": "2025-03-01"}] * 10000, "@count": 10005}
+
+        mock_ddl = {"Invoices": {"D": FieldDef(type="date")}}
+        with (
+            patch("filemaker_mcp.tools.analytics.odata_client") as mock_client,
+            patch("filemaker_mcp.tools.analytics.TABLES", mock_ddl),
+        ):
+            mock_client.get = mock_get
+            await load_dataset(name="dated", table="Invoices")
+
+        column = _datasets["dated"].df["D"]
+        assert pd.api.types.is_datetime64_any_dtype(column.dtype)
+        assert column.iloc[0] == pd.Timestamp("2025-03-01")
+        assert column.isna().sum() == 5
+
+    @pytest.mark.asyncio
+    async def test_load_follows_next_link(self) -> None:
+        """@odata.nextLink continuations are followed instead of $skip pages."""
+        from filemaker_mcp.tools.analytics import _datasets, load_dataset
+
+        _datasets.clear()
+        calls: list[dict[str, str]] = []
+
+        async def mock_get(path, params=None):
+            calls.append(params)
+            if "$skiptoken" not in params:
+                return {
+                    "value": [{"A": 1}, {"A": 2}],
+                    "@count": 3,
+                    "@odata.nextLink": "https://fm/fmi/odata/v4/DB/Invoices?$top=2&$skiptoken=abc",
+                }
+            return {"value": [{"A": 3}]}
+
+        with patch("filemaker_mcp.tools.analytics.odata_client") as mock_client:
+            mock_client.get = mock_get
+            await load_dataset(name="linked", table="Invoices")
+
+        assert _datasets["linked"].df["A"].tolist() == [1, 2, 3]
+        assert calls[1] == {"$top": "2", "$skiptoken": "abc"}
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_load_column_null_on_one_page_stays_numeric(self) -> None:
+        """Per-page frames are concatenated without demoting numeric columns."""
+        from filemaker_mcp.tools.analytics import _datasets, load_dataset
+
+        _datasets.clear()
+
+        async def mock_get(path, params=None):
+            skip = int(params.get("$skip", 0))
+            if skip:
+                return {"value": [{"A": None}] * 5}
+            return {"value": [{"A": 1.5}] * 10000, "@count": 10005}
+
+        with patch("filemaker_mcp.tools.analytics.odata_client") as mock_client:
+            mock_client.get = mock_get
+            await load_dataset(name="nulls", table="Invoices")
+
+        df = _datasets["nulls"].df
+        assert len(df) == 10005
+        assert df["A"].dtype == "float64"
+
+    @pytest.mark.asyncio
+    async def test_load_all_null_ddl_number_field_is_float(self) -> None:
+        """A DDL number field with no values on the only page loads as float64."""
+        from filemaker_mcp.tools.analytics import _datasets, load_dataset
+
+        _datasets.clear()
+        mock_response = {"value": [{"A": None, "B": None}] * 3}
+        mock_ddl = {"Invoices": {"A": FieldDef(type="number"), "B": FieldDef(type="text")}}
+
+        with (
+            patch("filemaker_mcp.tools.analytics.odata_client") as mock_client,
+            patch("filemaker_mcp.tools.analytics.TABLES", mock_ddl),
+        ):
+            mock_client.get = AsyncMock(return_value=mock_response)
+            await load_dataset(name="typed", table="Invoices")
+
+        df = _datasets["typed"].df
+        assert df["A"].dtype == "float64"
+        assert df["B"].dtype == object
+
+    def test_date_parsing_falls_back_for_non_iso(self) -> None:
+        from filemaker_mcp.tools.analytics import _parse_date_column
+
+        iso = _parse_date_column(pd.Series(["2025-06-15", None, "2025-07-20"]))
+        assert iso.tolist()[0] == pd.Timestamp("2025-06-15")
+        assert pd.isna(iso[1])
+        us = _parse_date_column(pd.Series(["2025-06-15", "07/20/2025"]))
+        assert us.tolist() == [pd.Timestamp("2025-06-15"), pd.Timestamp("2025-07-20")]
+        day = _parse_date_column(pd.Series(["2025-06-15", "2025-07-20T08:30:00"]), "%Y-%m-%d")
+        assert day.tolist() == [pd.Timestamp("2025-06-15"), pd.Timestamp("2025-07-20 08:30")]
+
     @pytest.mark.asyncio
     async def test_load_date_conversion(self) -> None:
         """Date columns detected from DDL are converted to datetime."""
@@ -244,8 +442,8 @@ class TestLoadDataset:
         # Mock DDL with a date field
         mock_ddl = {
             "Invoices": {
-                "ServiceDate": {"type": "date", "tier": "key"},
-                "Amount": {"type": "number", "tier": "standard"},
+                "ServiceDate": FieldDef(type="date", tier="key"),
+                "Amount": FieldDef(type="number", tier="standard"),
             }
         }
 
@@ -345,6 +543,102 @@ class TestAnalyze:
         result = await analyze(dataset="inv")
         assert "mean" in result or "count" in result
 
+    @pytest.mark.asyncio
+    async def test_describe_uses_cached_categoricals(self) -> None:
+        """describe() output is unchanged; string columns are categorized once."""
+        from filemaker_mcp.tools.analytics import _datasets, analyze
+
+        self._load_test_data()
+        entry = _datasets["inv"]
+        expected = entry.df.describe(include="all").to_string()
+        result = await analyze(dataset="inv")
+        assert result.split("\n\n", 1)[1] == expected
+        assert set(entry.key_categories) == {"Technician", "Region"}
+
+        result = await analyze(dataset="inv", filter="Region == 'B'")
+        assert "Jones" in result and "Smith" not in result
+
+    @pytest.mark.asyncio
+    async def test_group_key_categorical_built_once_and_reused(self) -> None:
+        """Group-key categoricals are cached on the entry and reused for filtered calls."""
+        from filemaker_mcp.tools.analytics import _datasets, analyze
+
+        self._load_test_data()
+        entry = _datasets["inv"]
+        await analyze(dataset="inv", groupby="Technician", aggregate="sum:Amount")
+        index, column = entry.key_categories["Technician"]
+        assert index is entry.df.index
+        assert isinstance(column.dtype, pd.CategoricalDtype)
+
+        result = await analyze(
+            dataset="inv", groupby="Technician", aggregate="sum:Amount", filter="Amount < 400"
+        )
+        assert entry.key_categories["Technician"][1] is column
+        assert "Smith" in result and "400" in result  # 300 + 100
+        assert "Jones" in result and "200" in result
+
+    @pytest.mark.asyncio
+    async def test_group_key_categorical_rebuilt_for_replaced_frame(self) -> None:
+        from filemaker_mcp.tools.analytics import _datasets, analyze
+
+        self._load_test_data()
+        entry = _datasets["inv"]
+        await analyze(dataset="inv", groupby="Region", aggregate="sum:Amount")
+        entry.df = entry.df.assign(Region=["C", "C", "D", "D", "C"])
+        result = await analyze(dataset="inv", groupby="Region", aggregate="count:Amount")
+        assert "C" in result and "D" in result
+        assert entry.key_categories["Region"][0] is entry.df.index
+
+    @pytest.mark.asyncio
+    async def test_group_counts_after_filter_omit_absent_values(self) -> None:
+        """Counts come from the cached categorical without zero-count categories."""
+        from filemaker_mcp.tools.analytics import analyze
+
+        self._load_test_data()
+        await analyze(dataset="inv", groupby="Technician")  # builds the categorical
+        result = await analyze(dataset="inv", groupby="Technician", filter="Region == 'A'")
+        assert "Smith" in result
+        assert "Jones" not in result
+        assert "(1 groups)" in result
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_groupby_reused_across_aggregates(self) -> None:
+        from filemaker_mcp.tools.analytics import _datasets, analyze
+
+        self._load_test_data()
+        entry = _datasets["inv"]
+        await analyze(dataset="inv", groupby="Technician", aggregate="sum:Amount")
+        _, grouped = entry.groupers[("Technician",)]
+        result = await analyze(dataset="inv", groupby="Technician", aggregate="max:Amount")
+        assert entry.groupers[("Technician",)][1] is grouped
+        assert "500" in result and "400" in result
+
+        await analyze(
+            dataset="inv", groupby="Region", aggregate="sum:Amount", filter="Amount > 100"
+        )
+        assert ("Region",) not in entry.groupers
+
+    @pytest.mark.asyncio
+    async def test_describe_wide_dataset_elides_columns(self) -> None:
+        """describe() output is bounded to _MAX_OUTPUT_COLS columns."""
+        from filemaker_mcp.tools.analytics import DatasetEntry, _datasets, analyze
+
+        _datasets.clear()
+        df = pd.DataFrame({f"F{i}": [1, 2, 3] for i in range(30)})
+        _datasets["wide"] = DatasetEntry(
+            df=df,
+            table="Invoices",
+            filter="",
+            select="",
+            loaded_at=datetime(2026, 2, 15),
+            row_count=3,
+        )
+        result = await analyze(dataset="wide")
+        assert "F0" in result
+        assert "F29" in result
+        assert "F15" not in result
+        assert "..." in result
+
     @pytest.mark.asyncio
     async def test_multiple_aggregates(self) -> None:
         """Multiple aggregate functions: sum, count, mean."""
@@ -452,6 +746,170 @@ class TestAnalyze:
         assert "Smith" in result
         assert "A" in result
 
+    @pytest.mark.asyncio
+    async def test_multi_field_group_counts(self) -> None:
+        """groupby on two fields without aggregate -> counts, largest first."""
+        from filemaker_mcp.tools.analytics import analyze
+
+        self._load_test_data()
+        result = await analyze(dataset="inv", groupby="Technician,Region")
+        lines = result.splitlines()
+        assert lines[2].split() == ["Technician", "Region", "count"]
+        assert lines[3].split() == ["Smith", "A", "3"]
+        assert lines[4].split() == ["Jones", "B", "2"]
+        assert "(2 groups)" in result
+
+    @pytest.mark.asyncio
+    async def test_grouping_leaves_stored_dtypes(self) -> None:
+        """Group keys are categorized on a new frame, not the stored dataset."""
+        from filemaker_mcp.tools.analytics import _datasets, analyze
+
+        self._load_test_data()
+        before = _datasets["inv"].df.dtypes.copy()
+        result = await analyze(dataset="inv", groupby="Technician", aggregate="count:Technician")
+        assert "Smith" in result
+        assert _datasets["inv"].df.dtypes.equals(before)
+
+    @pytest.mark.asyncio
+    async def test_repeat_analyze_served_from_cache(self) -> None:
+        """Identical calls reuse the result until the dataset is reloaded."""
+        from filemaker_mcp.tools import analytics
+
+        self._load_test_data()
+        calls: list[tuple[object, ...]] = []
+        real = analytics._analyze_sync
+
+        def counting(*args: object) -> str:
+            calls.append(args)
+            return real(*args)  # type: ignore[arg-type]
+
+        args = {"dataset": "inv", "groupby": "Region", "aggregate": "sum:Amount"}
+        with patch.object(analytics, "_analyze_sync", counting):
+            first = await analytics.analyze(**args)
+            second = await analytics.analyze(**args)
+            assert first == second
+            assert len(calls) == 1
+
+            analytics._datasets["inv"].loaded_at = datetime(2026, 2, 16)
+            await analytics.analyze(**args)
+            assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_filter_mask_reused_across_groupings(self) -> None:
+        """The same filter on the same dataset is evaluated once."""
+        from filemaker_mcp.tools.analytics import _datasets, analyze
+
+        self._load_test_data()
+        df = _datasets["inv"].df
+        with patch.object(pd.DataFrame, "eval", autospec=True, side_effect=pd.DataFrame.eval) as ev:
+            by_tech = await analyze(dataset="inv", groupby="Technician", filter="Amount > 150")
+            by_region = await analyze(dataset="inv", groupby="Region", filter="Amount > 150")
+        assert ev.call_count == 1
+        assert "Smith" in by_tech and "Jones" in by_tech
+        assert "4 records" in by_region
+        assert len(df) == 5
+
+    @pytest.mark.asyncio
+    async def test_scalar_aggregates_keep_integer_results(self) -> None:
+        """Mixed scalar aggregates aren't aligned into float columns."""
+        from filemaker_mcp.tools.analytics import analyze
+
+        self._load_test_data()
+        result = await analyze(dataset="inv", aggregate="sum:Amount,count:Region")
+        assert result.splitlines()[3].split() == ["1500", "5"]
+
+    def test_sort_keeps_group_order_on_ties(self) -> None:
+        """Equal sort values keep groupby's key order (stable sort)."""
+        from filemaker_mcp.tools.analytics import _sort_result
+
+        df = pd.DataFrame({"Region": list("ABCDEFGH"), "Amount_sum": [1, 2, 1, 2, 1, 2, 1, 2]})
+        result = _sort_result(df, "Amount_sum desc")
+        assert list(result["Region"]) == list("BDFHACEG")
+        assert _sort_result(df, "Missing") is df
+
+    def test_project_keeps_only_keys_and_aggregated_fields(self) -> None:
+        """Projection drops unused columns; a full-width spec keeps the frame."""
+        from filemaker_mcp.tools.analytics import _datasets, _project
+
+        self._load_test_data()
+        df = _datasets["inv"].df
+        projected = _project(df, ["Region"], {"Amount": ["sum"], "Region": ["nunique"]})
+        assert projected.columns.tolist() == ["Region", "Amount"]
+        everything = {"Amount": ["sum"], "Technician": ["count"], "ServiceDate": ["max"]}
+        assert _project(df, ["Region"], everything) is df
+
+    @pytest.mark.asyncio
+    async def test_filtered_groupby_ignores_unused_columns(self) -> None:
+        """Filter on a column outside the aggregate spec still works."""
+        from filemaker_mcp.tools.analytics import analyze
+
+        self._load_test_data()
+        result = await analyze(
+            dataset="inv", groupby="Region", aggregate="sum:Amount", filter="Technician == 'Smith'"
+        )
+        assert result.splitlines()[3].split() == ["A", "900"]
+
+    @pytest.mark.asyncio
+    async def test_filtered_error_lists_all_dataset_columns(self) -> None:
+        """Projection during filtering doesn't shrink the 'Available' list."""
+        from filemaker_mcp.tools.analytics import analyze
+
+        self._load_test_data()
+        result = await analyze(dataset="inv", aggregate="sum:Nope", filter="Amount > 100")
+        assert "Available: Technician, Region, Amount, ServiceDate" in result
+
+    def test_filter_rows_takes_only_requested_columns(self) -> None:
+        """_filter_rows with columns selects rows and columns in one step."""
+        from filemaker_mcp.tools.analytics import _datasets, _filter_rows, _referenced_columns
+
+        self._load_test_data()
+        entry = _datasets["inv"]
+        columns = _referenced_columns(entry.df, "Region", "sum:Amount", "")
+        assert columns == ["Region", "Amount"]
+        assert _referenced_columns(entry.df, "", "", "") is None
+        rows = _filter_rows(entry, entry.df, "Technician == 'Smith'", columns)
+        assert rows.columns.tolist() == ["Region", "Amount"]
+        assert rows["Amount"].tolist() == [500, 300, 100]
+
+    def test_cached_mask_not_applied_to_replaced_frame(self) -> None:
+        """A merge that swaps entry.df mid-analyze doesn't reuse the old mask."""
+        from filemaker_mcp.tools.analytics import _datasets, _filter_rows
+
+        self._load_test_data()
+        entry = _datasets["inv"]
+        old = entry.df
+        assert len(_filter_rows(entry, old, "Amount > 150")) > 0
+        # Same entry, same loaded_at, new frame with fewer, reordered rows
+        new = old.iloc[::-1].head(2).reset_index(drop=True)
+        entry.df = new
+        rows = _filter_rows(entry, new, "Amount > 150")
+        assert rows["Amount"].tolist() == new.loc[new["Amount"] > 150, "Amount"].tolist()
+        # A caller still holding the old frame keeps getting old-frame rows
+        assert _filter_rows(entry, old, "Amount > 150").equals(old.query("Amount > 150"))
+
+    @pytest.mark.asyncio
+    async def test_aggregation_runs_off_event_loop_thread(self) -> None:
+        """pandas work runs in a worker thread, not on the event loop."""
+        import threading
+
+        from filemaker_mcp.tools import analytics
+
+        loop_thread = threading.get_ident()
+        seen: list[int] = []
+        real = analytics._analyze_sync
+
+        def recording(*args: object) -> str:
+            seen.append(threading.get_ident())
+            return real(*args)  # type: ignore[arg-type]
+
+        self._load_test_data()
+        with patch.object(analytics, "_analyze_sync", recording):
+            result = await analytics.analyze(
+                dataset="inv", groupby="Region", aggregate="sum:Amount"
+            )
+        assert "900" in result
+        assert seen and seen[0] != loop_thread
+
 
 class TestTableCache:
     """Test table-level DataFrame cache."""
@@ -708,6 +1166,63 @@ class TestDateRangeMerge:
         assert _table_cache["T"].row_count == 3
         assert _table_cache["T"].date_max == date(2025, 3, 31)
 
+    def test_merge_new_rows_replace_cached_pk(self) -> None:
+        from filemaker_mcp.tools.analytics import _table_cache, merge_into_table_cache
+
+        cached = pd.DataFrame({"PrimaryKey": [1, 2, 3], "Amount": [10, 20, 30]})
+        merge_into_table_cache("T", cached, "", "PrimaryKey", None, None)
+        update = pd.DataFrame({"PrimaryKey": [2, 4, 4], "Amount": [21, 40, 41]})
+        merge_into_table_cache("T", update, "", "PrimaryKey", None, None)
+        df = _table_cache["T"].df
+        assert df["PrimaryKey"].tolist() == [1, 3, 2, 4]
+        assert df["Amount"].tolist() == [10, 30, 21, 41]
+
+    def test_merge_releases_cached_string_columns(self) -> None:
+        from filemaker_mcp.tools.analytics import _table_cache, merge_into_table_cache
+        from filemaker_mcp.tools.query import _apply_filters_to_df
+
+        cached = pd.DataFrame({"PrimaryKey": [1, 2], "Zone": ["A", "B"]})
+        merge_into_table_cache("T", cached, "", "PrimaryKey", None, None)
+        entry = _table_cache["T"]
+        _apply_filters_to_df(entry.df, "Zone eq 'A'", "", None, None, entry.str_columns)
+        assert "Zone" in entry.str_columns
+        merge_into_table_cache(
+            "T", pd.DataFrame({"PrimaryKey": [3], "Zone": ["C"]}), "", "PrimaryKey", None, None
+        )
+        assert entry.str_columns == {}
+
+    def test_merge_keeps_cached_dtypes(self) -> None:
+        from filemaker_mcp.tools.analytics import _table_cache, merge_into_table_cache
+
+        cached = pd.DataFrame(
+            {"PrimaryKey": [1], "ServiceDate": pd.to_datetime(["2025-01-15"]), "Amount": [1.5]}
+        )
+        merge_into_table_cache("T", cached, "ServiceDate", "PrimaryKey", None, None)
+        # A later page whose columns arrived as plain strings/ints
+        page = pd.DataFrame(
+            {"PrimaryKey": [2], "ServiceDate": ["2025-02-20"], "Amount": [3]}, dtype=object
+        )
+        merge_into_table_cache("T", page, "ServiceDate", "PrimaryKey", None, None)
+        df = _table_cache["T"].df
+        assert pd.api.types.is_datetime64_any_dtype(df["ServiceDate"])
+        assert df["Amount"].dtype == "float64"
+
+    def test_merge_fractional_page_into_int_cache_keeps_values(self) -> None:
+        from filemaker_mcp.tools import analytics
+        from filemaker_mcp.tools.analytics import _table_cache, merge_into_table_cache
+
+        cached = pd.DataFrame({"A": [1, 2]})
+        page = pd.DataFrame({"A": [12.5, 3.75]})
+        assert analytics._align_dtypes(page, cached)["A"].tolist() == [12.5, 3.75]
+
+        first = pd.DataFrame({"PrimaryKey": [1, 2], "Amount": [10, 20]})
+        merge_into_table_cache("T", first, "", "PrimaryKey", None, None)
+        gap = pd.DataFrame({"PrimaryKey": [3], "Amount": [12.5]})
+        merge_into_table_cache("T", gap, "", "PrimaryKey", None, None)
+        df = _table_cache["T"].df
+        assert df["Amount"].tolist() == [10, 20, 12.5]
+        assert df["Amount"].dtype == "float64"
+
     def test_merge_enforces_row_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
         from filemaker_mcp.tools import analytics
         from filemaker_mcp.tools.analytics import _table_cache, merge_into_table_cache
@@ -734,6 +1249,178 @@ class TestDateRangeMerge:
         assert entry.row_count == 5
         # Should keep the 5 most recent rows (PK 5-9)
         assert set(entry.df["PrimaryKey"].tolist()) == {5, 6, 7, 8, 9}
+        assert entry.df.index.tolist() == [0, 1, 2, 3, 4]
+
+
+class TestTableCacheSnapshots:
+    """Parquet snapshots of the table cache (TABLE_CACHE_DIR)."""
+
+    @pytest.fixture(autouse=True)
+    def _snapshot_dir(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> Generator[Path, None, None]:
+        from filemaker_mcp.config import TenantConfig, settings
+        from filemaker_mcp.tools.analytics import _table_cache
+
+        monkeypatch.setattr(settings, "table_cache_dir", str(tmp_path))
+        tenant = TenantConfig(name="acme", host="fm.example.com", database="Acme DB")
+        _table_cache.clear()
+        with patch("filemaker_mcp.tools.tenant.get_active_tenant", return_value=tenant):
+            yield tmp_path / "fm.example.com_Acme_DB"
+        _table_cache.clear()
+
+    def test_snapshot_roundtrip(self, _snapshot_dir: Path) -> None:
+        pytest.importorskip("pyarrow")
+        from filemaker_mcp.tools.analytics import (
+            _table_cache,
+            load_table_snapshots,
+            merge_into_table_cache,
+        )
+
+        df = pd.DataFrame(
+            {"PrimaryKey": ["a", "b"], "ServiceDate": pd.to_datetime(["2025-01-02", "2025-01-09"])}
+        )
+        merge_into_table_cache("Invoices", df, "ServiceDate", "PrimaryKey", "2025-01-01", None)
+        meta = json.loads((_snapshot_dir / "Invoices.json").read_text())
+        assert (_snapshot_dir / meta["file"]).exists()
+
+        _table_cache.clear()
+        assert load_table_snapshots() == 1
+        entry = _table_cache["Invoices"]
+        assert entry.df["PrimaryKey"].tolist() == ["a", "b"]
+        assert entry.date_min == date(2025, 1, 1)
+        assert entry.date_max is None
+
+    def test_unreadable_snapshot_skipped(self, _snapshot_dir: Path) -> None:
+        from filemaker_mcp.tools.analytics import _table_cache, load_table_snapshots
+
+        _snapshot_dir.mkdir(parents=True)
+        (_snapshot_dir / "Invoices.json").write_text('{"table": "Invoices"}')
+        (_snapshot_dir / "Invoices.parquet").write_bytes(b"not parquet")
+        assert load_table_snapshots() == 0
+        assert "Invoices" not in _table_cache
+
+    @pytest.mark.asyncio
+    async def test_flush_removes_snapshot(self, _snapshot_dir: Path) -> None:
+        from filemaker_mcp.tools.analytics import flush_datasets
+
+        _snapshot_dir.mkdir(parents=True)
+        for name in ("Invoices.parquet", "Invoices.json", "Orders.parquet", "Orders.json"):
+            (_snapshot_dir / name).write_text("x")
+        await flush_datasets("Invoices")
+        assert sorted(p.name for p in _snapshot_dir.iterdir()) == ["Orders.json", "Orders.parquet"]
+
+    def test_stale_snapshot_not_loaded(self, _snapshot_dir: Path) -> None:
+        pytest.importorskip("pyarrow")
+        from filemaker_mcp.tools.analytics import (
+            DatasetEntry,
+            _table_cache,
+            load_table_snapshots,
+            save_table_snapshot,
+        )
+
+        entry = DatasetEntry(
+            df=pd.DataFrame({"PrimaryKey": ["a"]}),
+            table="Invoices",
+            filter="",
+            select="",
+            loaded_at=datetime.now() - timedelta(days=30),
+            row_count=1,
+            date_field="ServiceDate",
+            date_min=date(2025, 1, 1),
+            date_max=date(2025, 12, 31),
+        )
+        assert save_table_snapshot(entry, _snapshot_dir)
+        assert load_table_snapshots() == 0
+        assert "Invoices" not in _table_cache
+
+    def test_snapshot_writes_keep_latest_per_table(self, _snapshot_dir: Path) -> None:
+        pytest.importorskip("pyarrow")
+        from filemaker_mcp.tools import analytics
+        from filemaker_mcp.tools.analytics import (
+            _table_cache,
+            load_table_snapshots,
+            merge_into_table_cache,
+        )
+
+        key = (_snapshot_dir, "Invoices")
+        # As if a writer for the table were already running: merges queue
+        analytics._snapshot_running.add(key)
+        for day in ("2025-01-02", "2025-01-09"):
+            df = pd.DataFrame({"PrimaryKey": [day], "ServiceDate": pd.to_datetime([day])})
+            merge_into_table_cache("Invoices", df, "ServiceDate", "PrimaryKey", day, day)
+        assert not _snapshot_dir.exists()
+        assert list(analytics._snapshot_pending) == [key]
+        analytics._drain_snapshots(key)
+        assert key not in analytics._snapshot_running
+
+        _table_cache.clear()
+        assert load_table_snapshots() == 1
+        entry = _table_cache["Invoices"]
+        assert entry.df["PrimaryKey"].tolist() == ["2025-01-02", "2025-01-09"]
+        assert entry.date_max == date(2025, 1, 9)
+        assert len(list(_snapshot_dir.glob("*.parquet"))) == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_drops_pending_snapshot_write(self, _snapshot_dir: Path) -> None:
+        pytest.importorskip("pyarrow")
+        from filemaker_mcp.tools import analytics
+        from filemaker_mcp.tools.analytics import DatasetEntry, flush_datasets
+
+        entry = DatasetEntry(
+            df=pd.DataFrame({"PrimaryKey": ["a"]}),
+            table="Invoices",
+            filter="",
+            select="",
+            loaded_at=datetime.now(),
+            row_count=1,
+        )
+        key = (_snapshot_dir, "Invoices")
+        generation = analytics._snapshot_generation(key)
+        analytics._snapshot_running.add(key)
+        analytics._schedule_snapshot(entry)
+        await flush_datasets("Invoices")
+        assert key not in analytics._snapshot_pending
+        analytics._drain_snapshots(key)
+        # A write that was already under way when the flush came is dropped too
+        assert analytics.save_table_snapshot(entry, _snapshot_dir, generation)
+        assert list(_snapshot_dir.iterdir()) == []
+
+    def test_dataset_snapshot_roundtrip(self, _snapshot_dir: Path) -> None:
+        pytest.importorskip("pyarrow")
+        from filemaker_mcp.tools.analytics import (
+            DatasetEntry,
+            _datasets,
+            load_dataset_snapshots,
+            save_dataset_snapshot,
+        )
+
+        entry = DatasetEntry(
+            df=pd.DataFrame({"Amount": [1.5, 2.5]}),
+            table="Invoices",
+            filter="Amount gt 1",
+            select="Amount",
+            loaded_at=datetime(2026, 2, 15, 9, 30),
+            row_count=2,
+        )
+        assert save_dataset_snapshot("inv 25", entry, _snapshot_dir)
+        _datasets.clear()
+        assert load_dataset_snapshots() == 1
+        restored = _datasets.pop("inv 25")
+        assert restored.df["Amount"].tolist() == [1.5, 2.5]
+        assert restored.filter == "Amount gt 1"
+        assert restored.loaded_at == datetime(2026, 2, 15, 9, 30)
+
+    def test_unreadable_dataset_snapshot_skipped(self, _snapshot_dir: Path) -> None:
+        from filemaker_mcp.tools.analytics import _datasets, load_dataset_snapshots
+
+        _datasets.clear()
+        datasets_dir = _snapshot_dir / "datasets"
+        datasets_dir.mkdir(parents=True)
+        (datasets_dir / "inv.json").write_text('{"name": "inv"}')
+        (datasets_dir / "inv.parquet").write_bytes(b"not parquet")
+        assert load_dataset_snapshots() == 0
+        assert "inv" not in _datasets
 
 
 class TestNewAggFunctions:
@@ -838,6 +1525,18 @@ class TestTimeSeries:
         assert "700" in result  # Feb: 300+400
         assert "500" in result  # Mar: 500
 
+    @pytest.mark.asyncio
+    async def test_unsorted_dates_match_sorted(self) -> None:
+        """The resample fast path (sorted dates) and groupby path agree."""
+        from filemaker_mcp.tools.analytics import _datasets, analyze
+
+        self._load_monthly_data()
+        args = {"groupby": "ServiceDate", "aggregate": "sum:Amount", "period": "month"}
+        sorted_result = await analyze(dataset="ts", **args)
+        _datasets["ts"].df = _datasets["ts"].df.iloc[::-1].reset_index(drop=True)
+        _datasets["ts"].loaded_at = datetime(2026, 2, 20)
+        assert await analyze(dataset="ts", **args) == sorted_result
+
     @pytest.mark.asyncio
     async def test_weekly_aggregation(self) -> None:
         from filemaker_mcp.tools.analytics import analyze
@@ -916,6 +1615,22 @@ class TestPivot:
         assert "300" in result  # AR1 Region A: 100+200
         assert "AR1" in result
 
+    @pytest.mark.asyncio
+    async def test_pivot_unobserved_pair_filled_with_zero(self) -> None:
+        from filemaker_mcp.tools.analytics import _datasets, analyze
+
+        self._load_pivot_data()
+        df = _datasets["pv"].df
+        _datasets["pv"].df = df[~((df["Technician"] == "GR1") & (df["Region"] == "B"))]
+        result = await analyze(
+            dataset="pv",
+            groupby="Technician",
+            pivot_column="Region",
+            aggregate="sum:Amount",
+        )
+        rows = {line.split()[0]: line.split()[1:] for line in result.splitlines()[4:6]}
+        assert rows == {"AR1": ["300", "300"], "GR1": ["400", "0"]}
+
     @pytest.mark.asyncio
     async def test_pivot_invalid_column(self) -> None:
         from filemaker_mcp.tools.analytics import analyze
@@ -1076,6 +1791,7 @@ class TestApplyNormalization:
         result_df, notes = _apply_normalization(df, mapping)
         assert list(result_df["Driver"]) == ["Mike", "Sam"]
         assert notes == []  # No changes, no note
+        assert result_df is df  # Nothing to rewrite, nothing copied
 
     def test_original_df_unchanged(self) -> None:
         from filemaker_mcp.tools.analytics import _apply_normalization
@@ -1186,6 +1902,29 @@ class TestAnalyzeNormalization:
         assert "Jake" not in result.split("Normalized")[0]  # Jake gone from data
         assert "450" in result
 
+    @pytest.mark.asyncio
+    async def test_stored_dataset_not_mutated(self) -> None:
+        from filemaker_mcp.tools.analytics import _datasets, analyze
+
+        await analyze("test_norm", groupby="Technician", aggregate="sum:Amount")
+        assert list(_datasets["test_norm"].df["Technician"]) == [
+            "Jake",
+            "Jake",
+            "Jacob Owens",
+            "Mike",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_value_map_edit_bypasses_cached_result(self) -> None:
+        from filemaker_mcp.ddl import DDL_CONTEXT
+        from filemaker_mcp.tools.analytics import analyze
+
+        before = await analyze("test_norm", groupby="Technician", aggregate="sum:Amount")
+        del DDL_CONTEXT[("Invoices", "Technician", "value_map")]
+        after = await analyze("test_norm", groupby="Technician", aggregate="sum:Amount")
+        assert "Jake" not in before.split("Normalized")[0]
+        assert "Jake" in after
+
     @pytest.mark.asyncio
     async def test_normalization_note_appended(self) -> None:
         from filemaker_mcp.tools.analytics import analyze
@@ -1241,3 +1980,79 @@ class TestAnalyzeNormalization:
 
         result = await analyze("test_norm", aggregate="sum:Amount")
         assert "Normalized:" not in result  # No groupby, no normalization
+
+
+@pytest.mark.usefixtures("populate_exposed_tables")
+class TestAnalyzeRemote:
+    """Test fm_analyze_remote (server-side $apply aggregation)."""
+
+    def test_build_apply_grouped_with_filter(self) -> None:
+        from filemaker_mcp.tools.analytics import _build_apply
+
+        apply = _build_apply(
+            ["Technician", "Region"], "sum:Amount,count:Amount", "ServiceDate ge 2025-01-01"
+        )
+        assert apply == (
+            'filter("ServiceDate" ge 2025-01-01)/'
+            'groupby(("Technician","Region"),'
+            'aggregate("Amount" with sum as Amount_sum,$count as count))'
+        )
+
+    def test_build_apply_scalar_aliases_spaced_field(self) -> None:
+        from filemaker_mcp.tools.analytics import _build_apply
+
+        apply = _build_apply([], "mean:Unit Price,nunique:Customer", "")
+        assert apply == (
+            'aggregate("Unit Price" with average as Unit_Price_mean,'
+            '"Customer" with countdistinct as Customer_nunique)'
+        )
+
+    def test_build_apply_rejects_unsupported_function(self) -> None:
+        from filemaker_mcp.tools.analytics import _build_apply
+
+        with pytest.raises(ValueError, match="median"):
+            _build_apply(["Region"], "median:Amount", "")
+
+    @pytest.mark.asyncio
+    async def test_remote_returns_sorted_summary(self) -> None:
+        from filemaker_mcp.tools.analytics import analyze_remote
+
+        response = {
+            "value": [
+                {"@id": "x", "Technician": "Smith", "Amount_sum": 900},
+                {"@id": "y", "Technician": "Jones", "Amount_sum": 1200},
+            ]
+        }
+        with patch("filemaker_mcp.tools.analytics.odata_client") as mock_client:
+            mock_client.get = AsyncMock(return_value=response)
+            result = await analyze_remote(
+                table="Invoices",
+                groupby="Technician",
+                aggregate="sum:Amount",
+                sort="Amount_sum desc",
+            )
+
+        params = mock_client.get.call_args.kwargs["params"]
+        assert params == {
+            "$apply": 'groupby(("Technician"),aggregate("Amount" with sum as Amount_sum))'
+        }
+        assert "@id" not in result
+        assert result.index("Jones") < result.index("Smith")
+        assert "(2 groups)" in result
+
+    @pytest.mark.asyncio
+    async def test_remote_fm_rejection_suggests_fallback(self) -> None:
+        from filemaker_mcp.tools.analytics import analyze_remote
+
+        with patch("filemaker_mcp.tools.analytics.odata_client") as mock_client:
+            mock_client.get = AsyncMock(side_effect=ValueError("$apply not supported"))
+            result = await analyze_remote(table="Invoices", aggregate="sum:Amount")
+
+        assert "fm_load_dataset" in result
+
+    @pytest.mark.asyncio
+    async def test_remote_unknown_table(self) -> None:
+        from filemaker_mcp.tools.analytics import analyze_remote
+
+        result = await analyze_remote(table="Nope", aggregate="sum:Amount")
+        assert "Unknown table" in result
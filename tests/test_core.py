@@ -4,18 +4,22 @@ These validate configuration, parameter validation, and formatting logic.
 Integration tests against a live server are in test_integration.py (Phase 2).
 """
 
+import asyncio
 import os
 from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
+from filemaker_mcp import ddl_parser
 from filemaker_mcp.auth import FMODataClient
-from filemaker_mcp.config import Settings
+from filemaker_mcp.config import Settings, settings
 from filemaker_mcp.ddl import (
     TABLES,
-    FieldDef,  # noqa: F401 — import verifies FieldDef is exportable
+    FieldDef,
     is_script_available,
     set_script_available,
     update_tables,
@@ -82,6 +86,32 @@ class TestConfig:
         s = Settings(fm_username="user1", fm_password="pass1", fm_database="test")
         assert s.basic_auth == ("user1", "pass1")
 
+    def test_from_env_coerces_types(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        monkeypatch.setenv("FM_HOST", "env.example.com")
+        monkeypatch.setenv("FM_VERIFY_SSL", "false")
+        monkeypatch.setenv("FM_TIMEOUT", "15")
+        s = Settings.from_env(env_file=str(tmp_path / "coerce.env"))
+        assert s.fm_host == "env.example.com"
+        assert s.fm_verify_ssl is False
+        assert s.fm_timeout == 15
+
+    def test_from_env_reads_env_file(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        monkeypatch.delenv("FM_DATABASE", raising=False)
+        env_file = tmp_path / "file.env"
+        env_file.write_text("FM_DATABASE=FromFile\n")
+        assert Settings.from_env(env_file=str(env_file)).fm_database == "FromFile"
+
+    def test_from_env_rejects_bad_int(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        monkeypatch.setenv("FM_TIMEOUT", "soon")
+        with pytest.raises(ValueError, match="FM_TIMEOUT"):
+            Settings.from_env(env_file=str(tmp_path / "bad.env"))
+
+    def test_from_env_is_cached(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "cached.env")
+        assert Settings.from_env(env_file=path) is Settings.from_env(env_file=path)
+
 
 class TestTenantConfig:
     """Test tenant configuration loading."""
@@ -261,7 +291,7 @@ class TestStateClear:
         saved_ann = dict(FIELD_ANNOTATIONS)
 
         try:
-            TABLES["TestTable"] = {"field": {"type": "text", "tier": "standard"}}
+            TABLES["TestTable"] = {"field": FieldDef(type="text", tier="standard")}
             update_annotations({"TestTable": {"field": {"calculation": True}}})
             set_script_available(True)
             assert "TestTable" in TABLES
@@ -325,6 +355,9 @@ class TestAuthReset:
         client = await odata_client._get_client()
         assert "new-host.example.com" in str(client.base_url)
         assert "NewDB" in str(client.base_url)
+        # Pool sized from settings, shared across tool calls
+        pool = client._transport._pool  # type: ignore[attr-defined]
+        assert pool._max_connections == Settings.from_env().fm_pool_limit
 
         # Cleanup — restore default client
         await odata_client.close()
@@ -364,6 +397,29 @@ class TestFormatting:
         assert "@odata.etag" not in result  # Metadata fields filtered out
         assert "1 total records" in result
 
+    def test_format_records_spans_chunks(self) -> None:
+        records = [{"N": i, "Empty": ""} for i in range(1, 1202)]
+        result = _format_records({"value": records}, "Big")
+        lines = result.split("\n")
+        assert lines[:4] == ["Showing 1201 records from Big:", "", "--- Record 1 ---", "  N: 1"]
+        # Record blocks are contiguous across chunk boundaries
+        assert "  N: 500\n\n--- Record 501 ---\n  N: 501\n" in result
+        assert result.endswith("--- Record 1201 ---\n  N: 1201\n")
+        assert "Empty" not in result
+
+    def test_format_records_mixed_key_shapes(self) -> None:
+        records = [{"A": 1, "@id": "x"}, {"B": 2, "A": 3}]
+        result = _format_records({"value": records}, "T")
+        assert "--- Record 1 ---\n  A: 1\n\n--- Record 2 ---\n  B: 2\n  A: 3\n" in result
+        assert "@id" not in result
+
+    def test_format_records_values_match_format_value(self) -> None:
+        records = [{"Note": "x" * 600, "Qty": 0, "Paid": False, "Gone": None}]
+        result = _format_records({"value": records}, "T")
+        assert f"  Note: {_format_value('x' * 600)}\n" in result
+        assert "  Qty: 0\n  Paid: False\n" in result
+        assert "Gone" not in result
+
 
 class TestSchemaInference:
     """Test query-based schema inference (type detection and formatting)."""
@@ -495,31 +551,27 @@ class TestDDL:
     def test_field_has_type(self) -> None:
         for table_name, fields in TABLES.items():
             for field_name, field_def in fields.items():
-                assert "type" in field_def, f"{table_name}.{field_name} missing 'type'"
+                assert field_def.type, f"{table_name}.{field_name} missing 'type'"
 
     def test_field_has_tier(self) -> None:
         for table_name, fields in TABLES.items():
             for field_name, field_def in fields.items():
-                assert "tier" in field_def, f"{table_name}.{field_name} missing 'tier'"
-                assert field_def["tier"] in ("key", "standard", "internal"), (
-                    f"{table_name}.{field_name} invalid tier: {field_def['tier']}"
+                assert field_def.tier, f"{table_name}.{field_name} missing 'tier'"
+                assert field_def.tier in ("key", "standard", "internal"), (
+                    f"{table_name}.{field_name} invalid tier: {field_def.tier}"
                 )
 
     def test_pk_fields_marked(self) -> None:
         for table_name, fields in TABLES.items():
             for field_name, field_def in fields.items():
                 if field_name.startswith("_kp_"):
-                    assert field_def.get("pk") is True, (
-                        f"{table_name}.{field_name} should have pk=True"
-                    )
+                    assert field_def.pk is True, f"{table_name}.{field_name} should have pk=True"
 
     def test_fk_fields_marked(self) -> None:
         for table_name, fields in TABLES.items():
             for field_name, field_def in fields.items():
                 if field_name.startswith("_kf_"):
-                    assert field_def.get("fk") is True, (
-                        f"{table_name}.{field_name} should have fk=True"
-                    )
+                    assert field_def.fk is True, f"{table_name}.{field_name} should have fk=True"
 
 
 class TestFieldAnnotations:
@@ -729,9 +781,9 @@ class TestDDLSchemaFormatting:
 
     def test_format_ddl_hides_internal(self) -> None:
         fields = {
-            "_kp_ID": {"type": "text", "tier": "key", "pk": True},
-            "Name": {"type": "text", "tier": "standard"},
-            "g_Global": {"type": "text", "tier": "internal"},
+            "_kp_ID": FieldDef(type="text", tier="key", pk=True),
+            "Name": FieldDef(type="text", tier="standard"),
+            "g_Global": FieldDef(type="text", tier="internal"),
         }
         result = _format_ddl_schema("TestTable", fields, show_all=False)
         assert "_kp_ID" in result
@@ -741,8 +793,8 @@ class TestDDLSchemaFormatting:
 
     def test_format_ddl_show_all(self) -> None:
         fields = {
-            "_kp_ID": {"type": "text", "tier": "key", "pk": True},
-            "g_Global": {"type": "text", "tier": "internal"},
+            "_kp_ID": FieldDef(type="text", tier="key", pk=True),
+            "g_Global": FieldDef(type="text", tier="internal"),
         }
         result = _format_ddl_schema("TestTable", fields, show_all=True)
         assert "g_Global" in result
@@ -750,8 +802,8 @@ class TestDDLSchemaFormatting:
 
     def test_format_ddl_pk_fk_markers(self) -> None:
         fields = {
-            "_kp_ID": {"type": "text", "tier": "key", "pk": True},
-            "_kf_Parent": {"type": "text", "tier": "key", "fk": True},
+            "_kp_ID": FieldDef(type="text", tier="key", pk=True),
+            "_kf_Parent": FieldDef(type="text", tier="key", fk=True),
         }
         result = _format_ddl_schema("TestTable", fields, show_all=False)
         assert "[PK, key]" in result
@@ -759,9 +811,9 @@ class TestDDLSchemaFormatting:
 
     def test_format_ddl_field_counts(self) -> None:
         fields = {
-            "_kp_ID": {"type": "text", "tier": "key", "pk": True},
-            "Name": {"type": "text", "tier": "standard"},
-            "g_X": {"type": "text", "tier": "internal"},
+            "_kp_ID": FieldDef(type="text", tier="key", pk=True),
+            "Name": FieldDef(type="text", tier="standard"),
+            "g_X": FieldDef(type="text", tier="internal"),
         }
         result = _format_ddl_schema("TestTable", fields, show_all=False)
         assert "3 fields total" in result
@@ -970,17 +1022,17 @@ class TestDDLCache:
     """Test runtime DDL cache management."""
 
     def test_update_tables_adds_new_table(self) -> None:
-        new_table = {"Field1": {"type": "text", "tier": "standard"}}
+        new_table = {"Field1": FieldDef(type="text", tier="standard")}
         update_tables({"NewTestTable": new_table})
         assert "NewTestTable" in TABLES
-        assert TABLES["NewTestTable"]["Field1"]["type"] == "text"
+        assert TABLES["NewTestTable"]["Field1"].type == "text"
         # Clean up
         del TABLES["NewTestTable"]
 
     def test_update_tables_overwrites_existing(self) -> None:
         original = dict(TABLES.get("Location", {}))
         update_tables(
-            {"Location": {"_kp_LocationID": {"type": "number", "tier": "key", "pk": True}}}
+            {"Location": {"_kp_LocationID": FieldDef(type="number", tier="key", pk=True)}}
         )
         assert len(TABLES["Location"]) == 1  # Overwritten
         # Restore
@@ -1015,12 +1067,96 @@ PRIMARY KEY (_kp_LocationID)
         result = parse_ddl(ddl)
         assert "Location" in result
         loc = result["Location"]
-        assert loc["_kp_LocationID"]["type"] == "number"
-        assert loc["_kp_LocationID"]["pk"] is True
-        assert loc["_kp_LocationID"]["tier"] == "key"
-        assert loc["Company Name"]["type"] == "text"
-        assert loc["Map"]["type"] == "binary"
-        assert loc["Timestamp_Create"]["type"] == "datetime"
+        assert loc["_kp_LocationID"].type == "number"
+        assert loc["_kp_LocationID"].pk is True
+        assert loc["_kp_LocationID"].tier == "key"
+        assert loc["Company Name"].type == "text"
+        assert loc["Map"].type == "binary"
+        assert loc["Timestamp_Create"].type == "datetime"
+
+    def test_parse_uppercase_types(self) -> None:
+        ddl = """CREATE TABLE "T" (
+"A" VARCHAR(255),
+"B" INT,
+"C" DateTime
+);"""
+        t = parse_ddl(ddl)["T"]
+        assert [t[f].type for f in ("A", "B", "C")] == ["text", "number", "datetime"]
+
+    def test_parse_without_constraint_clauses(self) -> None:
+        ddl = """CREATE TABLE "Plain" (
+"_kp_ID" int,
+"_kf_Owner" int,
+"Name" varchar(255)
+);
+CREATE TABLE "Lower" (
+"ID" int,
+primary key (ID)
+);"""
+        result = parse_ddl(ddl)
+        plain = result["Plain"]
+        assert plain["_kp_ID"].pk is True
+        assert plain["_kf_Owner"].fk is True
+        assert plain["Name"].pk is False
+        assert result["Lower"]["ID"].pk is True
+
+    def test_parse_shares_identical_field_defs(self) -> None:
+        ddl = """CREATE TABLE "A" ("Name" varchar(255), "Note" varchar(100));
+CREATE TABLE "B" ("Title" varchar(255), "Qty" int);"""
+        result = parse_ddl(ddl)
+        assert result["A"]["Name"] is result["A"]["Note"]
+        assert result["A"]["Name"] is result["B"]["Title"]
+        assert result["B"]["Qty"] == FieldDef(type="number")
+
+    def test_parse_reuses_cached_result(self) -> None:
+        ddl = 'CREATE TABLE "Cached" ("Name" varchar(255), "Qty" int);'
+        first = parse_ddl(ddl)
+        second = parse_ddl(ddl)
+        assert first is not second
+        assert first["Cached"] is second["Cached"]
+
+        annotated = parse_ddl(ddl, annotations={"Cached": {"Qty": {"comment": "Units"}}})
+        assert annotated["Cached"]["Qty"].description == "Units"
+        relabeled = parse_ddl(ddl, annotations={"Cached": {"Qty": {"comment": "Boxes"}}})
+        assert relabeled["Cached"]["Qty"].description == "Boxes"
+
+    def test_parse_parens_in_quoted_names(self) -> None:
+        ddl = """CREATE TABLE "Prices (EU)" (
+"Amount (net)" int,
+"Label" varchar(255)
+);
+CREATE TABLE "Next" ("ID" int);
+CREATE TABLE "Truncated" ("Lost" int"""
+        result = parse_ddl(ddl)
+        assert list(result) == ["Prices (EU)", "Next"]
+        assert list(result["Prices (EU)"]) == ["Amount (net)", "Label"]
+
+    def test_parse_preserves_name_case(self) -> None:
+        # "İ" lowercases to two code points; names must still slice correctly
+        ddl = """CREATE TABLE "İlçe" (
+"MixedCase Name" VARCHAR(255),
+"ŞEHİR" int,
+PRIMARY KEY ("ŞEHİR")
+);"""
+        t = parse_ddl(ddl)["İlçe"]
+        assert list(t) == ["MixedCase Name", "ŞEHİR"]
+        assert t["ŞEHİR"].pk is True
+
+    def test_parse_parallel_scan_matches_sequential(self) -> None:
+        ddl = "\n".join(
+            f'CREATE TABLE "P{i}" ("_kp_ID" int, "Name" varchar(255), PRIMARY KEY (_kp_ID));'
+            for i in range(4)
+        )
+        sequential = parse_ddl(ddl)
+        ddl_parser._PARSE_CACHE.clear()
+        # Pretend re2 is active so the thread-pool path runs
+        with (
+            patch.object(ddl_parser, "_regex", object()),
+            patch.object(ddl_parser, "_PARALLEL_MIN_TABLES", 1),
+        ):
+            parallel = parse_ddl(ddl)
+        assert parallel == sequential
+        assert list(parallel) == ["P0", "P1", "P2", "P3"]
 
     def test_parse_foreign_key(self) -> None:
         ddl = """CREATE TABLE "Orders" (
@@ -1030,9 +1166,25 @@ PRIMARY KEY (PrimaryKey),
 FOREIGN KEY (_kf_LocationID) REFERENCES Location(_kp_LocationID)
 );"""
         result = parse_ddl(ddl)
-        assert result["Orders"]["_kf_LocationID"]["fk"] is True
-        assert result["Orders"]["_kf_LocationID"]["tier"] == "key"
-        assert result["Orders"]["PrimaryKey"]["pk"] is True
+        assert result["Orders"]["_kf_LocationID"].fk is True
+        assert result["Orders"]["_kf_LocationID"].tier == "key"
+        assert result["Orders"]["PrimaryKey"].pk is True
+
+    def test_parse_composite_quoted_constraints(self) -> None:
+        ddl = """CREATE TABLE "Link" (
+"Left ID" varchar(255),
+"Right ID" varchar(255),
+"Note" varchar(255),
+PRIMARY KEY ("Left ID", "Right ID"),
+FOREIGN KEY ("Right ID") REFERENCES "Other"("ID")
+);"""
+        t = parse_ddl(ddl)["Link"]
+        assert list(t) == ["Left ID", "Right ID", "Note"]
+        assert t["Left ID"].pk is True
+        assert t["Right ID"].pk is True
+        assert t["Right ID"].fk is True
+        assert t["Note"].pk is False
+        assert t["Note"].fk is False
 
     def test_parse_tier_heuristics(self) -> None:
         ddl = """CREATE TABLE "Test" (
@@ -1044,18 +1196,22 @@ FOREIGN KEY (_kf_LocationID) REFERENCES Location(_kp_LocationID)
 "Name" varchar(255),
 "cCalcField" varchar(255),
 "sSum" int,
+"g" int,
+"go" int,
 PRIMARY KEY (_kp_ID)
 );"""
         result = parse_ddl(ddl)
         t = result["Test"]
-        assert t["_kp_ID"]["tier"] == "key"
-        assert t["_kf_Parent"]["tier"] == "key"
-        assert t["_sp_cache"]["tier"] == "internal"
-        assert t["gGlobal"]["tier"] == "internal"
-        assert t["G_Flag"]["tier"] == "internal"
-        assert t["Name"]["tier"] == "standard"
-        assert t["cCalcField"]["tier"] == "standard"
-        assert t["sSum"]["tier"] == "standard"
+        assert t["_kp_ID"].tier == "key"
+        assert t["_kf_Parent"].tier == "key"
+        assert t["_sp_cache"].tier == "internal"
+        assert t["gGlobal"].tier == "internal"
+        assert t["G_Flag"].tier == "internal"
+        assert t["Name"].tier == "standard"
+        assert t["cCalcField"].tier == "standard"
+        assert t["sSum"].tier == "standard"
+        assert t["g"].tier == "standard"
+        assert t["go"].tier == "standard"
 
     def test_parse_multiple_tables(self) -> None:
         ddl = """CREATE TABLE "A" (
@@ -1078,7 +1234,7 @@ PRIMARY KEY (id)
 PRIMARY KEY (Field1)
 );"""
         result = parse_ddl(ddl)
-        assert result["Test"]["Field1"]["type"] == "text"
+        assert result["Test"]["Field1"].type == "text"
 
     def test_parse_empty_string(self) -> None:
         result = parse_ddl("")
@@ -1103,10 +1259,10 @@ PRIMARY KEY (cTotal)
 );"""
         result = parse_ddl(ddl, annotations={"Test": annotations})
         t = result["Test"]
-        assert t["cTotal"]["tier"] == "internal"
-        assert t["sBalance"]["tier"] == "internal"
-        assert t["gFlag"]["tier"] == "internal"
-        assert t["Name"]["tier"] == "standard"
+        assert t["cTotal"].tier == "internal"
+        assert t["sBalance"].tier == "internal"
+        assert t["gFlag"].tier == "internal"
+        assert t["Name"].tier == "standard"
 
     def test_no_annotations_preserves_heuristics(self) -> None:
         """Without annotations, behavior is identical to before."""
@@ -1118,9 +1274,9 @@ PRIMARY KEY (_kp_ID)
 );"""
         result = parse_ddl(ddl)
         t = result["Test"]
-        assert t["_kp_ID"]["tier"] == "key"
-        assert t["gGlobal"]["tier"] == "internal"
-        assert t["Name"]["tier"] == "standard"
+        assert t["_kp_ID"].tier == "key"
+        assert t["gGlobal"].tier == "internal"
+        assert t["Name"].tier == "standard"
 
     def test_annotation_does_not_override_key_tier(self) -> None:
         """PK/FK fields stay as 'key' even if annotated as calculation."""
@@ -1134,7 +1290,7 @@ PRIMARY KEY (_kp_ID)
 PRIMARY KEY (_kp_ID)
 );"""
         result = parse_ddl(ddl, annotations={"Test": annotations})
-        assert result["Test"]["_kp_ID"]["tier"] == "key"
+        assert result["Test"]["_kp_ID"].tier == "key"
 
     def test_comment_annotation_populates_description(self) -> None:
         """FMComment annotation sets the description field in FieldDef."""
@@ -1148,7 +1304,7 @@ PRIMARY KEY (_kp_ID)
 PRIMARY KEY (Name)
 );"""
         result = parse_ddl(ddl, annotations={"Test": annotations})
-        assert result["Test"]["Name"].get("description") == "Customer full name"
+        assert result["Test"]["Name"].description == "Customer full name"
 
 
 class TestODataURLEncoding:
@@ -1402,6 +1558,81 @@ class TestCountRecordsParams:
         assert "FakeTable" in result
 
 
+class TestCountCache:
+    """count_records reuses results per (table, filter) until TTL or invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_count_served_from_cache(self) -> None:
+        from filemaker_mcp.tools.query import count_records
+
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value={"@count": 7, "value": []})
+
+        with patch("filemaker_mcp.tools.query.odata_client", mock_client):
+            first = await count_records("Invoices", "Amount gt 5")
+            second = await count_records("Invoices", "Amount gt 5")
+            await count_records("Invoices", "Amount gt 6")
+
+        assert first == second
+        assert mock_client.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_query_invalidates_table_counts(self) -> None:
+        from filemaker_mcp.tools.query import count_records, query_records
+
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value={"@count": 7, "value": []})
+
+        with patch("filemaker_mcp.tools.query.odata_client", mock_client):
+            await count_records("Invoices")
+            await query_records("Invoices")
+            await count_records("Invoices")
+
+        assert mock_client.get.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_counts_share_one_request(self) -> None:
+        from filemaker_mcp.tools.query import count_records
+
+        async def slow_get(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            await asyncio.sleep(0.01)
+            return {"@count": 7, "value": []}
+
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=slow_get)
+
+        with patch("filemaker_mcp.tools.query.odata_client", mock_client):
+            results = await asyncio.gather(*(count_records("Invoices", "X eq 1") for _ in range(5)))
+
+        assert len(set(results)) == 1
+        assert mock_client.get.await_count == 1
+
+    def test_closed_window_gets_long_ttl(self) -> None:
+        from filemaker_mcp.ddl import clear_context, set_context
+        from filemaker_mcp.tools.query import _CLOSED_WINDOW_COUNT_TTL, _count_ttl
+
+        clear_context()
+        set_context("Invoices", "ServiceDate", "cache_config", "date_key")
+        try:
+            closed = "ServiceDate ge 2024-01-01 and ServiceDate lt 2025-01-01"
+            assert _count_ttl("Invoices", closed) == _CLOSED_WINDOW_COUNT_TTL
+            assert _count_ttl("Invoices", '("ServiceDate" le 2020-01-01)') == (
+                _CLOSED_WINDOW_COUNT_TTL
+            )
+            short = settings.count_cache_ttl
+            assert _count_ttl("Invoices", "ServiceDate ge 2024-01-01") == short
+            assert _count_ttl("Invoices", closed + " or Region eq 'A'") == short
+            assert _count_ttl("Invoices", "") == short
+            # Another predicate can change inside a closed date window
+            assert _count_ttl("Invoices", closed + " and Status eq 'Open'") == short
+            # A bound on some other date field isn't the table's date window
+            assert _count_ttl("Invoices", "OldDate lt 2020-01-01") == short
+            # No date_key configured for the table
+            assert _count_ttl("Orders", "ServiceDate lt 2020-01-01") == short
+        finally:
+            clear_context()
+
+
 class TestLiveDDLRefresh:
     """Test live DDL refresh via script execution."""
 
@@ -1427,8 +1658,8 @@ PRIMARY KEY (_kp_ID)
 
         assert result is True
         assert "TestRefresh" in TABLES
-        assert TABLES["TestRefresh"]["_kp_ID"]["type"] == "number"
-        assert TABLES["TestRefresh"]["_kp_ID"]["pk"] is True
+        assert TABLES["TestRefresh"]["_kp_ID"].type == "number"
+        assert TABLES["TestRefresh"]["_kp_ID"].pk is True
         # Clean up
         del TABLES["TestRefresh"]
         set_script_available(None)
@@ -1465,6 +1696,49 @@ PRIMARY KEY (_kp_ID)
         mock_client.post.assert_not_called()  # Should skip entirely
         set_script_available(None)  # Reset
 
+    @pytest.mark.asyncio
+    async def test_prewarm_fetches_only_uncached_tables(self) -> None:
+        from filemaker_mcp.ddl import TABLES, set_script_available
+        from filemaker_mcp.tools.schema import prewarm_schema
+
+        ddl_response = 'CREATE TABLE "Warm" ("_kp_ID" int);'
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(
+            return_value={"scriptResult": {"code": 0, "resultParameter": ddl_response}}
+        )
+        set_script_available(None)
+
+        with (
+            patch("filemaker_mcp.tools.schema.odata_client", mock_client),
+            patch.dict(EXPOSED_TABLES, {"Warm": "", "Cached": ""}, clear=True),
+            patch.dict(TABLES, {"Cached": {"ID": FieldDef(type="number")}}, clear=True),
+        ):
+            assert await prewarm_schema() == 1
+            assert "Warm" in TABLES
+            # Everything cached now: no further FM call
+            assert await prewarm_schema() == 0
+
+        mock_client.post.assert_called_once()
+        assert '["Warm"]' in mock_client.post.call_args.kwargs["json_body"]["scriptParameterValue"]
+        set_script_available(None)
+
+    @pytest.mark.asyncio
+    async def test_prewarm_swallows_connection_errors(self) -> None:
+        from filemaker_mcp.ddl import TABLES, set_script_available
+        from filemaker_mcp.tools.schema import prewarm_schema
+
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(side_effect=ConnectionError("down"))
+        set_script_available(None)
+
+        with (
+            patch("filemaker_mcp.tools.schema.odata_client", mock_client),
+            patch.dict(EXPOSED_TABLES, {"Cold": ""}, clear=True),
+            patch.dict(TABLES, {}, clear=True),
+        ):
+            assert await prewarm_schema() == 0
+        set_script_available(None)
+
 
 @pytest.mark.usefixtures("populate_exposed_tables")
 class TestQueryRecords:
@@ -1968,6 +2242,12 @@ class TestNormalizeDatesInFilter:
             normalize_dates_in_filter("ServiceDate eq '02/15/2026'") == "ServiceDate eq 2026-02-15"
         )
 
+    def test_quoted_us_datetime_and_unclosed_quote(self) -> None:
+        assert (
+            normalize_dates_in_filter("D ge '2/5/2026 3:45:00 PM' and E lt '2/6/2026")
+            == "D ge 2026-02-05 and E lt '2026-02-06"
+        )
+
     # --- Combined filters ---
 
     def test_mixed_date_and_string(self) -> None:
@@ -1988,21 +2268,21 @@ class TestSchemaDateHints:
 
     def test_ddl_schema_datetime_field_has_hint(self) -> None:
         fields = {
-            "ServiceDate": {"type": "datetime", "tier": "key"},
+            "ServiceDate": FieldDef(type="datetime", tier="key"),
         }
         result = _format_ddl_schema("Test", fields)
         assert "(filter as: YYYY-MM-DD, no quotes)" in result
 
     def test_ddl_schema_date_field_has_hint(self) -> None:
         fields = {
-            "PostDate": {"type": "date", "tier": "standard"},
+            "PostDate": FieldDef(type="date", tier="standard"),
         }
         result = _format_ddl_schema("Test", fields)
         assert "(filter as: YYYY-MM-DD, no quotes)" in result
 
     def test_ddl_schema_text_field_no_hint(self) -> None:
         fields = {
-            "City": {"type": "text", "tier": "standard"},
+            "City": FieldDef(type="text", tier="standard"),
         }
         result = _format_ddl_schema("Test", fields)
         assert "(filter as:" not in result
@@ -2344,7 +2624,7 @@ PRIMARY KEY (PK)
 
             assert "Orders" in FIELD_ANNOTATIONS
             assert FIELD_ANNOTATIONS["Orders"]["cTotal"]["calculation"] is True
-            assert TABLES["Orders"]["cTotal"]["tier"] == "internal"
+            assert TABLES["Orders"]["cTotal"].tier == "internal"
         finally:
             EXPOSED_TABLES.clear()
             EXPOSED_TABLES.update(original_exposed)
@@ -2378,7 +2658,7 @@ PRIMARY KEY (PK)
                 await bootstrap_ddl()
 
             assert FIELD_ANNOTATIONS == {}
-            assert TABLES["Orders"]["cTotal"]["tier"] == "standard"
+            assert TABLES["Orders"]["cTotal"].tier == "standard"
         finally:
             EXPOSED_TABLES.clear()
             EXPOSED_TABLES.update(original_exposed)
@@ -2440,8 +2720,76 @@ class TestFieldNameQuoting:
     def test_orderby_already_quoted(self) -> None:
         assert quote_fields_in_orderby('"Company Name" asc') == '"Company Name" asc'
 
+    def test_prepare_filter_normalizes_then_quotes_and_memoizes(self) -> None:
+        from filemaker_mcp.tools.query import prepare_filter
+
+        before = prepare_filter.cache_info().hits
+        expected = '"ServiceDate" ge 2026-02-14'
+        assert prepare_filter("ServiceDate ge '02/14/2026'") == expected
+        assert prepare_filter("ServiceDate ge '02/14/2026'") == expected
+        assert prepare_filter.cache_info().hits == before + 1
+
+    def test_orderby_direction_case_and_spacing(self) -> None:
+        assert quote_fields_in_orderby("City  DESC") == '"City" DESC'
+
+    def test_cached_filters_combine_into_one_mask(self) -> None:
+        import pandas as pd_test
+
+        from filemaker_mcp.tools.query import _apply_filters_to_df
+
+        df = pd_test.DataFrame(
+            {
+                "D": pd_test.to_datetime(["2025-01-01", "2025-01-05", "2025-01-09", "2025-01-09"]),
+                "Zone": ["A", "A", "B", "A"],
+                "Amount": ["5", "15", "25", "x"],
+            }
+        )
+        result = _apply_filters_to_df(
+            df,
+            "D ge 2025-01-02 and Zone ne 'B' and Amount gt 10 and Amount lt 20",
+            "D",
+            "2025-01-02",
+            None,
+        )
+        assert result.index.tolist() == [1]
+        assert _apply_filters_to_df(df, "Missing eq 'A'", "D", None, None) is df
+
+    def test_cached_string_columns_reused_per_frame(self) -> None:
+        import pandas as pd_test
+
+        from filemaker_mcp.tools.query import _apply_filters_to_df
+
+        df = pd_test.DataFrame({"Zone": ["A", "B", None], "Qty": [1, 2, 3]})
+        cache: dict = {}
+        result = _apply_filters_to_df(df, "Zone eq 'A' and Qty ne '2'", "", None, None, cache)
+        assert result.index.tolist() == [0]
+        zone = cache["Zone"][1]
+        assert _apply_filters_to_df(df, "Zone ne 'A'", "", None, None, cache).index.tolist() == [
+            1,
+            2,
+        ]
+        assert cache["Zone"][1] is zone
+        assert _apply_filters_to_df(df, "Zone eq 'C'", "", None, None, cache).empty
+        # A replaced frame rebuilds its string columns
+        df2 = pd_test.DataFrame({"Zone": ["C"]})
+        assert len(_apply_filters_to_df(df2, "Zone eq 'C'", "", None, None, cache)) == 1
+
+    def test_orderby_applied_as_one_multi_key_sort(self) -> None:
+        import pandas as pd_test
+
+        from filemaker_mcp.tools.query import _apply_orderby_to_df
+
+        df = pd_test.DataFrame({"Zone": ["B", "A", "B", "A"], "Amount": [1, 2, 3, 4]})
+        result = _apply_orderby_to_df(df, '"Zone" asc, Amount desc, Missing')
+        assert result["Amount"].tolist() == [4, 2, 3, 1]
+
     # --- $filter quoting ---
 
+    def test_filter_without_operator_or_function_unchanged(self) -> None:
+        assert quote_fields_in_filter("Active") == "Active"
+        assert quote_fields_in_filter("contains(City,'x')") == "contains(\"City\",'x')"
+        assert quote_fields_in_filter("City\teq\t'A'") == "\"City\" eq 'A'"
+
     def test_filter_simple_eq(self) -> None:
         assert quote_fields_in_filter("City eq 'Springfield'") == "\"City\" eq 'Springfield'"
 
@@ -2804,7 +3152,7 @@ class TestTenantIntegration:
             assert len(_tenants) == 2
 
             # Simulate some cached state from acme
-            TABLES["Location"] = {"field": {"type": "text", "tier": "standard"}}
+            TABLES["Location"] = {"field": FieldDef(type="text", tier="standard")}
             EXPOSED_TABLES["Location"] = "A table."
 
             # Switch to staging (mock bootstrap to avoid real HTTP)
@@ -2860,6 +3208,22 @@ class TestDDLContext:
             "context": "Boolean: 1=yes, empty/0=no",
         }
 
+    def test_update_context_keeps_primary_key(self) -> None:
+        from filemaker_mcp.ddl import DDL_CONTEXT, update_context
+
+        update_context(
+            [
+                {
+                    "TableName": "Orders",
+                    "FieldName": "Commercial",
+                    "ContextType": "field_values",
+                    "Context": "hint",
+                    "PrimaryKey": 42,
+                },
+            ]
+        )
+        assert DDL_CONTEXT[("Orders", "Commercial", "field_values")]["pk"] == "42"
+
     def test_clear_context(self) -> None:
         from filemaker_mcp.ddl import DDL_CONTEXT, clear_context, update_context
 
@@ -2904,6 +3268,21 @@ class TestDDLContext:
         assert DDL_CONTEXT[("Orders", "Status", "field_values")]["context"] == "new hint"
         assert len(DDL_CONTEXT) == 1
 
+    def test_update_context_interns_keys_and_nulls(self) -> None:
+        from filemaker_mcp.ddl import DDL_CONTEXT, clear_context, update_context
+
+        clear_context()
+        table = "".join(["Ord", "ers"])  # built at runtime, not a shared constant
+        update_context(
+            [
+                {"TableName": table, "FieldName": "A", "ContextType": "field_values"},
+                {"TableName": "Orders", "FieldName": None, "ContextType": "syntax_rule"},
+            ]
+        )
+        keys = list(DDL_CONTEXT)
+        assert keys[0][0] is keys[1][0]
+        assert ("Orders", "", "syntax_rule") in DDL_CONTEXT
+
     def test_get_field_context(self) -> None:
         from filemaker_mcp.ddl import clear_context, get_field_context, update_context
 
@@ -2921,6 +3300,27 @@ class TestDDLContext:
         assert get_field_context("Orders", "Commercial") == "Boolean: 1=yes"
         assert get_field_context("Orders", "Nonexistent") is None
 
+    def test_get_field_contexts_matches_per_field_lookup(self) -> None:
+        from filemaker_mcp.ddl import (
+            clear_context,
+            get_field_context,
+            get_field_contexts,
+            set_context,
+        )
+
+        clear_context()
+        set_context("Orders", "Commercial", "field_values", "Boolean: 1=yes")
+        set_context("Orders", "Commercial", "value_map", '{"Y": "1"}')
+        set_context("Orders", "City", "field_values", "Title case")
+        set_context("Drivers", "City", "field_values", "Other table")
+        contexts = get_field_contexts("Orders")
+        assert contexts == {
+            "Commercial": 'Boolean: 1=yes; {"Y": "1"}',
+            "City": "Title case",
+        }
+        assert all(get_field_context("Orders", f) == c for f, c in contexts.items())
+        assert get_field_contexts("Missing") == {}
+
     def test_get_table_context(self) -> None:
         from filemaker_mcp.ddl import clear_context, get_table_context, update_context
 
@@ -3006,10 +3406,10 @@ class TestGetDateFields:
 
         saved = dict(TABLES)
         TABLES["TestTable"] = {
-            "Name": {"type": "text", "tier": "standard"},
-            "ServiceDate": {"type": "datetime", "tier": "standard"},
-            "Created": {"type": "datetime", "tier": "internal"},
-            "Amount": {"type": "number", "tier": "standard"},
+            "Name": FieldDef(type="text", tier="standard"),
+            "ServiceDate": FieldDef(type="datetime", tier="standard"),
+            "Created": FieldDef(type="datetime", tier="internal"),
+            "Amount": FieldDef(type="number", tier="standard"),
         }
         try:
             result = get_date_fields("TestTable")
@@ -3023,8 +3423,8 @@ class TestGetDateFields:
 
         saved = dict(TABLES)
         TABLES["TestTable"] = {
-            "OrderDate": {"type": "date", "tier": "standard"},
-            "Name": {"type": "text", "tier": "standard"},
+            "OrderDate": FieldDef(type="date", tier="standard"),
+            "Name": FieldDef(type="text", tier="standard"),
         }
         try:
             result = get_date_fields("TestTable")
@@ -3043,8 +3443,8 @@ class TestGetDateFields:
 
         saved = dict(TABLES)
         TABLES["TextOnly"] = {
-            "Name": {"type": "text", "tier": "standard"},
-            "Code": {"type": "text", "tier": "key"},
+            "Name": FieldDef(type="text", tier="standard"),
+            "Code": FieldDef(type="text", tier="key"),
         }
         try:
             assert get_date_fields("TextOnly") == []
@@ -3062,15 +3462,15 @@ class TestGetAllDateFields:
         saved = dict(TABLES)
         TABLES.clear()
         TABLES["Invoices"] = {
-            "ServiceDate": {"type": "datetime", "tier": "standard"},
-            "Name": {"type": "text", "tier": "standard"},
+            "ServiceDate": FieldDef(type="datetime", tier="standard"),
+            "Name": FieldDef(type="text", tier="standard"),
         }
         TABLES["Drivers"] = {
-            "DriverName": {"type": "text", "tier": "standard"},
+            "DriverName": FieldDef(type="text", tier="standard"),
         }
         TABLES["Orders"] = {
-            "Order_Date": {"type": "date", "tier": "standard"},
-            "Created": {"type": "datetime", "tier": "internal"},
+            "Order_Date": FieldDef(type="date", tier="standard"),
+            "Created": FieldDef(type="datetime", tier="internal"),
         }
         try:
             result = get_all_date_fields()
@@ -3195,8 +3595,8 @@ class TestContextInSchema:
             ]
         )
         fields = {
-            "Commercial": {"type": "text", "tier": "standard"},
-            "Status": {"type": "text", "tier": "standard"},
+            "Commercial": FieldDef(type="text", tier="standard"),
+            "Status": FieldDef(type="text", tier="standard"),
         }
         result = _format_ddl_schema("Orders", fields)
         assert "-- Boolean: 1=yes, empty/0=no" in result
@@ -3217,7 +3617,7 @@ class TestContextInSchema:
                 },
             ]
         )
-        fields = {"Status": {"type": "text", "tier": "standard"}}
+        fields = {"Status": FieldDef(type="text", tier="standard")}
         result = _format_ddl_schema("Orders", fields)
         assert "ne operator not supported" in result
 
@@ -3226,7 +3626,7 @@ class TestContextInSchema:
         from filemaker_mcp.tools.schema import _format_ddl_schema
 
         clear_context()
-        fields = {"Status": {"type": "text", "tier": "standard"}}
+        fields = {"Status": FieldDef(type="text", tier="standard")}
         result = _format_ddl_schema("Orders", fields)
         assert "  -- " not in result
         assert "Note:" not in result
@@ -3308,10 +3708,81 @@ class TestSaveContext:
         assert "Error" in result
         assert "write access" in result.lower() or "permission" in result.lower()
 
+    @pytest.mark.asyncio
+    async def test_save_known_record_patches_without_lookup(self) -> None:
+        from filemaker_mcp.ddl import DDL_CONTEXT, clear_context
+        from filemaker_mcp.tools.context import save_context
+
+        clear_context()
+        with patch("filemaker_mcp.tools.context.odata_client") as mock_client:
+            mock_client.get = AsyncMock(return_value={"value": []})
+            mock_client.post = AsyncMock(return_value={"PrimaryKey": "7", "Context": "v1"})
+            mock_client.patch = AsyncMock(return_value={})
+            await save_context(table_name="Orders", context="v1", field_name="Status")
+            result = await save_context(table_name="Orders", context="v2", field_name="Status")
+
+        assert "Updated" in result
+        mock_client.get.assert_called_once()  # only the first save looked it up
+        assert mock_client.patch.call_args.args[0] == "TBL_DDL_Context('7')"
+        assert DDL_CONTEXT[("Orders", "Status", "field_values")]["context"] == "v2"
+
+    @pytest.mark.asyncio
+    async def test_save_stale_key_falls_back_to_lookup(self) -> None:
+        from filemaker_mcp.ddl import clear_context, update_context
+        from filemaker_mcp.tools.context import save_context
+
+        clear_context()
+        update_context(
+            [
+                {
+                    "TableName": "Orders",
+                    "FieldName": "Status",
+                    "ContextType": "field_values",
+                    "Context": "old",
+                    "PrimaryKey": "5",
+                }
+            ]
+        )
+        with patch("filemaker_mcp.tools.context.odata_client") as mock_client:
+            mock_client.patch = AsyncMock(side_effect=ValueError("Record not found"))
+            mock_client.get = AsyncMock(return_value={"value": []})
+            mock_client.post = AsyncMock(return_value={"PrimaryKey": "8"})
+            result = await save_context(table_name="Orders", context="new", field_name="Status")
+
+        assert "Created" in result
+        mock_client.get.assert_called_once()
+
 
 class TestDeleteContext:
     """Test delete_context tool — removes stale learnings from FM."""
 
+    @pytest.mark.asyncio
+    async def test_delete_known_record_skips_lookup(self) -> None:
+        from filemaker_mcp.ddl import DDL_CONTEXT, clear_context, update_context
+        from filemaker_mcp.tools.context import delete_context
+
+        clear_context()
+        update_context(
+            [
+                {
+                    "TableName": "Orders",
+                    "FieldName": "Status",
+                    "ContextType": "field_values",
+                    "Context": "hint",
+                    "PrimaryKey": "12",
+                }
+            ]
+        )
+        with patch("filemaker_mcp.tools.context.odata_client") as mock_client:
+            mock_client.get = AsyncMock()
+            mock_client.delete = AsyncMock(return_value={})
+            result = await delete_context(table_name="Orders", field_name="Status")
+
+        assert "Deleted" in result
+        mock_client.get.assert_not_called()
+        mock_client.delete.assert_called_once_with("TBL_DDL_Context('12')")
+        assert ("Orders", "Status", "field_values") not in DDL_CONTEXT
+
     @pytest.mark.asyncio
     async def test_delete_existing_record(self) -> None:
         from filemaker_mcp.ddl import DDL_CONTEXT, clear_context, update_context
@@ -3458,8 +3929,8 @@ class TestGetPKField:
         from filemaker_mcp.ddl import get_pk_field
 
         TABLES["Orders"] = {
-            "PrimaryKey": {"type": "text", "tier": "key", "pk": True},
-            "Order_Date": {"type": "date", "tier": "standard"},
+            "PrimaryKey": FieldDef(type="text", tier="key", pk=True),
+            "Order_Date": FieldDef(type="date", tier="standard"),
         }
         assert get_pk_field("Orders") == "PrimaryKey"
 
@@ -3467,8 +3938,8 @@ class TestGetPKField:
         from filemaker_mcp.ddl import get_pk_field
 
         TABLES["Pickups"] = {
-            "kp_pickup_id": {"type": "number", "tier": "key", "pk": True},
-            "Status": {"type": "text", "tier": "standard"},
+            "kp_pickup_id": FieldDef(type="number", tier="key", pk=True),
+            "Status": FieldDef(type="text", tier="standard"),
         }
         assert get_pk_field("Pickups") == "kp_pickup_id"
 
@@ -3476,7 +3947,7 @@ class TestGetPKField:
         from filemaker_mcp.ddl import get_pk_field
 
         TABLES["SomeTable"] = {
-            "Name": {"type": "text", "tier": "standard"},
+            "Name": FieldDef(type="text", tier="standard"),
         }
         assert get_pk_field("SomeTable") == "PrimaryKey"
 
@@ -3555,6 +4026,47 @@ class TestExtractDateRange:
         )
         assert result == ("2025-01-01", None)
 
+    def test_quoted_field_name_with_space(self) -> None:
+        from filemaker_mcp.tools.query import extract_date_range
+
+        result = extract_date_range(
+            '"Service Date" ge 2025-01-01 and xService Date le 2025-02-01',
+            "Service Date",
+        )
+        assert result == ("2025-01-01", None)
+
+    def test_non_date_filters_after_logical_operator(self) -> None:
+        """Unquoted fields after and/or are extracted without the keyword."""
+        from filemaker_mcp.tools.query import _extract_non_date_filters
+
+        result = _extract_non_date_filters(
+            "Customer Name eq 'Smith and Sons' and Zone eq 'A' or (Amount gt 5)", ""
+        )
+        assert result == [
+            ("Customer Name", "eq", "Smith and Sons"),
+            ("Zone", "eq", "A"),
+            ("Amount", "gt", "5"),
+        ]
+
+    def test_non_date_filters_quoted_field_with_logical_words(self) -> None:
+        """A quoted field name containing " and "/" or " is kept whole."""
+        from filemaker_mcp.tools.query import _extract_non_date_filters
+
+        result = _extract_non_date_filters(
+            '"Bread and Butter" eq \'x\' and ("Salt or Pepper" gt 2)', ""
+        )
+        assert result == [("Bread and Butter", "eq", "x"), ("Salt or Pepper", "gt", "2")]
+
+    def test_non_date_filter_extraction_is_linear(self) -> None:
+        """Long word runs without an operator don't trigger backtracking sweeps."""
+        import time
+
+        from filemaker_mcp.tools.query import _extract_non_date_filters
+
+        start = time.perf_counter()
+        assert _extract_non_date_filters("Customer Name Long " * 2000, "") == []
+        assert time.perf_counter() - start < 0.5
+
     def test_eq_sets_both_bounds(self) -> None:
         """eq X should be treated as ge X and le X for caching."""
         from filemaker_mcp.tools.query import extract_date_range
@@ -3611,8 +4123,8 @@ class TestQueryRecordsCache:
         mock_cache_config = {"mode": "date_range", "date_field": "ServiceDate"}
         mock_ddl = {
             "Invoices": {
-                "PrimaryKey": {"type": "text", "pk": True},
-                "ServiceDate": {"type": "date", "tier": "key"},
+                "PrimaryKey": FieldDef(type="text", pk=True),
+                "ServiceDate": FieldDef(type="date", tier="key"),
             }
         }
 
@@ -3632,6 +4144,40 @@ class TestQueryRecordsCache:
         assert _table_cache["Invoices"].row_count == 2
         assert "AR1" in result
 
+    @pytest.mark.asyncio
+    async def test_gap_fetch_pages_concurrently(self) -> None:
+        """A multi-page gap is fetched via $count-driven concurrent pages, in order."""
+        from filemaker_mcp.tools.analytics import _table_cache
+        from filemaker_mcp.tools.query import _fetch_and_cache_gap
+
+        skips: list[int] = []
+
+        async def mock_get(path: str, params: dict[str, str] | None = None) -> dict[str, Any]:
+            assert params is not None
+            skip = int(params.get("$skip", 0))
+            skips.append(skip)
+            size = min(10000, 15000 - skip)
+            return {
+                "value": [
+                    {"PrimaryKey": str(skip + i), "ServiceDate": "2025-03-15"} for i in range(size)
+                ],
+                "@count": 15000,
+            }
+
+        with (
+            patch("filemaker_mcp.tools.query.odata_client") as mock_client,
+            patch("filemaker_mcp.tools.query.TABLES", {}),
+        ):
+            mock_client.get = mock_get
+            ok = await _fetch_and_cache_gap(
+                "Invoices", "ServiceDate", "PrimaryKey", "2025-03-01", "2025-03-31"
+            )
+
+        assert ok
+        assert sorted(skips) == [0, 10000]
+        df = _table_cache["Invoices"].df
+        assert df["PrimaryKey"].tolist() == [str(i) for i in range(15000)]
+
     @pytest.mark.asyncio
     @pytest.mark.usefixtures("populate_exposed_tables")
     async def test_cache_hit_skips_fm(self) -> None:
@@ -3721,8 +4267,8 @@ class TestQueryRecordsCache:
         }
         mock_ddl = {
             "Invoices": {
-                "PrimaryKey": {"type": "text", "pk": True},
-                "ServiceDate": {"type": "date", "tier": "key"},
+                "PrimaryKey": FieldDef(type="text", pk=True),
+                "ServiceDate": FieldDef(type="date", tier="key"),
             }
         }
 
@@ -3838,8 +4384,8 @@ class TestQueryRecordsCache:
         }
         mock_ddl = {
             "Invoices": {
-                "PrimaryKey": {"type": "text", "pk": True},
-                "ServiceDate": {"type": "date", "tier": "key"},
+                "PrimaryKey": FieldDef(type="text", pk=True),
+                "ServiceDate": FieldDef(type="date", tier="key"),
             }
         }
 
@@ -3974,6 +4520,161 @@ class TestQueryRecordsCache:
         # Region should NOT appear (not in select)
         assert "Region" not in result
 
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("populate_exposed_tables")
+    async def test_cache_all_missing_filter_column_goes_to_fm(self) -> None:
+        """A filter on a column the cache lacks should be answered by FM."""
+        import pandas as pd_test
+
+        from filemaker_mcp.tools.analytics import DatasetEntry, _table_cache
+        from filemaker_mcp.tools.query import query_records
+
+        _table_cache["Drivers"] = DatasetEntry(
+            df=pd_test.DataFrame({"Driver_ID": [1, 2], "Driver_Name": ["AR1", "GR1"]}),
+            table="Drivers",
+            filter="",
+            select="",
+            loaded_at=datetime(2026, 2, 19),
+            row_count=2,
+            date_field="",
+            date_min=None,
+            date_max=None,
+            pk_field="Driver_ID",
+        )
+        mock_cache_config = {"mode": "cache_all", "date_field": ""}
+        mock_response = {"value": [{"Driver_ID": 3, "Driver_Name": "ZZ9"}], "@count": 1}
+
+        with (
+            patch("filemaker_mcp.tools.query.odata_client") as mock_client,
+            patch("filemaker_mcp.tools.query.get_cache_config", return_value=mock_cache_config),
+            patch("filemaker_mcp.tools.query.get_pk_field", return_value="Driver_ID"),
+        ):
+            mock_client.get = AsyncMock(return_value=mock_response)
+            result = await query_records(table="Drivers", filter="Status eq 'Active'", top=10)
+
+        mock_client.get.assert_called_once()
+        assert "ZZ9" in result
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("populate_exposed_tables")
+    async def test_cache_all_selective_filter_skips_population(self) -> None:
+        """An eq filter on an uncached table should query FM without loading the table."""
+        from filemaker_mcp.tools.analytics import _table_cache
+        from filemaker_mcp.tools.query import query_records
+
+        mock_cache_config = {"mode": "cache_all", "date_field": ""}
+        mock_response = {"value": [{"Driver_ID": 1, "Driver_Name": "AR1"}], "@count": 1}
+
+        with (
+            patch("filemaker_mcp.tools.query.odata_client") as mock_client,
+            patch("filemaker_mcp.tools.query.get_cache_config", return_value=mock_cache_config),
+            patch("filemaker_mcp.tools.query.get_pk_field", return_value="Driver_ID"),
+        ):
+            mock_client.get = AsyncMock(return_value=mock_response)
+            result = await query_records(table="Drivers", filter="Driver_ID eq 1", top=5)
+
+        mock_client.get.assert_called_once()
+        params = mock_client.get.call_args[1]["params"]
+        assert params["$top"] == "5"
+        assert "$filter" in params
+        assert "Drivers" not in _table_cache
+        assert "AR1" in result
+
+    def test_filter_is_cacheable(self) -> None:
+        """Function calls and "or" can't be evaluated against the cache."""
+        from filemaker_mcp.tools.query import _filter_is_cacheable
+
+        assert _filter_is_cacheable("Region eq 'A' and Amount gt 5", "")
+        assert not _filter_is_cacheable("contains(City, 'Spring')", "")
+        assert not _filter_is_cacheable("Region eq 'A' or Region eq 'B'", "")
+
+    def test_filter_is_cacheable_accepts_plain_comparisons(self) -> None:
+        """and-ed string/number comparisons and date-field bounds stay on the cache."""
+        from filemaker_mcp.tools.query import _filter_is_cacheable
+
+        assert _filter_is_cacheable("", "ServiceDate")
+        assert _filter_is_cacheable("City eq ''", "")
+        assert _filter_is_cacheable("(Zone eq 'A') and (Amount le 2.5)", "")
+        assert _filter_is_cacheable("\"Bread and Butter\" eq 'x'", "")
+        assert _filter_is_cacheable(
+            "ServiceDate ge 2025-03-01 and ServiceDate le 2025-03-31 and Region eq 'A'",
+            "ServiceDate",
+        )
+        assert _filter_is_cacheable(
+            '"Service Date" ge 2025-03-01 and "Service Date" le 2025-03-31', "Service Date"
+        )
+
+    def test_filter_is_cacheable_rejects_unparsed_clauses(self) -> None:
+        """A comparison _apply_filters_to_df can't evaluate sends the filter to FM."""
+        from filemaker_mcp.tools.query import _filter_is_cacheable
+
+        assert not _filter_is_cacheable("Active eq true", "")
+        assert not _filter_is_cacheable("Active eq false and Region eq 'A'", "")
+        assert not _filter_is_cacheable("Name eq null", "")
+        assert not _filter_is_cacheable("Amount gt -5", "")
+        assert not _filter_is_cacheable("Amount gt 5.5.5", "")
+        assert not _filter_is_cacheable("Other gt 2024-06-01", "ServiceDate")
+        assert not _filter_is_cacheable("not (Name eq 'a')", "")
+        assert not _filter_is_cacheable("Region eq 'A' and not Name eq 'a'", "")
+        assert not _filter_is_cacheable("Name eq 'O''Brien'", "")
+        assert not _filter_is_cacheable("ServiceDate ne 2025-03-01", "ServiceDate")
+        assert not _filter_is_cacheable("ServiceDate eq 5", "ServiceDate")
+        assert not _filter_is_cacheable("Active", "")
+        assert not _filter_is_cacheable("Region eq 'A' and", "")
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("populate_exposed_tables")
+    async def test_cache_all_unparsed_filters_go_to_fm(self) -> None:
+        """Filters the cache can't apply in full are answered by FM, not the cached rows."""
+        import pandas as pd_test
+
+        from filemaker_mcp.tools.analytics import DatasetEntry, _table_cache
+        from filemaker_mcp.tools.query import query_records
+
+        _table_cache["Drivers"] = DatasetEntry(
+            df=pd_test.DataFrame(
+                {
+                    "Driver_ID": [1, 2],
+                    "Name": ["AR1", "O'Brien"],
+                    "Active": [True, False],
+                    "Amount": [3, 10],
+                    "Other": pd_test.to_datetime(["2024-05-01", "2024-07-01"]),
+                }
+            ),
+            table="Drivers",
+            filter="",
+            select="",
+            loaded_at=datetime(2026, 2, 19),
+            row_count=2,
+            date_field="",
+            date_min=None,
+            date_max=None,
+            pk_field="Driver_ID",
+        )
+        mock_cache_config = {"mode": "cache_all", "date_field": ""}
+        mock_response = {"value": [{"Driver_ID": 9, "Name": "FM9"}], "@count": 1}
+        filters = [
+            "Active eq true",
+            "Name eq null",
+            "Amount gt -5",
+            "Other gt 2024-06-01",
+            "not (Name eq 'a')",
+            "Name eq 'O''Brien'",
+        ]
+
+        for filter_str in filters:
+            with (
+                patch("filemaker_mcp.tools.query.odata_client") as mock_client,
+                patch("filemaker_mcp.tools.query.get_cache_config", return_value=mock_cache_config),
+                patch("filemaker_mcp.tools.query.get_pk_field", return_value="Driver_ID"),
+            ):
+                mock_client.get = AsyncMock(return_value=mock_response)
+                result = await query_records(table="Drivers", filter=filter_str, top=10)
+
+            mock_client.get.assert_called_once()
+            assert "$filter" in mock_client.get.call_args[1]["params"]
+            assert "FM9" in result, filter_str
+
 
 class TestDateCacheBypass:
     """Test that non-date filters bypass the date-range cache path."""
@@ -4091,8 +4792,8 @@ class TestDateCacheBypass:
         mock_cache_config = {"mode": "date_range", "date_field": "ServiceDate"}
         mock_ddl = {
             "Invoices": {
-                "PrimaryKey": {"type": "text", "pk": True},
-                "ServiceDate": {"type": "date", "tier": "key"},
+                "PrimaryKey": FieldDef(type="text", pk=True),
+                "ServiceDate": FieldDef(type="date", tier="key"),
             }
         }
 
@@ -0,0 +1,121 @@
+"""Tests for tools defined directly in the server module (fm_batch, fm_today)."""
+
+import asyncio
+import datetime
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+
+def _tool_fn(tool: Any) -> Callable[..., Any]:
+    """The plain function behind an @mcp.tool-decorated server tool."""
+    return getattr(tool, "fn", tool)
+
+
+async def _batch(requests: list[dict[str, Any]], **kwargs: Any) -> list[dict[str, str]]:
+    from filemaker_mcp import server
+
+    return json.loads(await _tool_fn(server.fm_batch)(requests, **kwargs))
+
+
+def _ops(**handlers: Callable[..., Awaitable[str]]) -> Any:
+    from filemaker_mcp import server
+
+    return patch.dict(server._BATCH_OPS, handlers, clear=True)
+
+
+class TestBatch:
+    """fm_batch: concurrent read requests in one tool call."""
+
+    @pytest.mark.asyncio
+    async def test_results_aligned_with_requests(self) -> None:
+        async def count(table: str, delay: float) -> str:
+            await asyncio.sleep(delay)  # later requests finish first
+            return f"count {table}"
+
+        requests = [
+            {"op": "count", "table": "Invoices", "delay": 0.03},
+            {"op": "count", "table": "Orders", "delay": 0.02},
+            {"op": "count", "table": "Drivers", "delay": 0.0},
+        ]
+        with _ops(count=count):
+            results = await _batch(requests)
+        assert results == [
+            {"result": "count Invoices"},
+            {"result": "count Orders"},
+            {"result": "count Drivers"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unknown_op_is_an_error_entry(self) -> None:
+        async def count(table: str) -> str:
+            return "ok"
+
+        with _ops(count=count):
+            results = await _batch(
+                [{"op": "delete", "table": "Invoices"}, {"op": "count", "table": "T"}]
+            )
+        assert "Unknown op 'delete'" in results[0]["error"]
+        assert results[1] == {"result": "ok"}
+
+    @pytest.mark.asyncio
+    async def test_failing_request_does_not_fail_batch(self) -> None:
+        async def get(table: str) -> str:
+            if table == "Bad":
+                raise ConnectionError("FM unreachable")
+            return f"record from {table}"
+
+        with _ops(get=get):
+            results = await _batch(
+                [{"op": "get", "table": "Bad"}, {"op": "get", "table": "Invoices"}]
+            )
+        assert results == [{"error": "FM unreachable"}, {"result": "record from Invoices"}]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_reported_as_error(self) -> None:
+        async def get(table: str) -> str:
+            raise asyncio.CancelledError
+
+        with _ops(get=get):
+            results = await _batch([{"op": "get", "table": "Invoices"}])
+        assert results == [{"error": "CancelledError"}]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bound(self) -> None:
+        active = 0
+        peak = 0
+
+        async def query(table: str) -> str:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return table
+
+        requests = [{"op": "query", "table": f"T{i}"} for i in range(8)]
+        with _ops(query=query):
+            results = await _batch(requests, max_concurrency=3)
+        assert [r["result"] for r in results] == [f"T{i}" for i in range(8)]
+        assert peak == 3
+
+
+class TestToday:
+    """fm_today: the server's current date as an ISO string."""
+
+    def test_returns_iso_date_from_clock(self) -> None:
+        from filemaker_mcp import server
+
+        with patch("filemaker_mcp.server.datetime") as mock_dt:
+            mock_dt.date.today.return_value = datetime.date(2026, 2, 4)
+            assert _tool_fn(server.fm_today)() == "2026-02-04"
+
+    def test_matches_real_today(self) -> None:
+        from filemaker_mcp import server
+
+        result = _tool_fn(server.fm_today)()
+        assert datetime.date.fromisoformat(result) == datetime.date.today()
+        assert len(result) == 10